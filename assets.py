@@ -0,0 +1,231 @@
+"""
+Images of the survey pages, resized and compressed once.
+
+The pages showed their images as is: a 2 MB PNG on the welcome page, re-encoded by
+``st.image`` at every run, and Unsplash photos downloaded by every tablet. ``AssetPipeline``
+resizes each image to the width of the page (2x the centered layout, for tablet screens)
+and compresses it once; the bytes are kept in memory and written to ``images/build/``,
+so a restart does not encode them again. Remote images are read from a local mirror,
+``images/mirror/``, downloaded on first use (or at deploy time), so the pages keep their
+images when the event's network is down.
+
+``st.image`` sends JPEG and PNG bytes unchanged but converts any other format (WebP,
+AVIF) back to JPEG at every run, so images are encoded as optimized progressive JPEG,
+or as PNG when they really use transparency.
+
+``python assets.py`` mirrors and builds every page image at deploy time.
+"""
+import argparse
+import hashlib
+import io
+import os
+import threading
+import time
+import urllib.request
+from pathlib import Path
+from urllib.parse import urlparse
+
+from PIL import Image
+
+ROOT = Path(__file__).parent / 'images'
+# Largeur du contenu en mise en page centrée (704 px), x2 pour les écrans des tablettes,
+# sous la limite de 1460 px au-delà de laquelle st.image redimensionne à chaque run
+DEFAULT_WIDTH = 1408
+JPEG_QUALITY = 80
+
+# Unsplash : photo IA et photo émotions des pages du questionnaire
+AI_PHOTO = ("https://images.unsplash.com/photo-1620712943543-bcc4688e7485"
+            "?ixlib=rb-1.2.1&auto=format&fit=crop&w=1350&q=80")
+FEELINGS_PHOTO = ("https://images.unsplash.com/photo-1516387938699-a93567ec168e"
+                  "?ixlib=rb-1.2.1&auto=format&fit=crop&w=1350&q=80")
+
+# Images des pages : fichier de images/ ou URL (copiée dans le miroir local)
+PAGE_IMAGES = {
+    'accueil': 'image_accueil.png',
+    'sommeil_ecran': 'sommeil_ecran.jpg',
+    'ia': AI_PHOTO,
+    'emotions': FEELINGS_PHOTO,
+    'merci': 'hands-holding-words-thank-you.jpg',
+}
+
+
+def is_remote(source):
+    return source.startswith(('http://', 'https://'))
+
+
+def is_image(data):
+    """True if ``data`` is an image PIL can read (not, say, the HTML page of a captive portal)."""
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            image.verify()
+    except Exception:
+        return False
+    return True
+
+
+class AssetPipeline:
+    """
+    Resized, compressed page images, from the files of ``root`` or the local mirror of
+    remote images. A missing file or a failed download gives None (downloads are retried
+    after ``retry_after`` seconds); a download that is not an image is not mirrored.
+    """
+
+    def __init__(self, root=ROOT, width=DEFAULT_WIDTH, quality=JPEG_QUALITY, timeout=10, retry_after=60):
+        self.root = Path(root)
+        self.width = width
+        self.quality = quality
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self._lock = threading.Lock()
+        self._images = {}  # (source, width) -> bytes
+        self._failed = {}  # url -> time of the failed download
+        self._downloading = set()
+        self._stats = {'hits': 0, 'built': 0, 'loaded': 0, 'downloaded': 0}
+
+    # region Sources
+    def mirror_path(self, url):
+        """File of the local mirror of ``url``: its last path segment and a hash of the full URL."""
+        name = Path(urlparse(url).path).name or 'image'
+        return self.root / 'mirror' / f"{name}-{hashlib.sha1(url.encode()).hexdigest()[:8]}"
+
+    def _download(self, url):
+        path = self.mirror_path(url)
+        request = urllib.request.Request(url, headers={'User-Agent': 'micah-survey', 'Accept': 'image/jpeg'})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                data = response.read()
+            # Portail captif du Wi-Fi, page d'erreur... : réessayé plus tard
+            if not is_image(data):
+                raise OSError(f"{url} n'a pas renvoyé une image")
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(path.name + '.tmp')
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+        except OSError:
+            with self._lock:
+                self._failed[url] = time.monotonic()
+            return
+        finally:
+            with self._lock:
+                self._downloading.discard(url)
+        with self._lock:
+            self._stats['downloaded'] += 1
+
+    def mirror(self, url, wait=False):
+        """
+        Path of the mirrored copy of ``url``, or None if it is not there yet: the download
+        then starts in a background thread (the pages show the URL meanwhile), unless
+        ``wait`` is set.
+        """
+        path = self.mirror_path(url)
+        if path.exists():
+            return path
+        with self._lock:
+            failed = self._failed.get(url)
+            if url in self._downloading or (failed is not None and time.monotonic() - failed < self.retry_after):
+                return None
+            self._downloading.add(url)
+        if wait:
+            self._download(url)
+            return path if path.exists() else None
+        threading.Thread(target=self._download, args=(url,), name="asset-mirror", daemon=True).start()
+        return None
+
+    def source_path(self, source, wait=False):
+        """Original file of ``source`` (its mirrored copy if remote), or None if unavailable."""
+        if is_remote(source):
+            return self.mirror(source, wait)
+        path = self.root / source
+        return path if path.exists() else None
+    # endregion
+
+    # region Images
+    def build_path(self, source_path, width):
+        return self.root / 'build' / f"{source_path.name}-{width}"
+
+    def encode(self, source_path, width):
+        """``source_path`` at most ``width`` pixels wide, as JPEG (PNG if it uses transparency)."""
+        with Image.open(source_path) as image:
+            image.load()
+        original_format = image.format
+        if image.width > width:
+            image = image.resize((width, round(image.height * width / image.width)), Image.LANCZOS)
+            original_format = None
+
+        buffer = io.BytesIO()
+        if image.mode in ('RGBA', 'LA', 'P') and image.convert('RGBA').getchannel('A').getextrema()[0] < 255:
+            image.save(buffer, format='PNG', optimize=True)
+        else:
+            image.convert('RGB').save(buffer, format='JPEG', quality=self.quality, optimize=True, progressive=True)
+        # Image déjà à la bonne taille et plus légère que sa version réencodée : gardée telle quelle
+        if original_format in ('JPEG', 'PNG') and source_path.stat().st_size <= buffer.tell():
+            return source_path.read_bytes()
+        return buffer.getvalue()
+
+    def image(self, source, width=None, wait=False):
+        """
+        Bytes of ``source`` resized to ``width`` (the pipeline's width by default): from
+        memory, from ``images/build/`` if not older than the original, or encoded now.
+        None if the original is missing or not mirrored yet (see ``mirror``). A mirrored
+        copy that cannot be read is deleted, to be downloaded again.
+        """
+        key = (source, width or self.width)
+        with self._lock:
+            data = self._images.get(key)
+            if data is not None:
+                self._stats['hits'] += 1
+                return data
+
+        source_path = self.source_path(source, wait)
+        if source_path is None:
+            return None
+        built = self.build_path(source_path, key[1])
+        if built.exists() and built.stat().st_mtime >= source_path.stat().st_mtime:
+            data = built.read_bytes()
+            stat = 'loaded'
+        else:
+            try:
+                data = self.encode(source_path, key[1])
+            except Exception:
+                if is_remote(source):
+                    source_path.unlink(missing_ok=True)
+                raise
+            built.parent.mkdir(parents=True, exist_ok=True)
+            tmp = built.with_name(built.name + '.tmp')
+            tmp.write_bytes(data)
+            os.replace(tmp, built)
+            stat = 'built'
+
+        with self._lock:
+            self._stats[stat] += 1
+            return self._images.setdefault(key, data)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['images'] = len(self._images)
+            stats['bytes'] = sum(len(data) for data in self._images.values())
+        return stats
+    # endregion
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Copie locale et compression des images des pages.")
+    parser.add_argument('--width', type=int, action='append',
+                        help=f"largeur des images (option répétable, défaut : {DEFAULT_WIDTH})")
+    parser.add_argument('--root', default=str(ROOT), help="dossier des images")
+    args = parser.parse_args(argv)
+
+    pipeline = AssetPipeline(args.root)
+    for name, source in PAGE_IMAGES.items():
+        source_path = pipeline.source_path(source, wait=True)
+        if source_path is None:
+            print(f"{name:<14} introuvable : {source}")
+            continue
+        for width in args.width or [DEFAULT_WIDTH]:
+            data = pipeline.image(source, width)
+            print(f"{name:<14} {width:>5} px : {source_path.stat().st_size / 1024:8.0f} Ko -> {len(data) / 1024:6.0f} Ko")
+
+
+if __name__ == '__main__':
+    main()
@@ -7,11 +7,14 @@ import urllib3
 import altair as alt
 import requests
 import io
-import matplotlib.pyplot as plt
+import matplotlib
 import seaborn as sns
 import numpy as np
-import re
 from collections import Counter
+from figures import figure_manager
+from results_engine import get_top_words as top_words
+from text_tokens import join_tokens, tokenize_series
+from time_windows import ALL_RESPONSES, EVENTS, parse_timestamps
 # Vérifier que wordcloud est disponible, sinon l'installer
 try:
     from wordcloud import WordCloud
@@ -40,22 +43,21 @@ SHEET_URL = "https://docs.google.com/spreadsheets/d/e/2PACX-1vRCbQDPet7-hUdVO0-C
 
 # region Charger les données et afficher les noms des colonnes
 @st.cache_data(ttl=60)
-def load_data():
+def load_all_data():
     df = pd.read_csv(SHEET_URL)
     # Convertir la colonne Timestamp en datetime
-    df['Timestamp'] = pd.to_datetime(df['Timestamp'], format='%m/%d/%Y %H:%M:%S')
+    df['Timestamp'] = parse_timestamps(df['Timestamp'])
+    return df
 
-    # Définir la date de référence (18 novembre 2025)
-    reference_date = pd.to_datetime('11/18/2025', format='%m/%d/%Y')
 
-    # Filtrer les données pour ne garder que celles après le 18/11/2025
-    df_filtered = df[df['Timestamp'] > reference_date]
-
-    return df_filtered
+# Ne garder que les réponses de l'événement choisi (par défaut : Cité des métiers, dès le 18/11/2025)
+@st.cache_data(ttl=60)
+def load_data(window):
+    return window.filter(load_all_data())
 
 
-# Charger les données
-df = load_data()
+event = st.selectbox("Événement", [*EVENTS, ALL_RESPONSES.label])
+df = load_data(EVENTS.get(event, ALL_RESPONSES))
 # endregion
 
 # region Afficher plus d'informations sur la structure des données
@@ -97,7 +99,7 @@ def create_likert_chart(data, question_col, title, participant_answer=None):
     percentages = (counts / len(data)) * 100
 
     # Créer le graphique
-    fig, ax = plt.subplots(figsize=(12, 6))
+    fig, ax = figure_manager.subplots(figsize=(12, 6))
 
     # Définir les couleurs pour l'échelle Likert (du négatif au positif)
     colors = ['#d32f2f', '#f57c00', '#fbc02d', '#388e3c']  # Rouge, Orange, Jaune, Vert
@@ -131,7 +133,7 @@ def create_likert_chart(data, question_col, title, participant_answer=None):
     ax.spines['top'].set_visible(False)
     ax.spines['right'].set_visible(False)
 
-    plt.tight_layout()
+    fig.tight_layout()
     return fig
 
 # Fonction pour créer un graphique d'échelle numérique
@@ -151,10 +153,10 @@ def create_numeric_scale_chart(data, question_col, title, participant_answer=Non
     # Calculer les pourcentages
     percentages = (all_values / len(data)) * 100
 
-    fig, ax = plt.subplots(figsize=(14, 8))
+    fig, ax = figure_manager.subplots(figsize=(14, 8))
 
     # Définir un gradient de couleurs du vert (peu préoccupé) au rouge (très préoccupé)
-    colors = plt.cm.RdYlGn_r(np.linspace(0.2, 0.8, 10))
+    colors = matplotlib.colormaps['RdYlGn_r'](np.linspace(0.2, 0.8, 10))
 
     # Créer les barres
     bars = ax.bar(range(1, 11), percentages.values, color=colors, alpha=0.7,
@@ -186,7 +188,7 @@ def create_numeric_scale_chart(data, question_col, title, participant_answer=Non
     ax.spines['top'].set_visible(False)
     ax.spines['right'].set_visible(False)
 
-    plt.tight_layout()
+    fig.tight_layout()
     return fig
 
 # Fonction pour créer un graphique de comparaison par catégorie d'âge
@@ -209,7 +211,7 @@ def create_age_category_comparison_chart(data, question_col, category_col, title
     avg_by_group = valid_data.groupby('Groupe_Simple')[question_col].agg(['mean', 'count', 'std']).round(2)
 
     #fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 6))
-    fig, ax1 = plt.subplots(1, 1, figsize=(16, 10))
+    fig, ax1 = figure_manager.subplots(1, 1, figsize=(16, 10))
 
     # Graphique 1: Moyennes par groupe avec barres d'erreur
     colors = ['#ff7f50', '#4682b4']  # Orange pour ados, Bleu pour adultes
@@ -249,7 +251,7 @@ def create_age_category_comparison_chart(data, question_col, category_col, title
     #     ax2.legend()
     #     ax2.grid(axis='y', alpha=0.3, linestyle='--')
 
-    plt.tight_layout()
+    fig.tight_layout()
     return fig
 
 # Fonction pour créer comparaison de wordcloud graphique
@@ -269,22 +271,9 @@ def create_wordcloud_comparison(data, text_col, category_col):
     if len(adolescents_text) == 0 and len(adultes_text) == 0:
         return None, None
 
-    # Nettoyer et combiner le texte pour chaque groupe
-    def clean_and_combine_text(text_series):
-        if len(text_series) == 0:
-            return ""
-
-        # Combiner tous les textes
-        combined_text = ' '.join(text_series.astype(str))
-
-        # Nettoyer le texte (optionnel - vous pouvez ajuster selon vos besoins)
-        combined_text = re.sub(r'[^\w\s]', ' ', combined_text)  # Supprimer la ponctuation
-        combined_text = re.sub(r'\s+', ' ', combined_text)  # Normaliser les espaces
-
-        return combined_text.lower()
-
-    adolescents_combined = clean_and_combine_text(adolescents_text)
-    adultes_combined = clean_and_combine_text(adultes_text)
+    # Tokeniser et combiner le texte pour chaque groupe
+    adolescents_combined = join_tokens(tokenize_series(adolescents_text))
+    adultes_combined = join_tokens(tokenize_series(adultes_text))
 
     # Créer les word clouds
     wordcloud_kwargs = {
@@ -319,10 +308,10 @@ def plot_wordclouds(wc_adolescents, wc_adultes, adolescents_count, adultes_count
         return None
 
     if valid_clouds == 1:
-        fig, ax = plt.subplots(1, 1, figsize=(12, 6))
+        fig, ax = figure_manager.subplots(1, 1, figsize=(12, 6))
         axes = [ax]
     else:
-        fig, axes = plt.subplots(1, 2, figsize=(16, 8))
+        fig, axes = figure_manager.subplots(1, 2, figsize=(16, 8))
 
     current_ax = 0
 
@@ -342,7 +331,7 @@ def plot_wordclouds(wc_adolescents, wc_adultes, adolescents_count, adultes_count
                                  fontsize=14, fontweight='bold', color='#4682b4')
         axes[ax_index].axis('off')
 
-    plt.tight_layout()
+    fig.tight_layout()
     return fig
 
 def create_donut_comparison(data, question_col, category_col):
@@ -399,10 +388,10 @@ def plot_donut_charts(adolescents_counts, adultes_counts):
 
     # Créer la figure
     if len(charts_to_show) == 1:
-        fig, ax = plt.subplots(1, 1, figsize=(10, 8))
+        fig, ax = figure_manager.subplots(1, 1, figsize=(10, 8))
         axes = [ax]
     else:
-        fig, axes = plt.subplots(1, 2, figsize=(16, 8))
+        fig, axes = figure_manager.subplots(1, 2, figsize=(16, 8))
 
     for i, (group_name, counts, base_color) in enumerate(charts_to_show):
         ax = axes[i] if len(charts_to_show) > 1 else axes[0]
@@ -422,9 +411,9 @@ def plot_donut_charts(adolescents_counts, adultes_counts):
 
         # Créer une palette de couleurs basée sur la couleur de base
         if base_color == '#ff7f50':  # Orange pour adolescents
-            colors = plt.cm.Oranges(np.linspace(0.4, 0.8, len(sizes)))
+            colors = matplotlib.colormaps['Oranges'](np.linspace(0.4, 0.8, len(sizes)))
         else:  # Bleu pour adultes
-            colors = plt.cm.Blues(np.linspace(0.4, 0.8, len(sizes)))
+            colors = matplotlib.colormaps['Blues'](np.linspace(0.4, 0.8, len(sizes)))
 
         # Créer le donut chart
         wedges, texts, autotexts = ax.pie(
@@ -458,7 +447,7 @@ def plot_donut_charts(adolescents_counts, adultes_counts):
                 fontsize=12, fontweight='bold',
                 bbox=dict(boxstyle="round,pad=0.3", facecolor='white', alpha=0.8))
 
-    plt.tight_layout()
+    fig.tight_layout()
     return fig
 
 #endregion
@@ -509,7 +498,7 @@ if screen_habit_column in df.columns:
         participant_screen_habit
     )
 
-    st.pyplot(fig)
+    st.image(figure_manager.to_png(fig), use_container_width=True)
 
     # Ajouter une légende si un participant est mis en évidence
     if valid_code and participant_data is not None:
@@ -566,7 +555,7 @@ if ai_concern_column in df.columns:
             "Distribution des niveaux de préoccupation concernant l'IA",
             participant_ai_concern
         )
-        st.pyplot(fig1)
+        st.image(figure_manager.to_png(fig1), use_container_width=True)
 
         # Ajouter la légende si un participant est mis en évidence
         if valid_code and participant_data is not None and pd.notna(participant_ai_concern):
@@ -579,7 +568,7 @@ if ai_concern_column in df.columns:
             fig2 = create_age_category_comparison_chart(df, ai_concern_column, age_category_column,
                                                         "Comparaison des préoccupations IA : Ados vs Adultes")
             if fig2 is not None:
-                st.pyplot(fig2)
+                st.image(figure_manager.to_png(fig2), use_container_width=True)
 
                 # Analyse comparative détaillée
                 valid_comparison_data = df[
@@ -695,7 +684,7 @@ if wordcloud_available and ai_features_column in df.columns and age_category_col
         # Afficher les word clouds
         fig = plot_wordclouds(wc_adolescents, wc_adultes, adolescents_count, adultes_count)
         if fig is not None:
-            st.pyplot(fig)
+            st.image(figure_manager.to_png(fig), use_container_width=True)
 
             # Ajouter des explications
             st.write("**💡 Comment lire ces nuages de mots :**")
@@ -714,24 +703,8 @@ if wordcloud_available and ai_features_column in df.columns and age_category_col
 
         # Analyser les mots les plus fréquents pour chaque groupe
         def get_top_words(text_series, top_n=10):
-            if len(text_series) == 0:
-                return []
-
-            # Combiner tout le texte
-            all_text = ' '.join(text_series.astype(str).str.lower())
-
-            # Extraire les mots (supprimer la ponctuation)
-            words = re.findall(r'\b\w+\b', all_text)
-
-            # Filtrer les mots trop courts ou communs
-            stop_words = {'le', 'la', 'les', 'un', 'une', 'des', 'et', 'ou', 'de', 'du', 'dans', 'avec', 'pour', 'sur',
-                          'par', 'que', 'qui', 'ce', 'cette', 'ces', 'je', 'tu', 'il', 'elle', 'nous', 'vous', 'ils',
-                          'elles', 'mon', 'ma', 'mes', 'ton', 'ta', 'tes', 'son', 'sa', 'ses', 'à', 'au', 'aux'}
-            filtered_words = [word for word in words if len(word) > 2 and word not in stop_words]
-
-            # Compter les occurrences
-            word_counts = Counter(filtered_words)
-            return word_counts.most_common(top_n)
+            # Mots du tokenizer partagé (sans ponctuation, élisions ni mots vides)
+            return top_words(tokenize_series(text_series), top_n)
 
 
         adolescents_data = valid_responses_copy[valid_responses_copy['Groupe_Simple'] == 'Adolescents'][
@@ -802,7 +775,7 @@ if prevention_column in df.columns and age_category_column in df.columns:
         # Créer et afficher les graphiques
         fig = plot_donut_charts(adolescents_counts, adultes_counts)
         if fig is not None:
-            st.pyplot(fig)
+            st.image(figure_manager.to_png(fig), use_container_width=True)
 
             # Ajouter la réponse du participant si disponible
             if valid_code and participant_data is not None:
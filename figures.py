@@ -0,0 +1,73 @@
+"""
+Lifecycle of the matplotlib figures drawn by the apps.
+
+Figures are created with the object-oriented ``Figure`` API, so they are never registered
+in pyplot's global figure list (which only shrinks on ``plt.close``) and can be built from
+any thread. ``FigureManager.to_png`` serializes a figure with the same options as
+``st.pyplot`` and releases it right away; ``stats`` reports how many figures are alive.
+"""
+import io
+import threading
+import weakref
+
+from matplotlib import _pylab_helpers
+from matplotlib.figure import Figure
+
+# Mêmes options d'export que st.pyplot
+SAVEFIG_OPTIONS = {'format': 'png', 'bbox_inches': 'tight', 'dpi': 200}
+
+
+class FigureManager:
+    """Creates, serializes and releases figures, and counts the live ones."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._live = weakref.WeakSet()
+        self._created = 0
+        self._released = 0
+
+    def new_figure(self, **kwargs):
+        """New ``Figure`` (same keyword arguments as ``plt.figure``), tracked until released."""
+        fig = Figure(**kwargs)
+        with self._lock:
+            self._live.add(fig)
+            self._created += 1
+        return fig
+
+    def subplots(self, nrows=1, ncols=1, figsize=None, facecolor=None, **kwargs):
+        """Same as ``plt.subplots``, without touching pyplot's global state."""
+        fig = self.new_figure(figsize=figsize, facecolor=facecolor)
+        return fig, fig.subplots(nrows, ncols, **kwargs)
+
+    def release(self, fig):
+        """Drops the artists of a figure so its memory can be reclaimed at once."""
+        with self._lock:
+            if fig not in self._live:
+                return
+            self._live.discard(fig)
+            self._released += 1
+        fig.clear()
+
+    def to_png(self, fig, release=True):
+        """PNG bytes of a figure, which is released afterwards unless ``release`` is False."""
+        buffer = io.BytesIO()
+        try:
+            fig.savefig(buffer, **SAVEFIG_OPTIONS)
+        finally:
+            if release:
+                self.release(fig)
+        return buffer.getvalue()
+
+    def stats(self):
+        """Live, created and released figure counts, plus the figures left open in pyplot."""
+        with self._lock:
+            return {
+                'live': len(self._live),
+                'created': self._created,
+                'released': self._released,
+                'pyplot_open': _pylab_helpers.Gcf.get_num_fig_managers(),
+            }
+
+
+# Instance partagée par les pages et les threads de rendu
+figure_manager = FigureManager()
@@ -0,0 +1,61 @@
+"""
+Percentile service for the results pages.
+
+Keeps the answers of a numeric question as sorted arrays (overall and per group),
+built once per data snapshot, so that percentile and rank queries are binary
+searches instead of full-column comparisons.
+"""
+import numpy as np
+import pandas as pd
+
+
+class PercentileIndex:
+    """Sorted answers of one question, overall and per group."""
+
+    def __init__(self, values, groups=None):
+        values = pd.to_numeric(pd.Series(values), errors="coerce")
+        valid = values.notna()
+        self._all = np.sort(values[valid].to_numpy(dtype=float))
+        self._by_group = {}
+        if groups is not None:
+            groups = pd.Series(groups, index=values.index)[valid]
+            for group, group_values in values[valid].groupby(groups):
+                self._by_group[group] = np.sort(group_values.to_numpy(dtype=float))
+
+    @classmethod
+    def from_frame(cls, df, value_col, group_col=None):
+        """Builds the index from a dataframe column, optionally split by ``group_col``."""
+        groups = df[group_col] if group_col is not None and group_col in df.columns else None
+        return cls(df[value_col], groups)
+
+    def _sorted(self, group=None):
+        if group is None:
+            return self._all
+        return self._by_group.get(group, np.array([]))
+
+    def count(self, group=None):
+        """Number of answers, overall or for one group."""
+        return len(self._sorted(group))
+
+    def percentile(self, value, group=None):
+        """Share (in %) of answers lower than or equal to ``value``."""
+        sorted_values = self._sorted(group)
+        if len(sorted_values) == 0:
+            return 0.0
+        below_or_equal = np.searchsorted(sorted_values, float(value), side="right")
+        return below_or_equal / len(sorted_values) * 100
+
+    def rank(self, value, group=None):
+        """Position of ``value`` from the top (1 = highest answer) and the number of answers."""
+        sorted_values = self._sorted(group)
+        above = len(sorted_values) - np.searchsorted(sorted_values, float(value), side="right")
+        return int(above) + 1, len(sorted_values)
+
+
+def build_percentile_service(df, question_cols, group_col=None):
+    """One ``PercentileIndex`` per question present in ``df``."""
+    return {
+        question: PercentileIndex.from_frame(df, question, group_col)
+        for question in question_cols
+        if question in df.columns
+    }
@@ -0,0 +1,205 @@
+"""
+Plotly figures of the survey pages: Likert bars and donut, built from prebuilt bases.
+
+Building a ``go.Figure`` runs Plotly's validators on every property, so most of the cost
+of a chart is its dark layout and styling, which never change. The layout is registered
+once as the ``micah_dark`` template, and ``likert_base`` / ``donut_base`` build one
+validated figure per question (its options, group names and compare button), kept as a
+dict. The dark colors are also set on the layout of the bases themselves: the Streamlit
+theme of ``st.plotly_chart`` is merged into the template and would replace them. A chart shallow-copies its base and only patches the counts, the highlighted
+answer and its annotation.
+
+``st.plotly_chart`` validates a dict again (it builds a ``go.Figure`` from it), while a
+``go.Figure`` is only serialized. ``likert_chart`` / ``donut_chart`` therefore keep the
+validated figure of each (answer, counts, groups): counts only change with the data
+snapshot, so the reruns of a page and the participants with the same answer reuse it.
+The cached figures are shared: do not modify them.
+
+``python plotly_figures.py`` times each path through the serialization of ``st.plotly_chart``.
+"""
+import time
+from functools import lru_cache
+
+import plotly.graph_objects as go
+import plotly.io as pio
+import plotly.tools
+
+TEMPLATE = 'micah_dark'
+BACKGROUND = '#1E1E1E'
+BLUE = '#4A90E2'
+RED = '#FF4B4B'
+PURPLE = '#9B59B6'
+DONUT_COLORS = ['#4A90E2', '#50E3C2', '#9B59B6']
+
+# Fond sombre et texte blanc, posés aussi sur chaque figure : le thème Streamlit l'emporte sur le template
+_DARK_LAYOUT = dict(plot_bgcolor=BACKGROUND, paper_bgcolor=BACKGROUND, font=dict(color='white'))
+
+# Thème sombre de l'app, ajouté au thème Plotly par défaut
+_template = go.layout.Template(pio.templates['plotly'])
+_template.layout.update(
+    margin=dict(l=0, r=0, t=30, b=0),
+    height=300,
+    **_DARK_LAYOUT,
+)
+pio.templates[TEMPLATE] = _template
+
+# Flèche « Toi » pointant la réponse du participant
+_USER_ARROW = {'arrowcolor': '#FFFFFF', 'arrowhead': 2, 'arrowsize': 1, 'arrowwidth': 2, 'ax': 40, 'ay': 0,
+               'font': {'color': 'white', 'size': 12}, 'showarrow': True, 'text': 'Toi'}
+
+
+# region Likert
+@lru_cache(maxsize=64)
+def likert_base(options, my_group_name, other_group_name=None, compare_button=None):
+    """
+    Validated Likert figure of a question without its counts, as a dict. The other
+    group's trace is added when ``other_group_name`` is given, hidden behind
+    ``compare_button`` if there is one.
+    """
+    fig = go.Figure(layout=dict(
+        _DARK_LAYOUT,
+        template=TEMPLATE,
+        margin=dict(l=0, r=0, t=30, b=0),
+        height=300,
+        xaxis=dict(showgrid=False, showticklabels=False),
+        yaxis=dict(showgrid=False),
+        barmode='group',
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1, font=dict(color='white')),
+    ))
+    fig.add_trace(go.Bar(
+        y=list(options),
+        name=my_group_name,
+        orientation='h',
+        marker=dict(color=[BLUE] * len(options), line=dict(width=[0] * len(options),
+                                                           color=['rgba(0,0,0,0)'] * len(options)),
+                    cornerradius=10),
+        textposition='auto',
+    ))
+    if other_group_name is not None:
+        fig.add_trace(go.Bar(
+            y=list(options),
+            name=other_group_name,
+            orientation='h',
+            marker=dict(color=PURPLE, cornerradius=10),
+            textposition='auto',
+            visible=compare_button is None,
+        ))
+        # Bouton de comparaison : restyle côté navigateur, sans relancer le script
+        if compare_button:
+            fig.update_layout(updatemenus=[dict(
+                type='buttons',
+                x=0, y=1.02, xanchor='left', yanchor='bottom',
+                showactive=False,
+                bgcolor=BLUE, bordercolor=BLUE, font=dict(color='white'),
+                buttons=[dict(label=compare_button, method='restyle',
+                              args=[{'visible': [True, True]}], args2=[{'visible': [True, False]}])],
+            )])
+    return fig.to_dict()
+
+
+def likert_figure(user_choice, options, my_counts, other_counts=None, my_group_name="Mon Groupe",
+                  other_group_name="Autre", compare_button=None):
+    """Likert chart (as a dict) patched from the base of its question."""
+    options = tuple(options)
+    has_other = bool(other_counts)
+    base = likert_base(options, my_group_name, other_group_name if has_other else None,
+                       compare_button if has_other else None)
+    layout = base['layout']
+
+    mine = dict(base['data'][0], x=list(my_counts), text=[str(count) for count in my_counts])
+    if user_choice in options:
+        idx = options.index(user_choice)
+        marker = mine['marker']
+        mine['marker'] = dict(marker, color=[RED if i == idx else color for i, color in enumerate(marker['color'])],
+                              line={'width': [3 if i == idx else 0 for i in range(len(options))],
+                                    'color': ['#FFFFFF' if i == idx else 'rgba(0,0,0,0)' for i in range(len(options))]})
+        layout = dict(layout, annotations=[dict(_USER_ARROW, x=my_counts[idx], y=idx)])
+    data = [mine]
+
+    if has_other:
+        data.append(dict(base['data'][1], x=list(other_counts), text=[str(count) for count in other_counts]))
+    return {'data': data, 'layout': layout}
+
+
+@lru_cache(maxsize=512)
+def likert_chart(user_choice, options, my_counts, other_counts=None, my_group_name="Mon Groupe",
+                 other_group_name="Autre", compare_button=None):
+    """Validated ``go.Figure`` of ``likert_figure``, cached (options and counts as tuples)."""
+    return go.Figure(likert_figure(user_choice, options, my_counts, other_counts, my_group_name,
+                                   other_group_name, compare_button))
+# endregion
+
+
+# region Donut
+@lru_cache(maxsize=32)
+def donut_base(options):
+    """Validated donut figure of a question without its counts, as a dict."""
+    fig = go.Figure(
+        data=[go.Pie(
+            labels=list(options),
+            hole=.6,
+            marker=dict(colors=DONUT_COLORS),
+            textinfo='label+percent',
+            hoverinfo='label+value',
+        )],
+        layout=dict(_DARK_LAYOUT, template=TEMPLATE, margin=dict(l=0, r=0, t=0, b=0), height=300, showlegend=False),
+    )
+    return fig.to_dict()
+
+
+def donut_figure(user_choice, options, counts):
+    """Donut chart (as a dict) patched from the base of its question, the user's slice pulled out."""
+    base = donut_base(tuple(options))
+    pie = dict(base['data'][0], values=list(counts), pull=[0.1 if option == user_choice else 0 for option in options])
+    center = {'font': {'color': 'white', 'size': 14}, 'showarrow': False, 'text': f"Ton Choix:<br>{user_choice}",
+              'x': 0.5, 'y': 0.5}
+    return {'data': [pie], 'layout': dict(base['layout'], annotations=[center])}
+
+
+@lru_cache(maxsize=256)
+def donut_chart(user_choice, options, counts):
+    """Validated ``go.Figure`` of ``donut_figure``, cached (options and counts as tuples)."""
+    return go.Figure(donut_figure(user_choice, options, counts))
+# endregion
+
+
+def _time_ms(build, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        build()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def plotly_chart_payload(figure_or_data):
+    """The figure JSON ``st.plotly_chart`` sends: validation of a dict, then serialization."""
+    figure = plotly.tools.return_figure_from_figure_or_data(figure_or_data, validate_figure=True)
+    return pio.to_json(figure, validate=False)
+
+
+def benchmark(repeat=200):
+    """
+    Per-render time (ms), through the serialization of ``st.plotly_chart``, of a chart
+    built as a ``go.Figure`` (as each render did before), patched from its base as a
+    dict, and read from the cache of validated figures.
+    """
+    likert_options = ("Jamais", "Parfois", "Souvent", "Tous les soirs")
+    donut_options = ("Oui", "Non", "Je ne sais pas")
+    likert_args = ("Parfois", likert_options, (13, 14, 10, 17), (16, 12, 15, 23), "Ado (11-17 ans)", "Adulte",
+                   "🔄 Comparer")
+    donut_args = ("Oui", donut_options, (20, 30, 10))
+    charts = {'likert': (likert_figure, likert_chart, likert_args), 'donut': (donut_figure, donut_chart, donut_args)}
+
+    def validated(patch, args):
+        chart = patch(*args)
+        return go.Figure(data=chart['data'], layout=dict(chart['layout'], template=TEMPLATE))
+
+    return {name: (_time_ms(lambda: plotly_chart_payload(validated(patch, args)), repeat),
+                   _time_ms(lambda: plotly_chart_payload(patch(*args)), repeat),
+                   _time_ms(lambda: plotly_chart_payload(cached(*args)), repeat))
+            for name, (patch, cached, args) in charts.items()}
+
+
+if __name__ == '__main__':
+    for name, (before, patched, cached) in benchmark().items():
+        print(f"{name:<7} go.Figure : {before:7.3f} ms   base + patch : {patched:7.3f} ms   "
+              f"figure en cache : {cached:7.3f} ms   (x{before / cached:.0f})")
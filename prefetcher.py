@@ -0,0 +1,45 @@
+"""
+Background prefetching of the data of the next pages.
+
+The survey loads its data once, when the participant starts. ``Prefetcher.submit`` runs
+a refresh job (reload the answers, publish a snapshot, compute the counts of the next
+chart) in a small thread pool while the participant answers the current question, and
+returns its ``Future``: the chart page then uses the fresh snapshot if the job is done,
+and the session's data otherwise, so it never waits.
+
+Sessions submitting the same key share the running job, and a finished job is reused for
+``max_age`` seconds: a group of tablets on the same question triggers one reload.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Prefetcher:
+    """Runs refresh jobs in background threads, one at a time per key."""
+
+    def __init__(self, max_workers=2, max_age=15):
+        self.max_age = max_age
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="prefetch")
+        self._lock = threading.Lock()
+        self._jobs = {}  # key -> (start time, Future)
+        self._stats = {'submitted': 0, 'shared': 0}
+
+    def submit(self, key, job, *args):
+        """``Future`` of ``job(*args)``: the running or recent job of ``key``, or a new one."""
+        with self._lock:
+            started, future = self._jobs.get(key, (None, None))
+            if future is not None and (not future.done() or (
+                    time.monotonic() - started < self.max_age and future.exception() is None)):
+                self._stats['shared'] += 1
+                return future
+            future = self._executor.submit(job, *args)
+            self._jobs[key] = (time.monotonic(), future)
+            self._stats['submitted'] += 1
+            return future
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['running'] = sum(not future.done() for _, future in self._jobs.values())
+        return stats
@@ -0,0 +1,132 @@
+"""
+Process pool rendering charts to PNG bytes.
+
+Streamlit runs every session in a thread of the same process, so rendering charts and
+word clouds there serializes them on the GIL. ``RenderPool`` ships each job (a
+module-level builder returning a ``Figure`` or None, with picklable arguments) to a
+``ProcessPoolExecutor`` whose workers use the Agg backend and return PNG bytes, so
+several pages can be rendered at once on multi-core hosts.
+
+Workers are started with the ``spawn`` method (forking a process running Streamlit's
+threads is unsafe) and lazily, on the first job. If the pool cannot be used, jobs are
+rendered in the calling process instead.
+
+``submit_shared`` keeps the PNG bytes in a ``SharedCache`` (see shared_cache), so the
+processes sharing it render each chart once.
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from figures import figure_manager
+
+_MISSING = object()
+
+
+def _init_worker():
+    import matplotlib
+    matplotlib.use('Agg')
+
+
+def _render(builder, args, kwargs):
+    """Runs a builder and serializes its figure (None if there is nothing to draw)."""
+    fig = builder(*args, **kwargs)
+    return figure_manager.to_png(fig) if fig is not None else None
+
+
+class RenderPool:
+    """Renders chart builders in worker processes and returns futures of PNG bytes."""
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers or max(1, min(4, (os.cpu_count() or 1) - 1))
+        self._lock = threading.Lock()
+        self._executor = None
+        self._broken = False
+        self._shared_waiters = None
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None and not self._broken:
+                try:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=multiprocessing.get_context('spawn'),
+                        initializer=_init_worker,
+                    )
+                except (OSError, NotImplementedError):
+                    self._broken = True
+            return self._executor
+
+    def _mark_broken(self):
+        with self._lock:
+            self._broken = True
+            self._executor = None
+
+    def _render_here(self, builder, args, kwargs, future=None):
+        future = future or Future()
+        try:
+            future.set_result(_render(builder, args, kwargs))
+        except Exception as error:
+            future.set_exception(error)
+        return future
+
+    def _forward(self, done, future, builder, args, kwargs):
+        error = done.exception()
+        if isinstance(error, BrokenProcessPool):
+            self._mark_broken()
+            self._render_here(builder, args, kwargs, future)
+        elif error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(done.result())
+
+    def submit(self, builder, *args, **kwargs):
+        """``Future`` of the PNG bytes of ``builder(*args, **kwargs)`` (None if there is nothing to draw)."""
+        executor = self._get_executor()
+        if executor is not None:
+            try:
+                job = executor.submit(_render, builder, args, kwargs)
+            except (BrokenProcessPool, RuntimeError):
+                self._mark_broken()
+            else:
+                future = Future()
+                job.add_done_callback(lambda done: self._forward(done, future, builder, args, kwargs))
+                return future
+        return self._render_here(builder, args, kwargs)
+
+    def submit_shared(self, cache, key, builder, *args, **kwargs):
+        """
+        Same as ``submit``, with the PNG bytes kept in ``cache`` under ``key`` (a tuple
+        identifying the chart and its data): rendered by one of the processes sharing the
+        cache while the others wait for it. Without a cache, same as ``submit``.
+        """
+        if cache is None:
+            return self.submit(builder, *args, **kwargs)
+        png = cache.get(key, _MISSING)
+        if png is not _MISSING:
+            future = Future()
+            future.set_result(png)
+            return future
+        # Attente du verrou du cache dans un thread, pas dans la page
+        with self._lock:
+            if self._shared_waiters is None:
+                self._shared_waiters = ThreadPoolExecutor(max_workers=2 * self.max_workers,
+                                                          thread_name_prefix="render-shared")
+            waiters = self._shared_waiters
+        return waiters.submit(cache.get_or_compute, key, lambda: self.render(builder, *args, **kwargs))
+
+    def render(self, builder, *args, **kwargs):
+        """PNG bytes of ``builder(*args, **kwargs)``, or None when there is nothing to draw."""
+        return self.submit(builder, *args, **kwargs).result()
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Pool partagé par les pages
+render_pool = RenderPool()
@@ -0,0 +1,329 @@
+"""
+Storage backends of the survey answers.
+
+``SheetsStore`` keeps the Google Sheet as the system of record: every read downloads the
+whole worksheet and counts are computed in pandas. ``SQLiteStore`` keeps the answers in a
+local SQLite file instead, in WAL mode so that the sessions of the app can read while one
+of them writes, with indexes on the pseudo (unique), the category and the timestamp (so
+loading the answers of one event only reads its rows). The chart counts are then
+``GROUP BY`` queries, and a ``SheetsMirror`` can copy the new rows to the Google Sheet in
+the background, so the app keeps working when the event's network is down.
+
+Both backends expose the same methods: ``load``, ``append``, ``pseudo_exists``,
+``pseudos`` and ``counts``. ``SheetsStore.append`` raises ``WritePendingError`` when the row is still
+queued after its timeout: it may yet be written, or fail, so it is not saved yet.
+
+Several replicas of the app can share the reads of the sheet through a ``SharedCache``
+(see shared_cache): the rows are then downloaded once per ``read_ttl`` seconds for all
+of them.
+"""
+import sqlite3
+import threading
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+import pandas as pd
+
+from sheets_gateway import SheetsGateway
+
+# Colonnes du questionnaire, dans l'ordre de la feuille
+RESPONSE_COLUMNS = [
+    'Secret_Code', 'Category', 'Screen_Habit', 'AI_Freq', 'AI_Purpose', 'AI_Wordcloud_Input',
+    'AI_Benefit', 'AI_Benefit_Scale', 'ChatGPT_Feelings', 'AI_Concern_Scale', 'AI_Concern_Items',
+    'AI_Responsible_People', 'AI_Feature', 'AI_Prevention_Campaign', 'AI_Comments', 'Timestamp',
+]
+
+
+class DuplicatePseudoError(ValueError):
+    """Raised when a row is appended with a pseudo that is already taken."""
+
+
+class WritePendingError(TimeoutError):
+    """Raised when a row is still queued after the timeout of ``append``; ``future`` is its write."""
+
+    def __init__(self, future):
+        super().__init__("La réponse est encore en attente d'envoi vers la feuille")
+        self.future = future
+
+
+def count_answers(df, category, column, options):
+    """Number of answers of ``category`` (matched on its first 3 letters) for each option."""
+    if df.empty or column not in df.columns:
+        return [0] * len(options)
+    filtered_df = df[df['Category'].astype(str).str.contains(category[:3], case=False, na=False)]
+    counts = filtered_df[column].value_counts()
+    return counts.reindex(options, fill_value=0).tolist()
+
+
+class SheetsStore:
+    """
+    Answers stored in a Google Sheet worksheet. Every API request goes through
+    ``gateway`` (a ``SheetsGateway`` shared by the stores of the same account); with a
+    ``cache`` (``SharedCache``), the rows read are shared for ``read_ttl`` seconds.
+    """
+
+    def __init__(self, gspread_client, sheet_id, worksheet_name, gateway=None, write_timeout=30, cache=None,
+                 read_ttl=10):
+        self.client = gspread_client
+        self.sheet_id = sheet_id
+        self.worksheet_name = worksheet_name
+        self.gateway = gateway or SheetsGateway()
+        self.write_timeout = write_timeout
+        self.cache = cache
+        self.read_ttl = read_ttl
+        self._worksheet = None
+
+    def request_key(self, name):
+        """Gateway key of a read request on this worksheet."""
+        return (name, self.sheet_id, self.worksheet_name)
+
+    def worksheet(self):
+        """The worksheet, opened on first use."""
+        if self._worksheet is None:
+            self._worksheet = self.gateway.read(
+                self.request_key('worksheet'),
+                lambda: self.client.open_by_key(self.sheet_id).worksheet(self.worksheet_name))
+        return self._worksheet
+
+    def header(self):
+        """Column names (first row of the sheet)."""
+        worksheet = self.worksheet()
+        return self.gateway.read(self.request_key('header'), lambda: worksheet.row_values(1))
+
+    def _records(self):
+        return self.gateway.read(self.request_key('records'), self.worksheet().get_all_records)
+
+    def load(self):
+        """All the answers, as a dataframe with the columns of the sheet."""
+        if self.cache is None:
+            return pd.DataFrame(self._records())
+        return pd.DataFrame(self.cache.get_or_compute(self.request_key('records'), self._records, self.read_ttl))
+
+    def append_async(self, row):
+        """Queues one row (values in the order of the keys of ``row``) and returns the ``Future`` of the write."""
+        values = [row.get(col, "") for col in row]
+        return self.gateway.append_row(self.worksheet(), values)
+
+    def append(self, row, timeout=None):
+        """
+        Appends one row, waiting at most ``timeout`` seconds (``write_timeout`` by default)
+        for the write. Past that, raises ``WritePendingError``: the row stays queued in the
+        gateway, and its ``future`` tells whether it was written in the end.
+        """
+        future = self.append_async(row)
+        try:
+            future.result(timeout=self.write_timeout if timeout is None else timeout)
+        except FutureTimeoutError:
+            raise WritePendingError(future) from None
+
+    def append_many(self, rows, columns=None):
+        """
+        Appends a batch of rows in one request, with their values in the order of ``columns``
+        (by default the header of the sheet).
+        """
+        columns = columns or self.header() or list(dict.fromkeys(col for row in rows for col in row))
+        values = [["" if row.get(col) is None else row.get(col) for col in columns] for row in rows]
+        worksheet = self.worksheet()
+        self.gateway.write(lambda: worksheet.append_rows(values, value_input_option='USER_ENTERED')).result()
+        return len(values)
+
+    def pseudo_exists(self, pseudo):
+        return pseudo.upper() in self.pseudos()
+
+    def pseudos(self):
+        """Pseudos already taken, in upper case (one read of the sheet, to check many rows)."""
+        # Toujours relu : un pseudo pris il y a quelques secondes doit être vu
+        df = pd.DataFrame(self._records())
+        if 'Secret_Code' not in df.columns:
+            return set()
+        return set(df['Secret_Code'].astype(str).str.upper())
+
+    def counts(self, category, column, options):
+        return count_answers(self.load(), category, column, options)
+
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+class SQLiteStore:
+    """
+    Answers stored in a local SQLite database (one table, one column per question).
+
+    Each thread gets its own connection. Columns missing from the table are added the
+    first time a row contains them, like new headers in the sheet.
+    """
+
+    TABLE = 'responses'
+
+    def __init__(self, path, columns=RESPONSE_COLUMNS):
+        self.path = path
+        self._local = threading.local()
+        self._schema_lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute(f"CREATE TABLE IF NOT EXISTS {self.TABLE} ("
+                         "_id INTEGER PRIMARY KEY AUTOINCREMENT, _mirrored INTEGER NOT NULL DEFAULT 0)")
+        self._columns = self._table_columns()
+        self._ensure_columns(columns)
+        with self._connect() as conn:
+            conn.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS idx_{self.TABLE}_pseudo "
+                         f"ON {self.TABLE} (Secret_Code COLLATE NOCASE)")
+            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{self.TABLE}_category ON {self.TABLE} (Category)")
+            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{self.TABLE}_timestamp ON {self.TABLE} (Timestamp)")
+            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{self.TABLE}_mirrored ON {self.TABLE} (_mirrored)")
+
+    # region Connection and schema
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _table_columns(self):
+        rows = self._connect().execute(f"PRAGMA table_info({self.TABLE})").fetchall()
+        return [row[1] for row in rows if not row[1].startswith('_')]
+
+    def _ensure_columns(self, columns):
+        missing = [col for col in columns if col not in self._columns]
+        if not missing:
+            return
+        with self._schema_lock:
+            existing = self._table_columns()
+            with self._connect() as conn:
+                for col in missing:
+                    if col not in existing:
+                        conn.execute(f"ALTER TABLE {self.TABLE} ADD COLUMN {_quote(col)}")
+            self._columns = self._table_columns()
+    # endregion
+
+    # region Writes
+    def append(self, row):
+        """Inserts one row. Raises ``DuplicatePseudoError`` if its pseudo is already taken."""
+        self._ensure_columns(list(row))
+        columns = [col for col in row if col in self._columns]
+        sql = (f"INSERT INTO {self.TABLE} ({', '.join(_quote(col) for col in columns)}) "
+               f"VALUES ({', '.join('?' for _ in columns)})")
+        try:
+            with self._connect() as conn:
+                conn.execute(sql, [row[col] for col in columns])
+        except sqlite3.IntegrityError as error:
+            raise DuplicatePseudoError(row.get('Secret_Code')) from error
+
+    def append_many(self, rows, mirrored=False):
+        """
+        Inserts a batch of rows in one transaction, skipping the pseudos already taken, and
+        returns the number of inserted rows. ``mirrored`` rows are not copied by the mirror.
+        """
+        columns = list(dict.fromkeys(col for row in rows for col in row))
+        if not columns:
+            return 0
+        self._ensure_columns(columns)
+        sql = (f"INSERT OR IGNORE INTO {self.TABLE} (_mirrored, {', '.join(_quote(col) for col in columns)}) "
+               f"VALUES (?, {', '.join('?' for _ in columns)})")
+        conn = self._connect()
+        before = conn.total_changes
+        with conn:
+            conn.executemany(sql, ([int(mirrored)] + [row.get(col) for col in columns] for row in rows))
+        return conn.total_changes - before
+    # endregion
+
+    # region Queries
+    def _select(self, window):
+        """Query of the answers of a ``TimeWindow`` (all of them if None), using the timestamp index."""
+        columns = ', '.join(_quote(col) for col in self._columns)
+        where, params = window.sql() if window is not None else ('1', [])
+        return f"SELECT {columns} FROM {self.TABLE} WHERE {where} ORDER BY _id", params
+
+    def load(self, window=None):
+        """The answers (of ``window`` if given), in insertion order."""
+        sql, params = self._select(window)
+        return pd.read_sql_query(sql, self._connect(), params=params)
+
+    def iter_batches(self, batch_size=1000, window=None):
+        """The answers as dataframes of at most ``batch_size`` rows, in insertion order."""
+        sql, params = self._select(window)
+        yield from pd.read_sql_query(sql, self._connect(), params=params, chunksize=batch_size)
+
+    def pseudo_exists(self, pseudo):
+        row = self._connect().execute(
+            f"SELECT 1 FROM {self.TABLE} WHERE Secret_Code = ? COLLATE NOCASE LIMIT 1", (pseudo,)).fetchone()
+        return row is not None
+
+    def pseudos(self):
+        """Pseudos already taken, in upper case."""
+        rows = self._connect().execute(f"SELECT UPPER(Secret_Code) FROM {self.TABLE} WHERE Secret_Code IS NOT NULL")
+        return {pseudo for pseudo, in rows}
+
+    def counts(self, category, column, options):
+        """Same as ``count_answers``, computed by SQLite."""
+        if column not in self._columns:
+            return [0] * len(options)
+        rows = self._connect().execute(
+            f"SELECT {_quote(column)}, COUNT(*) FROM {self.TABLE} WHERE Category LIKE ? GROUP BY 1",
+            ('%' + category[:3] + '%',)).fetchall()
+        counts = dict(rows)
+        return [counts.get(option, 0) for option in options]
+
+    def unmirrored(self, limit=100):
+        """(id, row) of the oldest rows not copied to the mirror yet."""
+        columns = ', '.join(_quote(col) for col in self._columns)
+        cursor = self._connect().execute(
+            f"SELECT _id, {columns} FROM {self.TABLE} WHERE _mirrored = 0 ORDER BY _id LIMIT ?", (limit,))
+        return [(values[0], dict(zip(self._columns, values[1:]))) for values in cursor.fetchall()]
+
+    def mark_mirrored(self, row_ids):
+        with self._connect() as conn:
+            conn.executemany(f"UPDATE {self.TABLE} SET _mirrored = 1 WHERE _id = ?", [(row_id,) for row_id in row_ids])
+    # endregion
+
+
+class SheetsMirror:
+    """
+    Copies the rows of a ``SQLiteStore`` to a ``SheetsStore`` in a background thread.
+
+    Rows are copied oldest first, in the order of the sheet's columns, and marked once
+    appended; when the sheet cannot be reached, they are retried at the next sync.
+    """
+
+    def __init__(self, store, sheets, interval=30):
+        self.store = store
+        self.sheets = sheets
+        self.interval = interval
+        self.last_error = None
+        self._wake = threading.Event()
+        self._thread = None
+
+    def sync(self):
+        """Copies the pending rows (one request per batch) and returns how many were copied."""
+        copied = 0
+        while True:
+            pending = self.store.unmirrored()
+            if not pending:
+                return copied
+            rows = [{col: (None if pd.isna(value) else value) for col, value in row.items()} for _, row in pending]
+            try:
+                self.sheets.append_many(rows)
+            except Exception as error:
+                self.last_error = error
+                return copied
+            self.store.mark_mirrored([row_id for row_id, _ in pending])
+            copied += len(pending)
+            self.last_error = None
+
+    def notify(self):
+        """Asks the background thread to sync now (e.g. after a submission)."""
+        self._wake.set()
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="sheets-mirror", daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self):
+        while True:
+            self.sync()
+            self._wake.wait(self.interval)
+            self._wake.clear()
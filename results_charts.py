@@ -0,0 +1,327 @@
+"""
+Chart builders of the results pages (step 6 group cloud and step 20).
+
+The figures come from ``figures.figure_manager`` rather than pyplot, so the builders can
+run outside of the Streamlit script thread; every builder is a module-level function
+with picklable arguments, so it can also be sent to ``render_pool.render_pool``.
+"""
+import matplotlib
+import numpy as np
+from wordcloud import WordCloud
+
+from figures import figure_manager
+from results_engine import ADOLESCENTS, ADULTES
+
+# Libellés des groupes sur le graphique de comparaison
+CHART_GROUP_LABELS = {ADOLESCENTS: "Adolescents (11-17 ans)", ADULTES: "Adultes"}
+
+# Niveaux de rendu des nuages de mots. L'aperçu place moins de mots sur un petit canevas,
+# agrandi à l'export (scale) pour garder la taille de l'image finale.
+WORDCLOUD_TIERS = {
+    'preview': {'width': 320, 'height': 160, 'scale': 2.5, 'max_words': 40},
+    'full': {'width': 800, 'height': 400, 'scale': 1},
+}
+# Taille relative de la figure (et donc du PNG exporté) par niveau de rendu
+WORDCLOUD_FIGURE_SCALES = {'preview': 0.5, 'full': 1}
+
+
+# Fonction pour créer un graphique Likert
+def create_likert_chart(counts, total, title, participant_answer=None):
+    """
+    Crée un graphique Likert horizontal
+    """
+    # Calculer les pourcentages
+    percentages = np.array(counts.counts) / total * 100
+
+    # Créer le graphique
+    fig, ax = figure_manager.subplots(figsize=(12, 6))
+
+    # Définir les couleurs pour l'échelle Likert (du négatif au positif)
+    colors = ['#d32f2f', '#f57c00', '#fbc02d', '#388e3c']  # Rouge, Orange, Jaune, Vert
+
+    # Créer les barres horizontales
+    bars = ax.barh(range(len(counts)), percentages,
+                   color=colors[:len(counts)], alpha=0.7, edgecolor='black', linewidth=1)
+
+    # Mettre en évidence la réponse du participant si elle existe
+    if participant_answer is not None and participant_answer in counts:
+        participant_idx = counts.labels.index(participant_answer)
+        bars[participant_idx].set_edgecolor('red')
+        bars[participant_idx].set_linewidth(3)
+        bars[participant_idx].set_alpha(1.0)
+
+    # Personnaliser le graphique
+    ax.set_yticks(range(len(counts)))
+    ax.set_yticklabels(counts.labels, fontsize=11)
+    ax.set_xlabel('Pourcentage des réponses (%)', fontsize=12, fontweight='bold')
+    ax.set_title(title, fontsize=14, fontweight='bold', pad=20)
+
+    # Ajouter les valeurs sur les barres
+    for i, (bar, count, pct) in enumerate(zip(bars, counts.counts, percentages)):
+        ax.text(bar.get_width() + 1, bar.get_y() + bar.get_height() / 2,
+                f'{count} ({pct:.1f}%)',
+                ha='left', va='center', fontweight='bold', fontsize=10)
+
+    # Améliorer l'apparence
+    ax.set_xlim(0, max(percentages) * 1.2)
+    ax.grid(axis='x', alpha=0.3, linestyle='--')
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+
+    fig.tight_layout()
+    return fig
+
+
+# Fonction pour créer un graphique d'échelle numérique
+def create_numeric_scale_chart(distribution, total, title, participant_answer=None):
+    """
+    Crée un graphique en barres pour une échelle numérique (1-10)
+    """
+    # Comptes des valeurs de 1 à 10 et pourcentages
+    all_values = np.array(distribution)
+    percentages = all_values / total * 100
+
+    fig, ax = figure_manager.subplots(figsize=(14, 8))
+
+    # Définir un gradient de couleurs du vert (peu préoccupé) au rouge (très préoccupé)
+    colors = matplotlib.colormaps['RdYlGn_r'](np.linspace(0.2, 0.8, 10))
+
+    # Créer les barres
+    bars = ax.bar(range(1, 11), percentages, color=colors, alpha=0.7,
+                  edgecolor='black', linewidth=1)
+
+    # Mettre en évidence la réponse du participant
+    if participant_answer is not None and 1 <= participant_answer <= 10:
+        bars[int(participant_answer) - 1].set_edgecolor('red')
+        bars[int(participant_answer) - 1].set_linewidth(4)
+        bars[int(participant_answer) - 1].set_alpha(1.0)
+
+    # Personnaliser le graphique
+    ax.set_xlabel('Niveau de préoccupation (1 = Pas du tout, 10 = Extrêmement)',
+                  fontsize=12, fontweight='bold')
+    ax.set_ylabel('Pourcentage des réponses (%)', fontsize=12, fontweight='bold')
+    ax.set_title(title, fontsize=14, fontweight='bold', pad=20)
+    ax.set_xticks(range(1, 11))
+
+    # Ajouter les valeurs sur les barres
+    for i, (bar, count, pct) in enumerate(zip(bars, all_values, percentages)):
+        if count > 0:  # N'afficher que si il y a des réponses
+            ax.text(bar.get_x() + bar.get_width() / 2, bar.get_height() + 0.5,
+                    f'{count}\n({pct:.1f}%)',
+                    ha='center', va='bottom', fontweight='bold', fontsize=9)
+
+    # Améliorer l'apparence
+    ax.set_ylim(0, max(percentages) * 1.2 if max(percentages) > 0 else 10)
+    ax.grid(axis='y', alpha=0.3, linestyle='--')
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+
+    fig.tight_layout()
+    return fig
+
+
+# Fonction pour créer un graphique de comparaison par catégorie d'âge
+def create_age_category_comparison_chart(group_stats, title):
+    """
+    Crée un graphique comparant les réponses entre adolescents et adultes
+    """
+    if len(group_stats) == 0:
+        return None
+
+    labels = [CHART_GROUP_LABELS.get(stats.group, stats.group) for stats in group_stats]
+
+    fig, ax1 = figure_manager.subplots(figsize=(16, 10))
+
+    # Graphique 1: Moyennes par groupe avec barres d'erreur
+    colors = ['#ff7f50', '#4682b4']  # Orange pour ados, Bleu pour adultes
+    bars1 = ax1.bar(labels, [stats.mean for stats in group_stats],
+                    color=colors[:len(group_stats)], alpha=0.7,
+                    edgecolor='black', linewidth=1,
+                    yerr=[stats.std for stats in group_stats], capsize=5)
+
+    ax1.set_ylabel('Niveau moyen de préoccupation', fontsize=11, fontweight='bold')
+    ax1.set_title('Niveau moyen de préoccupation par groupe', fontsize=12, fontweight='bold')
+    ax1.set_ylim(0, 10)
+    ax1.grid(axis='y', alpha=0.3, linestyle='--')
+
+    # Rotation des labels si nécessaire
+    ax1.tick_params(axis='x', rotation=45)
+
+    # Ajouter les valeurs sur les barres
+    for bar, stats in zip(bars1, group_stats):
+        ax1.text(bar.get_x() + bar.get_width() / 2, bar.get_height() + 0.2,
+                 f'{stats.mean:.1f}\n(n={stats.count})',
+                 ha='center', va='bottom', fontweight='bold', fontsize=10)
+
+    fig.tight_layout()
+    return fig
+
+
+# Fonction pour créer comparaison de wordcloud graphique
+def create_wordcloud_comparison(text_summary, tier='full'):
+    """
+    Crée des word clouds comparatifs pour adolescents et adultes
+    """
+    adolescents_combined = text_summary.text_for(ADOLESCENTS)
+    adultes_combined = text_summary.text_for(ADULTES)
+
+    # Créer les word clouds
+    wordcloud_kwargs = {
+        'background_color': 'white',
+        'max_words': 100,
+        'relative_scaling': 0.5,
+        'min_font_size': 10,
+        **WORDCLOUD_TIERS[tier]
+    }
+
+    wc_adolescents = None
+    wc_adultes = None
+
+    if adolescents_combined.strip():
+        wc_adolescents = WordCloud(**wordcloud_kwargs, colormap='Oranges').generate(adolescents_combined)
+
+    if adultes_combined.strip():
+        wc_adultes = WordCloud(**wordcloud_kwargs, colormap='Blues').generate(adultes_combined)
+
+    return wc_adolescents, wc_adultes
+
+
+def plot_wordclouds(wc_adolescents, wc_adultes, adolescents_count, adultes_count, figure_scale=1):
+    """
+    Affiche les word clouds côte à côte (None si aucun word cloud n'a pu être généré)
+    """
+    # Déterminer le nombre de subplots nécessaires
+    valid_clouds = sum([wc_adolescents is not None, wc_adultes is not None])
+
+    if valid_clouds == 0:
+        return None
+
+    if valid_clouds == 1:
+        fig, ax = figure_manager.subplots(1, 1, figsize=(12 * figure_scale, 6 * figure_scale))
+        axes = [ax]
+    else:
+        fig, axes = figure_manager.subplots(1, 2, figsize=(16 * figure_scale, 8 * figure_scale))
+
+    current_ax = 0
+
+    # Word cloud des adolescents
+    if wc_adolescents is not None:
+        axes[current_ax].imshow(wc_adolescents, interpolation='bilinear')
+        axes[current_ax].set_title(f'🧑‍🎓 Adolescents (n={adolescents_count})',
+                                   fontsize=14 * figure_scale, fontweight='bold', color='#ff7f50')
+        axes[current_ax].axis('off')
+        current_ax += 1
+
+    # Word cloud des adultes
+    if wc_adultes is not None:
+        ax_index = current_ax if valid_clouds == 2 else 0
+        axes[ax_index].imshow(wc_adultes, interpolation='bilinear')
+        axes[ax_index].set_title(f'👨‍👩‍👧‍👦 Adultes (n={adultes_count})',
+                                 fontsize=14 * figure_scale, fontweight='bold', color='#4682b4')
+        axes[ax_index].axis('off')
+
+    fig.tight_layout()
+    return fig
+
+
+def create_wordclouds_chart(text_summary, tier='full'):
+    """
+    Word clouds des adolescents et des adultes côte à côte (None si aucun ne peut être généré)
+    """
+    wc_adolescents, wc_adultes = create_wordcloud_comparison(text_summary, tier)
+    return plot_wordclouds(wc_adolescents, wc_adultes,
+                           text_summary.respondents.get(ADOLESCENTS),
+                           text_summary.respondents.get(ADULTES),
+                           WORDCLOUD_FIGURE_SCALES[tier])
+
+
+def create_group_wordcloud_chart(text, tier='full'):
+    """
+    Nuage de mots de toutes les réponses (step 6), sur fond sombre
+    """
+    wordcloud = WordCloud(background_color='#1E1E1E', colormap='Blues', **WORDCLOUD_TIERS[tier]).generate(text)
+    figure_scale = WORDCLOUD_FIGURE_SCALES[tier]
+    fig, ax = figure_manager.subplots(figsize=(6.4 * figure_scale, 4.8 * figure_scale))
+    ax.imshow(wordcloud, interpolation='bilinear')
+    ax.axis("off")
+    fig.patch.set_facecolor('#1E1E1E')
+    return fig
+
+
+def plot_donut_charts(adolescents_counts, adultes_counts):
+    """
+    Affiche les graphiques en donut côte à côte (None s'il n'y a aucune donnée)
+    """
+    # Déterminer le nombre de graphiques à afficher
+    charts_to_show = []
+    if adolescents_counts:
+        charts_to_show.append(('Adolescents', adolescents_counts, '#ff7f50'))
+    if adultes_counts:
+        charts_to_show.append(('Adultes', adultes_counts, '#4682b4'))
+
+    if len(charts_to_show) == 0:
+        return None
+
+    # Créer la figure
+    if len(charts_to_show) == 1:
+        fig, ax = figure_manager.subplots(1, 1, figsize=(10, 8))
+        axes = [ax]
+    else:
+        fig, axes = figure_manager.subplots(1, 2, figsize=(16, 8))
+
+    for i, (group_name, counts, base_color) in enumerate(charts_to_show):
+        ax = axes[i] if len(charts_to_show) > 1 else axes[0]
+
+        # Préparer les données pour le graphique
+        labels = counts.labels
+        sizes = counts.counts
+        total_responses = sum(sizes)
+
+        # Tronquer les labels trop longs pour l'affichage
+        display_labels = []
+        for label in labels:
+            if len(label) > 30:
+                display_labels.append(label[:27] + "...")
+            else:
+                display_labels.append(label)
+
+        # Créer une palette de couleurs basée sur la couleur de base
+        if base_color == '#ff7f50':  # Orange pour adolescents
+            colors = matplotlib.colormaps['Oranges'](np.linspace(0.4, 0.8, len(sizes)))
+        else:  # Bleu pour adultes
+            colors = matplotlib.colormaps['Blues'](np.linspace(0.4, 0.8, len(sizes)))
+
+        # Créer le donut chart
+        wedges, texts, autotexts = ax.pie(
+            sizes,
+            labels=display_labels,
+            colors=colors,
+            autopct=lambda pct: f'{pct:.1f}%\n({int(pct / 100 * total_responses)})',
+            startangle=90,
+            pctdistance=0.85,
+            wedgeprops=dict(width=0.5, edgecolor='white', linewidth=2)
+        )
+
+        # Personnaliser le texte
+        for autotext in autotexts:
+            autotext.set_color('black')
+            autotext.set_fontweight('bold')
+            autotext.set_fontsize(9)
+
+        for text in texts:
+            text.set_fontsize(10)
+            text.set_fontweight('bold')
+
+        # Ajouter le titre avec emoji approprié
+        emoji = "🧑‍🎓" if group_name == "Adolescents" else "👨‍👩‍👧‍👦"
+        ax.set_title(f'{emoji} {group_name}\n({total_responses} réponses)',
+                     fontsize=14, fontweight='bold', pad=20)
+
+        # Ajouter le texte au centre du donut
+        ax.text(0, 0, f'{total_responses}\nréponses',
+                horizontalalignment='center', verticalalignment='center',
+                fontsize=12, fontweight='bold',
+                bbox=dict(boxstyle="round,pad=0.3", facecolor='white', alpha=0.8))
+
+    fig.tight_layout()
+    return fig
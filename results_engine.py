@@ -0,0 +1,210 @@
+"""
+Aggregation engine for the results page (step 20).
+
+``summarize_results`` derives the respondent group of every row once, then computes
+every statistic the page displays (answer counts, scale distribution, means and
+standard deviations per group, multi-select counts, word-cloud text and top words)
+directly from the snapshot, without copying it. Text features read the token column
+added at load time by ``text_tokens.add_token_columns``. The result is a small immutable
+``ResultsSummary`` that the page sections read from; it is cached per snapshot.
+"""
+from collections import Counter
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from text_tokens import join_tokens, tokens_of
+
+ADOLESCENTS = "Adolescents"
+ADULTES = "Adultes"
+
+
+# region Result objects
+@dataclass(frozen=True)
+class CountTable:
+    """Ordered (label, count) pairs, e.g. the output of a ``value_counts``."""
+    items: tuple = ()
+
+    @property
+    def labels(self):
+        return [label for label, _ in self.items]
+
+    @property
+    def counts(self):
+        return [count for _, count in self.items]
+
+    @property
+    def total(self):
+        return sum(self.counts)
+
+    def most_common(self, n=None):
+        ranked = sorted(self.items, key=lambda item: item[1], reverse=True)
+        return ranked if n is None else ranked[:n]
+
+    def get(self, label, default=0):
+        return dict(self.items).get(label, default)
+
+    def __getitem__(self, label):
+        return self.get(label)
+
+    def __contains__(self, label):
+        return any(item_label == label for item_label, _ in self.items)
+
+    def __bool__(self):
+        return bool(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+
+@dataclass(frozen=True)
+class GroupStats:
+    group: str
+    mean: float
+    count: int
+    std: float
+
+
+@dataclass(frozen=True)
+class ScaleSummary:
+    """1-10 scale question: overall statistics, distribution and per-group statistics."""
+    valid_count: int
+    mean: float
+    distribution: tuple  # counts for answers 1..10
+    group_stats: tuple   # GroupStats per simplified group
+
+    def stats_for(self, group):
+        return next((stats for stats in self.group_stats if stats.group == group), None)
+
+
+@dataclass(frozen=True)
+class TextSummary:
+    """Free-text question: respondents, combined word-cloud text and top words per group."""
+    total: int
+    respondents: CountTable
+    combined_text: tuple  # (group, joined tokens) pairs
+    top_words: tuple      # (group, ((word, count), ...)) pairs
+
+    def text_for(self, group):
+        return dict(self.combined_text).get(group, "")
+
+    def top_words_for(self, group):
+        return dict(self.top_words).get(group, ())
+
+
+@dataclass(frozen=True)
+class ResultsSummary:
+    n_rows: int
+    screen_habit: CountTable = None
+    concern: ScaleSummary = None
+    wordcloud: TextSummary = None
+    prevention: tuple = None  # (group, CountTable) pairs
+
+    def prevention_for(self, group):
+        return dict(self.prevention or ()).get(group, CountTable())
+# endregion
+
+
+# region Helpers
+def group_keys(category):
+    """Simplified group of every row: ADOLESCENTS, ADULTES, the raw category, or NaN."""
+    lowered = category.astype(str).str.lower()
+    is_teen = category.notna() & lowered.str.contains("ado", regex=False)
+    is_adult = category.notna() & ~is_teen & lowered.str.contains("adulte", regex=False)
+    keys = category.astype(object).where(category.notna())
+    keys = keys.mask(is_teen, ADOLESCENTS).mask(is_adult, ADULTES)
+    return keys
+
+
+def _count_table(series):
+    counts = series.value_counts()
+    return CountTable(tuple((label, int(count)) for label, count in counts.items()))
+
+
+def get_top_words(token_lists, top_n=10):
+    """Most frequent tokens of a token column, without short words."""
+    counts = Counter(token for tokens in token_lists for token in tokens if len(token) > 2)
+    return counts.most_common(top_n)
+
+
+def _split_multi_answers(series):
+    """Counts comma-separated multi-select answers."""
+    answers = Counter()
+    for response in series:
+        answers.update(answer.strip() for answer in str(response).split(','))
+    return CountTable(tuple(answers.items()))
+# endregion
+
+
+# region Sections
+def _scale_summary(values, groups):
+    valid = values.between(1, 10)
+    valid_values = values[valid]
+
+    distribution = valid_values.value_counts()
+    distribution = tuple(int(distribution.get(value, 0)) for value in range(1, 11))
+
+    with_group = valid & groups.notna()
+    stats = values[with_group].groupby(groups[with_group]).agg(['mean', 'count', 'std']).round(2)
+    group_stats = tuple(
+        GroupStats(group, float(row['mean']), int(row['count']), float(row['std']))
+        for group, row in stats.iterrows()
+    )
+
+    return ScaleSummary(
+        valid_count=int(valid.sum()),
+        mean=float(valid_values.mean()) if len(valid_values) else float('nan'),
+        distribution=distribution,
+        group_stats=group_stats,
+    )
+
+
+def _text_summary(texts, tokens, groups, top_n):
+    valid = texts.notna() & groups.notna()
+    valid_tokens = tokens[valid]
+    valid_groups = groups[valid]
+
+    combined = []
+    top_words = []
+    for group in (ADOLESCENTS, ADULTES):
+        group_tokens = valid_tokens[valid_groups == group]
+        combined.append((group, join_tokens(group_tokens)))
+        top_words.append((group, tuple(get_top_words(group_tokens, top_n))))
+
+    return TextSummary(
+        total=int(valid.sum()),
+        respondents=_count_table(valid_groups),
+        combined_text=tuple(combined),
+        top_words=tuple(top_words),
+    )
+
+
+def _multi_select_summary(answers, groups):
+    valid = answers.notna() & groups.notna()
+    return tuple(
+        (group, _split_multi_answers(answers[valid & (groups == group)]))
+        for group in (ADOLESCENTS, ADULTES)
+    )
+# endregion
+
+
+def summarize_results(df, category_col='Category', screen_col='Screen_Habit', concern_col='AI_Concern_Scale',
+                      text_col='AI_Wordcloud_Input', multi_select_col='AI_Prevention_Campaign', top_n=8):
+    """
+    Computes every statistic of the results page from one snapshot.
+
+    Sections whose columns are missing from ``df`` are left to ``None``.
+    """
+    has_groups = category_col in df.columns
+    groups = group_keys(df[category_col]) if has_groups else pd.Series(np.nan, index=df.index, dtype=object)
+
+    return ResultsSummary(
+        n_rows=len(df),
+        screen_habit=_count_table(df[screen_col]) if screen_col in df.columns else None,
+        concern=_scale_summary(df[concern_col], groups) if concern_col in df.columns else None,
+        wordcloud=(_text_summary(df[text_col], tokens_of(df, text_col), groups, top_n)
+                   if text_col in df.columns and has_groups else None),
+        prevention=(_multi_select_summary(df[multi_select_col], groups)
+                    if multi_select_col in df.columns and has_groups else None),
+    )
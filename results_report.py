@@ -0,0 +1,297 @@
+"""
+Report materializer for the results page (step 20).
+
+A participant's view of the results only depends on the data snapshot and on their own
+row. When a new snapshot is loaded, ``ReportMaterializer`` builds in a background thread
+the personal report of every pseudo (their answers, the interpretation of their concern
+level and their percentiles) and renders in the render pool the charts shared by
+everyone and the highlighted charts. Looking up a pseudo then only serves the cached artifacts; an
+artifact the thread has not reached yet is rendered on demand.
+
+Highlighted charts only depend on the highlighted answer, so they are rendered once per
+distinct answer and shared between the participants who gave it. With a ``SharedCache``,
+charts are kept under the snapshot key (a content key, see snapshots) and rendered once
+for all the replicas of the app. A chart whose render failed is rendered again the next
+time it is asked for.
+"""
+import logging
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass
+
+import pandas as pd
+
+from results_charts import (
+    create_age_category_comparison_chart,
+    create_likert_chart,
+    create_numeric_scale_chart,
+    create_wordclouds_chart,
+    plot_donut_charts,
+)
+from render_pool import render_pool
+from results_engine import ADOLESCENTS, ADULTES
+
+SCREEN_HABIT_TITLE = "Habitudes d'écrans avant le sommeil - Échelle de Likert"
+CONCERN_TITLE = "Distribution des niveaux de préoccupation concernant l'IA"
+COMPARISON_TITLE = "Comparaison des préoccupations IA : Ados vs Adultes"
+
+# Charts without any participant highlighted (the word-cloud preview first, its full
+# version once the other charts are queued)
+SHARED_CHARTS = (('likert', None), ('scale', None), ('comparison',), ('wordclouds', 'preview'), ('donuts',),
+                 ('wordclouds', 'full'))
+
+_MISSING = object()
+
+logger = logging.getLogger(__name__)
+
+
+def interpret_concern(value):
+    """Interpretation of a 1-10 concern level."""
+    if value <= 3:
+        return "Tu es peu préoccupé par l'IA 😌"
+    elif value <= 6:
+        return "Tu as un niveau modéré de préoccupation concernant l'IA 🤔"
+    return "Tu es assez préoccupé par l'IA 😰"
+
+
+def _answer(value):
+    return value if pd.notna(value) else None
+
+
+@dataclass(frozen=True)
+class ParticipantReport:
+    """Personal part of the results page for one pseudo."""
+    pseudo: str
+    group: object = None
+    screen_habit: object = None
+    concern: object = None  # raw answer, None if missing
+    concern_interpretation: str = None  # None if the answer is not in 1..10
+    concern_percentile: float = None
+    concern_group_percentile: float = None
+    wordcloud_answer: object = None
+    prevention_answer: object = None
+
+    @property
+    def likert_chart(self):
+        return ('likert', self.screen_habit)
+
+    @property
+    def scale_chart(self):
+        highlighted = int(self.concern) if self.concern_interpretation is not None else None
+        return ('scale', highlighted)
+
+
+class _SnapshotReports:
+    """Artifacts of one snapshot; ``cancelled`` stops its background rendering."""
+
+    def __init__(self, snapshot_key, df, summary, percentiles, pseudo_col, group_col, cache=None):
+        self.snapshot_key = snapshot_key
+        self.cache = cache
+        self.df = df
+        self.summary = summary
+        self.percentiles = percentiles
+        self.pseudo_col = pseudo_col
+        self.group_col = group_col
+        self.lock = threading.Lock()
+        self.charts = {}
+        self.pending = {}  # chart key -> future of its PNG bytes
+        self.reports = {}
+        self.cancelled = False
+        self.done = False
+
+    # region Charts
+    def _chart_job(self, key):
+        """(builder, args) rendering a chart, or None when there is nothing to draw."""
+        summary = self.summary
+        kind = key[0]
+        if kind == 'likert' and summary.screen_habit is not None:
+            return create_likert_chart, (summary.screen_habit, summary.n_rows, SCREEN_HABIT_TITLE, key[1])
+        if kind == 'scale' and summary.concern is not None and summary.concern.valid_count > 0:
+            return create_numeric_scale_chart, (summary.concern.distribution, summary.n_rows, CONCERN_TITLE, key[1])
+        if kind == 'comparison' and summary.concern is not None:
+            return create_age_category_comparison_chart, (summary.concern.group_stats, COMPARISON_TITLE)
+        if kind == 'wordclouds' and summary.wordcloud is not None and summary.wordcloud.total > 0:
+            return create_wordclouds_chart, (summary.wordcloud, key[1])
+        if kind == 'donuts' and summary.prevention is not None:
+            return plot_donut_charts, (summary.prevention_for(ADOLESCENTS), summary.prevention_for(ADULTES))
+        return None
+
+    def submit_chart(self, key):
+        """
+        Starts rendering a chart in the render pool, unless it is already done or pending.
+        Returns the ``Future`` of the render, or None when the chart is already there.
+        """
+        with self.lock:
+            if key in self.charts:
+                return None
+            future = self.pending.get(key)
+            if future is not None:
+                return future
+            job = self._chart_job(key)
+            if job is None:
+                self.charts[key] = None
+                return None
+            builder, args = job
+            future = self.pending[key] = render_pool.submit_shared(
+                self.cache, ('report_chart', self.snapshot_key) + key, builder, *args)
+        # Hors du verrou : le rappel s'exécute tout de suite si le rendu est déjà terminé
+        future.add_done_callback(lambda done: done.exception() is not None and self._drop_pending(key, done))
+        return future
+
+    def _drop_pending(self, key, future):
+        """Forgets a failed render, so that the next call renders the chart again."""
+        with self.lock:
+            if self.pending.get(key) is future:
+                del self.pending[key]
+
+    def chart_future(self, key):
+        """``Future`` of the PNG bytes of a chart, which is done when the chart is already rendered."""
+        future = self.submit_chart(key)
+        if future is None:
+            future = Future()
+            with self.lock:
+                future.set_result(self.charts[key])
+        return future
+
+    def chart(self, key):
+        """PNG bytes of a chart, or None when there is nothing to draw."""
+        future = self.submit_chart(key)
+        if future is None:
+            with self.lock:
+                return self.charts[key]
+        try:
+            png = future.result()
+        except Exception:
+            self._drop_pending(key, future)
+            raise
+        with self.lock:
+            self.pending.pop(key, None)
+            return self.charts.setdefault(key, png)
+    # endregion
+
+    # region Reports
+    def _build_report(self, pseudo, row):
+        concern_col = 'AI_Concern_Scale'
+        group = _answer(row.get(self.group_col))
+        concern = _answer(row.get(concern_col))
+
+        interpretation = percentile = group_percentile = None
+        if concern is not None and 1 <= concern <= 10:
+            interpretation = interpret_concern(concern)
+            concern_index = self.percentiles.get(concern_col)
+            if concern_index is not None:
+                percentile = concern_index.percentile(concern)
+                if group is not None and concern_index.count(group) > 0:
+                    group_percentile = concern_index.percentile(concern, group)
+
+        return ParticipantReport(
+            pseudo=pseudo,
+            group=group,
+            screen_habit=_answer(row.get('Screen_Habit')),
+            concern=concern,
+            concern_interpretation=interpretation,
+            concern_percentile=percentile,
+            concern_group_percentile=group_percentile,
+            wordcloud_answer=_answer(row.get('AI_Wordcloud_Input')),
+            prevention_answer=_answer(row.get('AI_Prevention_Campaign')),
+        )
+
+    def report(self, pseudo):
+        """Report of a pseudo (first row with this pseudo), or None if it is unknown."""
+        report = self.reports.get(pseudo)
+        if report is None:
+            rows = self.df[self.df[self.pseudo_col] == pseudo]
+            if len(rows) == 0:
+                return None
+            report = self.reports.setdefault(pseudo, self._build_report(pseudo, rows.iloc[0]))
+        return report
+    # endregion
+
+    def materialize_all(self):
+        """
+        Builds the report of every pseudo, sends the shared charts and the highlighted
+        charts to the render pool at once, then collects them. Runs in a background
+        thread: failures are logged, and a failed chart is left to the page.
+        """
+        try:
+            self._materialize_all()
+        except Exception:
+            logger.exception("Materializing the reports of snapshot %s failed", self.snapshot_key)
+
+    def _materialize_all(self):
+        keys = list(SHARED_CHARTS)
+        if self.pseudo_col in self.df.columns:
+            for pseudo in self.df[self.pseudo_col].dropna().unique():
+                if self.cancelled:
+                    return
+                report = self.report(pseudo)
+                keys += [report.likert_chart, report.scale_chart]
+
+        keys = list(dict.fromkeys(keys))
+        for key in keys:
+            self.submit_chart(key)
+        for key in keys:
+            if self.cancelled:
+                return
+            try:
+                self.chart(key)
+            except Exception:
+                logger.exception("Rendering chart %s of snapshot %s failed", key, self.snapshot_key)
+        self.done = True
+
+
+class ReportMaterializer:
+    """
+    Rendered results of the latest snapshot, shared by all the sessions.
+
+    ``refresh`` is called with every snapshot the page loads: when the snapshot key
+    changed, the previous artifacts are dropped and a background thread starts
+    materializing the new ones. Charts are also kept in ``cache`` (``SharedCache``) if given.
+    """
+
+    def __init__(self, pseudo_col='Secret_Code', group_col='Category', cache=None):
+        self.pseudo_col = pseudo_col
+        self.group_col = group_col
+        self.cache = cache
+        self._lock = threading.Lock()
+        self._snapshot_key = None
+        self._current = None
+
+    def refresh(self, snapshot_key, df, summary, percentiles):
+        """Switches to a new snapshot and materializes its reports in the background."""
+        with self._lock:
+            if snapshot_key == self._snapshot_key:
+                return
+            if self._current is not None:
+                self._current.cancelled = True
+            self._snapshot_key = snapshot_key
+            self._current = _SnapshotReports(snapshot_key, df, summary, percentiles, self.pseudo_col, self.group_col,
+                                             self.cache)
+            current = self._current
+
+        threading.Thread(target=current.materialize_all, name="report-materializer", daemon=True).start()
+
+    def _snapshot(self):
+        if self._current is None:
+            raise RuntimeError("refresh() must be called before reading reports")
+        return self._current
+
+    def chart(self, key):
+        """PNG bytes of a chart of the current snapshot, or None when there is nothing to draw."""
+        return self._snapshot().chart(key)
+
+    def chart_future(self, key):
+        """``Future`` of the PNG bytes of a chart of the current snapshot."""
+        return self._snapshot().chart_future(key)
+
+    def report(self, pseudo):
+        """``ParticipantReport`` of a pseudo in the current snapshot, or None if it is unknown."""
+        return self._snapshot().report(pseudo)
+
+    @property
+    def stats(self):
+        """Number of materialized charts and reports for the current snapshot."""
+        current = self._current
+        if current is None:
+            return {'charts': 0, 'reports': 0, 'done': False}
+        return {'charts': len(current.charts), 'reports': len(current.reports), 'done': current.done}
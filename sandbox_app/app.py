@@ -3,9 +3,15 @@ import pandas as pd
 import ssl
 import certifi
 import urllib3
-import altair as alt
 import requests
 import io
+import os
+import sys
+
+# Shared helpers live at the repository root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from percentiles import build_percentile_service
+import chart_specs
 
 # This line bypasses SSL verification.
 ssl._create_default_https_context = ssl._create_unverified_context
@@ -60,17 +66,16 @@ def get_group_color(group_name):
     group_lower = str(group_name).lower().strip()
     return GROUP_COLORS.get(group_lower, DEFAULT_COLOR)
 
-def get_color_scale(df, classifier_col):
-    """Create a color scale mapping for the groups in the dataframe."""
-    unique_groups = df[classifier_col].dropna().unique()
+def get_color_scale(groups):
+    """Create a (domain, range) color scale for the given groups."""
     domain = []
     range_colors = []
-    
-    for group in unique_groups:
+
+    for group in pd.unique(pd.Series(groups).dropna()):
         domain.append(group)
         range_colors.append(get_group_color(group))
-    
-    return alt.Scale(domain=domain, range=range_colors)
+
+    return domain, range_colors
 
 
 def _normalize_text(s: str) -> str:
@@ -256,138 +261,105 @@ def load_data(url):
 #test_q = actual_col
 #st.write("Debug - Sample data:", all_data[[test_q, CLASSIFIER_COL]].head(10))
 
-def plot_numerical_comparison(df, question_col, classifier_col, user_value, show_other_groups=True, color_by_group=True):
+@st.cache_data(ttl=300)
+def build_scale_aggregates(df, question_cols, classifier_col):
+    """
+    Pre-aggregates the scale questions once per data snapshot.
+
+    Returns ``(counts, percentiles)``:
+    - ``counts[question]``: tidy (integer bin × group) count table with columns
+      ``rounded_value``, ``classifier_col`` and ``count``.
+    - ``percentiles[question]``: ``PercentileIndex`` answering percentile/rank
+      queries overall and per group.
+    """
+    counts = {}
+    for question in question_cols:
+        if question not in df.columns:
+            continue
+        answers = df[[question, classifier_col]].dropna(subset=[question])
+
+        rounded = answers[question].round().astype(int)
+        counts[question] = (
+            answers.assign(rounded_value=rounded)
+            .groupby(['rounded_value', classifier_col]).size()
+            .reset_index(name='count')
+        )
+
+    return counts, build_percentile_service(df, question_cols, classifier_col)
+
+
+@st.cache_data(ttl=300)
+def build_choice_aggregates(df, question_cols, classifier_col):
+    """
+    Pre-aggregates the multiple-choice questions once per data snapshot.
+
+    Returns ``counts[question]``: tidy (group × answer) count table with columns
+    ``classifier_col``, ``response``, ``norm_response`` and ``count``, sorted by group and
+    by decreasing count. Answers are normalized once per distinct value and all the groups
+    are counted in a single ``groupby`` pass.
+
+    Only used by the multiple-choice section, which is commented out for now.
+    """
+    counts = {}
+    for question in question_cols:
+        if question not in df.columns:
+            continue
+        answers = df[[classifier_col, question]].dropna()
+
+        responses = answers[question].astype(str).str.strip()
+        distinct = responses.unique()
+        normalized = responses.map(dict(zip(distinct, (_normalize_text(value) for value in distinct))))
+        counts[question] = (
+            answers.assign(response=responses, norm_response=normalized)
+            .groupby([classifier_col, 'response', 'norm_response']).size()
+            .reset_index(name='count')
+            .sort_values([classifier_col, 'count'], ascending=[True, False], kind='stable')
+        )
+
+    return counts
+
+
+def plot_numerical_comparison(aggregates, question_col, classifier_col, user_value, show_other_groups=True, color_by_group=True):
     """
     Creates an enhanced histogram with modern design and mobile-friendly layout.
     Uses integer bins and highlights the user's response with grouped/dodged bars by classifier.
+    Reads the pre-aggregated tables from ``build_scale_aggregates`` instead of the full frame
+    and returns a Vega-Lite spec built from a precompiled template.
     """
-    # Prepare safe column names for Altair
-    df_plot = df.copy()
-    col_map = {col: (col.replace(':', '\\:') if isinstance(col, str) and ':' in col else col)
-               for col in df_plot.columns}
-    if any(col_map[c] != c for c in col_map):
-        df_plot = df_plot.rename(columns=col_map)
-
-    q_field = col_map.get(question_col, question_col)
-    cls_field = col_map.get(classifier_col, classifier_col)
+    counts, percentiles = aggregates
 
     # Get user's group
     user_group = user_data[classifier_col] if 'user_data' in globals() else None
 
     # Filter data based on show_other_groups option
+    histogram_data = counts[question_col]
     if not show_other_groups and user_group:
-        df_plot = df_plot[df_plot[cls_field] == user_group]
+        histogram_data = histogram_data[histogram_data[classifier_col] == user_group]
+        percentile_group = user_group
+    else:
+        percentile_group = None
 
     # Calculate statistics for context
-    user_percentile = (df_plot[q_field] <= user_value).mean() * 100
-
-    # Round values to integers for binning
-    df_plot['rounded_value'] = df_plot[q_field].round().astype(int)
-    
-    # Get color scale - IMPORTANT: this must be used in encode()
-    color_scale = get_color_scale(df_plot, cls_field)
+    user_percentile = percentiles[question_col].percentile(user_value, percentile_group)
+
+    # Inline chart data, with the user's response marked
+    user_bin = int(round(user_value))
+    groups = histogram_data[classifier_col].tolist()
+    records = [
+        {'value': value, 'group': group, 'count': count, 'is_user': value == user_bin}
+        for value, group, count in zip(histogram_data['rounded_value'].tolist(), groups,
+                                       histogram_data['count'].tolist())
+    ]
 
-    # Create aggregated data for histogram
-    histogram_data = df_plot.groupby(['rounded_value', cls_field]).size().reset_index(name='count')
-    
-    # Mark user's response
-    histogram_data['is_user_value'] = histogram_data['rounded_value'] == int(round(user_value))
-
-    # Dodged histogram bars with proper group coloring
-    bars = alt.Chart(histogram_data).mark_bar(
-        cornerRadiusTopLeft=6,
-        cornerRadiusTopRight=6,
-        filled=True
-    ).encode(
-        x=alt.X('rounded_value:O', 
-                title=question_col,
-                axis=alt.Axis(
-                    labelAngle=0,
-                    titleFontSize=14,
-                    labelFontSize=12,
-                    grid=False
-                )),
-        y=alt.Y('count:Q', 
-                stack=None,
-                title="Nombre de réponses",
-                axis=alt.Axis(
-                    titleFontSize=14,
-                    labelFontSize=12,
-                    grid=True,
-                    gridOpacity=0.3
-                )),
-        # ALWAYS use group colors for fill - this ensures bars are colored by group
-        color=alt.Color(f"{cls_field}:N", 
-                       title="Type de répondant",
-                       scale=color_scale,
-                       legend=alt.Legend(
-                           orient='bottom',
-                           titleFontSize=12,
-                           labelFontSize=11
-                       ) if color_by_group else None),
-        xOffset=f"{cls_field}:N",
-        opacity=alt.condition(
-            alt.datum.is_user_value,
-            alt.value(1.0),
-            alt.value(0.85)
-        ),
-        tooltip=[
-            alt.Tooltip('rounded_value:O', title=question_col),
-            alt.Tooltip(cls_field, type='nominal', title=classifier_col),
-            alt.Tooltip('count:Q', title='Nombre')
-        ]
+    chart = chart_specs.histogram_spec(
+        records,
+        question_title=question_col,
+        classifier_title=classifier_col,
+        color_scale=get_color_scale(groups),
+        show_legend=color_by_group,
+        title="Distribution des réponses" + (" (ton groupe)" if not show_other_groups else " (tous les groupes)"),
     )
 
-    # Highlight border for user's value - use thicker, more visible stroke
-    # user_highlight = alt.Chart(histogram_data[histogram_data['is_user_value']]).mark_bar(
-    #     cornerRadiusTopLeft=6,
-    #     cornerRadiusTopRight=6,
-    #     stroke='#FF0000',
-    #     strokeWidth=4,
-    #     fillOpacity=0
-    # ).encode(
-    #     x=alt.X('rounded_value:O'),
-    #     y=alt.Y('count:Q', stack=None),
-    #     xOffset=f"{cls_field}:N"
-    # )
-    
-    # Add arrow pointing to user's value
-    max_count = histogram_data[histogram_data['is_user_value']]['count'].max() if not histogram_data[histogram_data['is_user_value']].empty else 0
-    arrow_data = pd.DataFrame({
-        'x': [int(round(user_value))],
-        'y': [max_count * 1.15 if max_count > 0 else 1],
-        'label': ['Ta réponse ↓']
-    })
-    
-    arrow = alt.Chart(arrow_data).mark_text(
-        align='center',
-        baseline='bottom',
-        fontSize=14,
-        fontWeight='bold',
-        color='#FF0000'
-    ).encode(
-        x='x:O',
-        y='y:Q',
-        text='label:N'
-    )
-    
-    # Combine all elements
-    #chart = (bars + user_highlight + arrow).properties(
-    chart = (bars).properties(
-        width='container',
-        height=350,
-        title={
-            "text": f"Distribution des réponses" + (" (ton groupe)" if not show_other_groups else " (tous les groupes)"),
-            "fontSize": 16,
-            "anchor": "start",
-            "fontWeight": "normal"
-        }
-    ).configure_view(
-        strokeWidth=0
-    ).configure_axis(
-        domainWidth=1
-    )
-    
     return chart, user_percentile
 
 
@@ -411,51 +383,39 @@ def is_yes_no_question(df, question_col):
     return len(values_normalized) == 2
 
 
-def plot_pie_comparison(df, question_col, classifier_col, user_value, show_other_groups=True):
+def plot_pie_comparison(aggregates, question_col, classifier_col, user_value, show_other_groups=True):
     """
     Creates pie charts for yes/no questions, one per group with modern styling.
+    Reads the (group × answer) counts from ``build_choice_aggregates`` instead of the full
+    frame and returns a Vega-Lite spec built from precompiled templates. Only used by the
+    multiple-choice section, which is commented out for now.
     """
     user_group = user_data[classifier_col] if 'user_data' in globals() else None
+    user_norm = _normalize_text(user_value)
 
-    df_plot = df.copy()
+    answer_counts = aggregates[question_col]
     if not show_other_groups and user_group:
-        df_plot = df_plot[df_plot[classifier_col] == user_group]
+        answer_counts = answer_counts[answer_counts[classifier_col] == user_group]
 
-    groups = sorted(df_plot[classifier_col].dropna().unique())
     charts = []
 
-    for i, group in enumerate(groups):
-        group_data = df_plot[df_plot[classifier_col] == group]
-        if group_data.empty:
-            continue
-
-        resp_series = group_data[question_col].astype(str).str.strip()
-        value_counts = resp_series.value_counts()
+    for i, (group, group_counts) in enumerate(answer_counts.groupby(classifier_col, sort=True)):
+        total = int(group_counts['count'].sum())
+        pie_data = [
+            {'response': response, 'norm_response': norm_response, 'count': int(count),
+             'percentage': int(count) / total * 100, 'is_user': norm_response == user_norm and group == user_group}
+            for response, norm_response, count in zip(group_counts['response'].tolist(),
+                                                      group_counts['norm_response'].tolist(),
+                                                      group_counts['count'].tolist())
+        ]
 
-        pie_data = []
-        for value, count in value_counts.items():
-            norm_val = _normalize_text(value)
-            is_user_resp = False
-            try:
-                is_user_resp = _normalize_text(str(user_value)) == norm_val and group == user_group
-            except Exception:
-                is_user_resp = False
-
-            pie_data.append({
-                'response': str(value),
-                'norm_response': norm_val,
-                'count': int(count),
-                'percentage': (int(count) / len(group_data) * 100) if len(group_data) > 0 else 0,
-                'is_user_response': is_user_resp
-            })
-
-        pie_df = pd.DataFrame(pie_data)
-        if pie_df.empty:
+        if not pie_data:
             continue
 
         # Color mapping for yes/no responses
         response_colors = {}
-        for norm_r, r in zip(pie_df['norm_response'], pie_df['response']):
+        for row in pie_data:
+            norm_r, r = row.pop('norm_response'), row['response']
             if norm_r in ['oui', 'yes', 'vrai', 'true']:
                 response_colors[r] = '#2ECC71'  # Green
             elif norm_r in ['non', 'no', 'faux', 'false']:
@@ -463,193 +423,63 @@ def plot_pie_comparison(df, question_col, classifier_col, user_value, show_other
             else:
                 response_colors[r] = '#95A5A6'  # Gray
 
-        try:
-            base = alt.Chart(pie_df).mark_arc(
-                innerRadius=50,
-                outerRadius=90,
-                stroke='white',
-                strokeWidth=2,
-                filled=True
-            ).encode(
-                theta=alt.Theta('count:Q', stack=True),
-                color=alt.Color('response:N',
-                               scale=alt.Scale(
-                                   domain=list(response_colors.keys()),
-                                   range=list(response_colors.values())
-                               ),
-                               legend=None if i > 0 else alt.Legend(
-                                   orient='bottom',
-                                   title='Réponse',
-                                   titleFontSize=12,
-                                   labelFontSize=11
-                               )),
-                opacity=alt.condition(
-                    alt.datum.is_user_response,
-                    alt.value(1.0),
-                    alt.value(0.8)
-                ),
-                tooltip=[
-                    alt.Tooltip('response:N', title='Réponse'),
-                    alt.Tooltip('count:Q', title='Nombre'),
-                    alt.Tooltip('percentage:Q', title='Pourcentage (%)', format='.1f')
-                ]
-            ).properties(
-                width=200,
-                height=200,
-                title={
-                    "text": f"{get_group_icon(group)} {group}",
-                    "color": get_group_color(group),
-                    "fontSize": 14,
-                    "fontWeight": "bold"
-                }
-            )
-        except Exception:
-            continue
-
-        # Percentage labels
-        labels = alt.Chart(pie_df).mark_text(
-            radius=110,
-            fontSize=13,
-            fontWeight='bold'
-        ).encode(
-            theta=alt.Theta('count:Q', stack=True),
-            text=alt.Text('percentage:Q', format='.0f'),
-            color=alt.value('#333')
-        )
-
-        charts.append(base + labels)
+        charts.append(chart_specs.pie_spec(
+            pie_data,
+            response_colors,
+            group_title=f"{get_group_icon(group)} {group}",
+            group_color=get_group_color(group),
+            show_legend=(i == 0),
+        ))
 
     if len(charts) == 0:
-        empty_df = pd.DataFrame({'text': ['Aucune donnée disponible']})
-        return alt.Chart(empty_df).mark_text(fontSize=14).encode(text='text:N').properties()
+        return chart_specs.message_spec('Aucune donnée disponible')
 
     # Arrange charts
-    if len(charts) == 1:
-        final_chart = charts[0]
-    elif len(charts) <= 3:
-        final_chart = alt.hconcat(*charts, spacing=20)
-    else:
-        rows = [alt.hconcat(*charts[i:i+3], spacing=20) for i in range(0, len(charts), 3)]
-        final_chart = alt.vconcat(*rows, spacing=20)
-
-    return final_chart.properties(
-        title={
-            "text": f"Répartition des réponses" + (" (ton groupe)" if not show_other_groups else " (tous les groupes)"),
-            "fontSize": 16,
-            "anchor": "start",
-            "fontWeight": "normal"
-        }
-    ).configure_view(
-        strokeWidth=0
+    return chart_specs.concat_specs(
+        charts,
+        title="Répartition des réponses" + (" (ton groupe)" if not show_other_groups else " (tous les groupes)"),
     )
 
 
 def plot_categorical_comparison(df, question_col, classifier_col, user_value, show_other_groups=True, color_by_group=True):
     """
     Creates an enhanced grouped bar chart for categorical questions with dodged bars.
+    Returns a Vega-Lite spec built from a precompiled template.
     """
-    df_plot = df.copy()
-    col_map = {col: (col.replace(':', '\\:') if isinstance(col, str) and ':' in col else col)
-               for col in df_plot.columns}
-    if any(col_map[c] != c for c in col_map):
-        df_plot = df_plot.rename(columns=col_map)
-
-    q_field = col_map.get(question_col, question_col)
-    cls_field = col_map.get(classifier_col, classifier_col)
-
     user_group = user_data[classifier_col] if 'user_data' in globals() else None
 
+    df_plot = df
     if not show_other_groups and user_group:
-        df_plot = df_plot[df_plot[cls_field] == user_group]
+        df_plot = df_plot[df_plot[classifier_col] == user_group]
 
     # Calculate counts and percentages
-    grouped = df_plot.groupby([q_field, cls_field]).size().reset_index(name='count')
-    total = grouped.groupby(q_field)['count'].transform('sum')
+    grouped = df_plot.groupby([question_col, classifier_col]).size().reset_index(name='count')
+    total = grouped.groupby(question_col)['count'].transform('sum')
     grouped['percentage'] = (grouped['count'] / total * 100).round(1)
-    grouped['is_user_response'] = grouped[q_field] == user_value
-    
-    color_scale = get_color_scale(df_plot, cls_field)
+
+    responses = grouped[question_col].tolist()
+    groups = grouped[classifier_col].tolist()
+    records = [
+        {'response': response, 'group': group, 'count': count, 'percentage': percentage,
+         'is_user': bool(response == user_value)}
+        for response, group, count, percentage in zip(responses, groups, grouped['count'].tolist(),
+                                                      grouped['percentage'].tolist())
+    ]
 
     # Color encoding choice
     if color_by_group:
-        color_encoding = alt.Color(f"{cls_field}:N",
-                                   title="Type de répondant",
-                                   scale=color_scale,
-                                   legend=alt.Legend(
-                                       orient='bottom',
-                                       titleFontSize=12,
-                                       labelFontSize=11
-                                   ))
+        color = get_color_scale(groups)
     else:
-        fill_color = get_group_color(user_group) if user_group is not None else DEFAULT_COLOR
-        color_encoding = alt.value(fill_color)
-
-    # Dodged bars
-    bars = alt.Chart(grouped).mark_bar(
-        cornerRadiusTopLeft=6,
-        cornerRadiusTopRight=6,
-        filled=True
-    ).encode(
-        x=alt.X(f"{q_field}:N", 
-                title=None,
-                axis=alt.Axis(
-                    labelAngle=-45 if len(grouped[q_field].unique()) > 3 else 0,
-                    labelFontSize=12,
-                    labelLimit=150
-                )),
-        y=alt.Y('count:Q', 
-                title="Nombre de réponses",
-                stack=None,
-                axis=alt.Axis(
-                    titleFontSize=14,
-                    labelFontSize=12,
-                    grid=True,
-                    gridOpacity=0.3
-                )),
-        color=color_encoding,
-        xOffset=f"{cls_field}:N",
-        opacity=alt.condition(
-            alt.datum.is_user_response,
-            alt.value(1.0),
-            alt.value(0.85)
-        ),
-        tooltip=[
-            alt.Tooltip(q_field, type='nominal', title=question_col),
-            alt.Tooltip(cls_field, type='nominal', title=classifier_col),
-            alt.Tooltip('count:Q', title='Nombre'),
-            alt.Tooltip('percentage:Q', title='Pourcentage (%)', format='.1f')
-        ]
+        color = get_group_color(user_group) if user_group is not None else DEFAULT_COLOR
+
+    return chart_specs.grouped_bar_spec(
+        records,
+        question_title=question_col,
+        classifier_title=classifier_col,
+        color=color,
+        rotate_labels=len(set(responses)) > 3,
+        title="Répartition des réponses" + (" (ton groupe)" if not show_other_groups else " (tous les groupes)"),
     )
-    
-    # Highlight user's response
-    user_bars = alt.Chart(grouped[grouped['is_user_response']]).mark_bar(
-        cornerRadiusTopLeft=6,
-        cornerRadiusTopRight=6,
-        stroke='#E53E3E',
-        strokeWidth=3,
-        fillOpacity=0
-    ).encode(
-        x=alt.X(f"{q_field}:N"),
-        y=alt.Y('count:Q', stack=None),
-        xOffset=f"{cls_field}:N"
-    )
-    
-    final_chart = (bars + user_bars).properties(
-        width='container',
-        height=350,
-        title={
-            "text": f"Répartition des réponses" + (" (ton groupe)" if not show_other_groups else " (tous les groupes)"),
-            "fontSize": 16,
-            "anchor": "start",
-            "fontWeight": "normal"
-        }
-    ).configure_view(
-        strokeWidth=0
-    ).configure_axis(
-        domainWidth=1
-    )
-    
-    return final_chart
 
 
 ### --- MAIN APPLICATION --- ###
@@ -730,14 +560,20 @@ with col2:
 # Scale questions section
 if SCALE_QUESTIONS:
     st.markdown("### 📈 Questions sur une échelle (1-10)")
-    
-    for i, q_col in enumerate(SCALE_QUESTIONS):
-        # Find the best matching column for the question
+
+    # Find the best matching column for each question
+    scale_columns = []
+    for q_col in SCALE_QUESTIONS:
         actual_col = find_best_column(all_data.columns, q_col)
         if actual_col is None:
             # fallback to exact match if present
             actual_col = q_col if q_col in all_data.columns else q_col
-            
+        scale_columns.append(actual_col)
+
+    # Histogram counts and percentile indexes, computed once per snapshot
+    scale_aggregates = build_scale_aggregates(all_data, scale_columns, CLASSIFIER_COL)
+
+    for i, (q_col, actual_col) in enumerate(zip(SCALE_QUESTIONS, scale_columns)):
         with st.expander(f"📌 {q_col}", expanded=(i==0)):
             try:
                 user_answer = user_data[actual_col]
@@ -745,14 +581,14 @@ if SCALE_QUESTIONS:
                     st.warning("Tu n'as pas répondu à cette question.")
                 else:
                     chart, percentile = plot_numerical_comparison(
-                        df=all_data,
+                        aggregates=scale_aggregates,
                         question_col=actual_col,
                         classifier_col=CLASSIFIER_COL,
                         user_value=user_answer,
                         show_other_groups=show_all_groups,
                         color_by_group=show_color_by_group
                     )
-                    st.altair_chart(chart, use_container_width=True)
+                    st.vega_lite_chart(chart, use_container_width=True)
                     
                     # Add insight with group colors
                     col1, col2 = st.columns(2)
@@ -772,12 +608,14 @@ if SCALE_QUESTIONS:
                 st.error(f"Erreur: {e}")
 
 # Categorical questions section
+# Section désactivée : build_choice_aggregates et plot_pie_comparison ne servent qu'ici
 # if CATEGORY_QUESTIONS:
 #     st.markdown('<div class="custom-divider"></div>', unsafe_allow_html=True)
 #     st.markdown("### 📋 Questions à choix")
 #
-#     for i, q_col in enumerate(CATEGORY_QUESTIONS):
-#         # Find the best matching column for the question
+#     # Find the best matching column for each question
+#     category_columns = []
+#     for q_col in CATEGORY_QUESTIONS:
 #         actual_col = find_best_column(all_data.columns, q_col)
 #
 #         # Special handling for the scenario question which may have different spacing/format
@@ -786,7 +624,12 @@ if SCALE_QUESTIONS:
 #
 #         if actual_col is None:
 #             actual_col = q_col if q_col in all_data.columns else q_col
+#         category_columns.append(actual_col)
 #
+#     # Answer counts of every choice question, computed once per snapshot
+#     choice_aggregates = build_choice_aggregates(all_data, category_columns, CLASSIFIER_COL)
+#
+#     for i, (q_col, actual_col) in enumerate(zip(CATEGORY_QUESTIONS, category_columns)):
 #         with st.expander(f"📌 {q_col}", expanded=(i==0)):
 #             try:
 #                 user_answer = user_data[actual_col]
@@ -797,13 +640,13 @@ if SCALE_QUESTIONS:
 #                     if is_yes_no_question(all_data, actual_col):
 #                         # Use pie charts for yes/no questions
 #                         chart = plot_pie_comparison(
-#                             df=all_data,
+#                             aggregates=choice_aggregates,
 #                             question_col=actual_col,
 #                             classifier_col=CLASSIFIER_COL,
 #                             user_value=user_answer,
 #                             show_other_groups=show_all_groups
 #                         )
-#                         st.altair_chart(chart, use_container_width=True)
+#                         st.vega_lite_chart(chart, use_container_width=True)
 #                     else:
 #                         # Use bar charts for other categorical questions and also show a pie summary
 #                         chart = plot_categorical_comparison(
@@ -816,25 +659,25 @@ if SCALE_QUESTIONS:
 #                         )
 #
 #                         # Create a small pie chart summary of the overall distribution for this question
-#                         counts = all_data[actual_col].dropna().astype(str).value_counts().reset_index()
-#                         counts.columns = ['response', 'count']
-#                         try:
-#                             pie = alt.Chart(counts).mark_arc(innerRadius=40, stroke='white').encode(
-#                                 theta=alt.Theta('count:Q'),
-#                                 color=alt.Color('response:N', legend=alt.Legend(orient='bottom')),
-#                                 tooltip=[alt.Tooltip('response:N', title='Réponse'), alt.Tooltip('count:Q', title='Nombre')]
-#                             ).properties(width=250, height=250)
-#                         except Exception:
-#                             pie = None
+#                         counts = choice_aggregates[actual_col].groupby('response', sort=False)['count'].sum()
+#                         pie = {
+#                             'data': {'values': [{'response': response, 'count': int(count)} for response, count in counts.items()]},
+#                             'mark': {'type': 'arc', 'innerRadius': 40, 'stroke': 'white'},
+#                             'encoding': {
+#                                 'theta': {'field': 'count', 'type': 'quantitative'},
+#                                 'color': {'field': 'response', 'type': 'nominal', 'legend': {'orient': 'bottom'}},
+#                                 'tooltip': [{'field': 'response', 'type': 'nominal', 'title': 'Réponse'},
+#                                             {'field': 'count', 'type': 'quantitative', 'title': 'Nombre'}],
+#                             },
+#                             'width': 250,
+#                             'height': 250,
+#                         }
 #
-#                         if pie is not None:
-#                             left, right = st.columns([3,1])
-#                             with left:
-#                                 st.altair_chart(chart, use_container_width=True)
-#                             with right:
-#                                 st.altair_chart(pie, use_container_width=True)
-#                         else:
-#                             st.altair_chart(chart, use_container_width=True)
+#                         left, right = st.columns([3,1])
+#                         with left:
+#                             st.vega_lite_chart(chart, use_container_width=True)
+#                         with right:
+#                             st.vega_lite_chart(pie, use_container_width=True)
 #
 #                     # Show user's answer prominently
 #                     group_icon = get_group_icon(user_classifier)
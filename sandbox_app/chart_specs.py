@@ -0,0 +1,215 @@
+"""
+Precompiled Vega-Lite templates for the results charts of the sandbox app.
+
+Each chart structure (marks, encodings, axes, config) is serialized once at import
+time. Building a chart only parses its template and fills in the inline data values,
+titles and highlight parameters, so no Altair object graph is built or validated per
+render. The resulting dicts are displayed with ``st.vega_lite_chart``.
+"""
+import json
+
+_TITLE = {"text": "", "fontSize": 16, "anchor": "start", "fontWeight": "normal"}
+
+_LEGEND = {"orient": "bottom", "titleFontSize": 12, "labelFontSize": 11}
+
+_Y_COUNT = {
+    "field": "count",
+    "type": "quantitative",
+    "stack": None,
+    "title": "Nombre de réponses",
+    "axis": {"titleFontSize": 14, "labelFontSize": 12, "grid": True, "gridOpacity": 0.3},
+}
+
+_ROUNDED_BAR = {"type": "bar", "cornerRadiusTopLeft": 6, "cornerRadiusTopRight": 6}
+
+_HISTOGRAM_TEMPLATE = json.dumps({
+    "data": {"values": []},
+    "mark": dict(_ROUNDED_BAR, filled=True),
+    "encoding": {
+        "x": {
+            "field": "value",
+            "type": "ordinal",
+            "title": None,
+            "axis": {"labelAngle": 0, "titleFontSize": 14, "labelFontSize": 12, "grid": False},
+        },
+        "y": _Y_COUNT,
+        "color": {"field": "group", "type": "nominal", "title": "Type de répondant", "scale": {}, "legend": _LEGEND},
+        "xOffset": {"field": "group", "type": "nominal"},
+        "opacity": {"condition": {"test": "datum.is_user", "value": 1.0}, "value": 0.85},
+        "tooltip": [
+            {"field": "value", "type": "ordinal", "title": None},
+            {"field": "group", "type": "nominal", "title": None},
+            {"field": "count", "type": "quantitative", "title": "Nombre"},
+        ],
+    },
+    "width": "container",
+    "height": 350,
+    "title": _TITLE,
+    "config": {"view": {"strokeWidth": 0}, "axis": {"domainWidth": 1}},
+})
+
+_PIE_TEMPLATE = json.dumps({
+    "data": {"values": []},
+    "width": 200,
+    "height": 200,
+    "layer": [
+        {
+            "mark": {"type": "arc", "innerRadius": 50, "outerRadius": 90, "stroke": "white",
+                     "strokeWidth": 2, "filled": True},
+            "encoding": {
+                "theta": {"field": "count", "type": "quantitative", "stack": True},
+                "color": {"field": "response", "type": "nominal", "scale": {},
+                          "legend": dict(_LEGEND, title="Réponse")},
+                "opacity": {"condition": {"test": "datum.is_user", "value": 1.0}, "value": 0.8},
+                "tooltip": [
+                    {"field": "response", "type": "nominal", "title": "Réponse"},
+                    {"field": "count", "type": "quantitative", "title": "Nombre"},
+                    {"field": "percentage", "type": "quantitative", "title": "Pourcentage (%)", "format": ".1f"},
+                ],
+            },
+            "title": {"text": "", "color": "", "fontSize": 14, "fontWeight": "bold"},
+        },
+        {
+            "mark": {"type": "text", "radius": 110, "fontSize": 13, "fontWeight": "bold"},
+            "encoding": {
+                "theta": {"field": "count", "type": "quantitative", "stack": True},
+                "text": {"field": "percentage", "type": "quantitative", "format": ".0f"},
+                "color": {"value": "#333"},
+            },
+        },
+    ],
+})
+
+_GROUPED_BAR_TEMPLATE = json.dumps({
+    "data": {"values": []},
+    "layer": [
+        {
+            "mark": dict(_ROUNDED_BAR, filled=True),
+            "encoding": {
+                "x": {
+                    "field": "response",
+                    "type": "nominal",
+                    "title": None,
+                    "axis": {"labelAngle": 0, "labelFontSize": 12, "labelLimit": 150},
+                },
+                "y": _Y_COUNT,
+                "color": {},
+                "xOffset": {"field": "group", "type": "nominal"},
+                "opacity": {"condition": {"test": "datum.is_user", "value": 1.0}, "value": 0.85},
+                "tooltip": [
+                    {"field": "response", "type": "nominal", "title": None},
+                    {"field": "group", "type": "nominal", "title": None},
+                    {"field": "count", "type": "quantitative", "title": "Nombre"},
+                    {"field": "percentage", "type": "quantitative", "title": "Pourcentage (%)", "format": ".1f"},
+                ],
+            },
+        },
+        {
+            # Red outline around the user's own answer
+            "transform": [{"filter": "datum.is_user"}],
+            "mark": dict(_ROUNDED_BAR, stroke="#E53E3E", strokeWidth=3, fillOpacity=0),
+            "encoding": {
+                "x": {"field": "response", "type": "nominal"},
+                "y": {"field": "count", "type": "quantitative", "stack": None},
+                "xOffset": {"field": "group", "type": "nominal"},
+            },
+        },
+    ],
+    "width": "container",
+    "height": 350,
+    "title": _TITLE,
+    "config": {"view": {"strokeWidth": 0}, "axis": {"domainWidth": 1}},
+})
+
+_MESSAGE_TEMPLATE = json.dumps({
+    "data": {"values": [{"text": ""}]},
+    "mark": {"type": "text", "fontSize": 14},
+    "encoding": {"text": {"field": "text", "type": "nominal"}},
+})
+
+
+def _scale(domain, range_colors):
+    return {"domain": list(domain), "range": list(range_colors)}
+
+
+def histogram_spec(records, question_title, classifier_title, color_scale, show_legend, title):
+    """
+    Dodged histogram of integer answers by group.
+
+    ``records`` are dicts with ``value``, ``group``, ``count`` and ``is_user`` keys;
+    ``color_scale`` is a ``(domain, range)`` pair of group names and colors.
+    """
+    spec = json.loads(_HISTOGRAM_TEMPLATE)
+    spec["data"]["values"] = records
+    encoding = spec["encoding"]
+    encoding["x"]["title"] = question_title
+    encoding["color"]["scale"] = _scale(*color_scale)
+    if not show_legend:
+        encoding["color"]["legend"] = None
+    encoding["tooltip"][0]["title"] = question_title
+    encoding["tooltip"][1]["title"] = classifier_title
+    spec["title"]["text"] = title
+    return spec
+
+
+def pie_spec(records, response_colors, group_title, group_color, show_legend):
+    """
+    Donut chart of one group's answers.
+
+    ``records`` are dicts with ``response``, ``count``, ``percentage`` and ``is_user`` keys;
+    ``response_colors`` maps each response to its color.
+    """
+    spec = json.loads(_PIE_TEMPLATE)
+    spec["data"]["values"] = records
+    arc = spec["layer"][0]
+    arc["encoding"]["color"]["scale"] = _scale(response_colors.keys(), response_colors.values())
+    if not show_legend:
+        arc["encoding"]["color"]["legend"] = None
+    arc["title"]["text"] = group_title
+    arc["title"]["color"] = group_color
+    return spec
+
+
+def concat_specs(specs, title, per_row=3, spacing=20):
+    """Lays out sub-charts side by side, ``per_row`` per row, under a common title."""
+    if len(specs) == 1:
+        spec = specs[0]
+    elif len(specs) <= per_row:
+        spec = {"hconcat": specs, "spacing": spacing}
+    else:
+        rows = [{"hconcat": specs[i:i + per_row], "spacing": spacing} for i in range(0, len(specs), per_row)]
+        spec = {"vconcat": rows, "spacing": spacing}
+    spec["title"] = dict(_TITLE, text=title)
+    spec["config"] = {"view": {"strokeWidth": 0}}
+    return spec
+
+
+def grouped_bar_spec(records, question_title, classifier_title, color, rotate_labels, title):
+    """
+    Dodged bar chart of categorical answers by group, with the user's answer outlined.
+
+    ``records`` are dicts with ``response``, ``group``, ``count``, ``percentage`` and
+    ``is_user`` keys. ``color`` is either a ``(domain, range)`` group color scale or a
+    single fill color.
+    """
+    spec = json.loads(_GROUPED_BAR_TEMPLATE)
+    spec["data"]["values"] = records
+    encoding = spec["layer"][0]["encoding"]
+    if isinstance(color, str):
+        encoding["color"] = {"value": color}
+    else:
+        encoding["color"] = {"field": "group", "type": "nominal", "title": "Type de répondant",
+                             "scale": _scale(*color), "legend": dict(_LEGEND)}
+    if rotate_labels:
+        encoding["x"]["axis"]["labelAngle"] = -45
+    encoding["tooltip"][0]["title"] = question_title
+    encoding["tooltip"][1]["title"] = classifier_title
+    spec["title"]["text"] = title
+    return spec
+
+
+def message_spec(text):
+    """Placeholder chart showing a single line of text."""
+    spec = json.loads(_MESSAGE_TEMPLATE)
+    spec["data"]["values"][0]["text"] = text
+    return spec
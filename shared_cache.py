@@ -0,0 +1,325 @@
+"""
+Cache shared by the Streamlit processes serving the survey.
+
+``st.cache_data`` and ``st.cache_resource`` live in one process: behind a load balancer,
+every replica reads the Google Sheet and renders the charts again. A ``SharedCache``
+keeps the results of the loaders and the rendered charts (pickled) in a backend that the
+replicas can all reach:
+
+- ``MemoryBackend``: this process only;
+- ``DiskBackend``: a directory shared by the workers of one host;
+- ``RedisBackend``: a Redis-compatible server, through any client with the ``get``,
+  ``set`` and ``delete`` methods of redis-py (``fakeredis`` can stand in for it).
+
+``get_or_compute`` is single-flight across replicas: on a miss, the caller takes the
+key's lock in the backend, checks again and computes, while the others wait for the lock
+and then read the value. Rendered artifacts are keyed by the content key of their
+snapshot (see snapshots), which is the same in every replica holding the same data, so a
+new snapshot never serves stale charts. Raw reads, whose version is only known once read,
+expire after a short TTL instead.
+
+Every data change adds a set of charts, so the backends drop old entries: the memory
+backend past ``max_entries``, the disk backend when an entry is read after its expiry
+and, every ``prune_interval`` seconds, the entries older than ``max_age`` or past
+``max_bytes`` (least recently used first). On Redis, set a ``maxmemory`` with an LRU
+eviction policy.
+"""
+import hashlib
+import os
+import pickle
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+
+_MISSING = object()
+
+
+def _expired(expires):
+    return expires is not None and time.time() >= expires
+
+
+# region Backends
+class MemoryBackend:
+    """Entries and locks of this process, the least recently used dropped past ``max_entries``."""
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (expiry time or None, bytes)
+        self._key_locks = {}  # key -> [lock, number of callers using it]
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if _expired(entry[0]):
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, data, ttl=None):
+        with self._lock:
+            self._entries[key] = (time.time() + ttl if ttl else None, data)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    @contextmanager
+    def lock(self, key, timeout):
+        with self._lock:
+            entry = self._key_locks.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        acquired = entry[0].acquire(timeout=timeout)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                entry[0].release()
+            # Verrou supprimé quand plus personne ne l'attend
+            with self._lock:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._key_locks[key]
+
+
+class DiskBackend:
+    """
+    One file per entry in ``directory`` (its expiry time, then the data), written
+    atomically. Locks are ``flock`` locks on a file per key, released by the system if
+    the process dies, and deleted by their holder.
+
+    Expired entries are deleted when read. Every ``prune_interval`` seconds, a write
+    also deletes the entries not used for ``max_age`` seconds, then the least recently
+    used ones until the directory holds at most ``max_bytes``.
+    """
+
+    def __init__(self, directory, poll_interval=0.05, max_bytes=256 * 2**20, max_age=24 * 3600,
+                 prune_interval=300):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.poll_interval = poll_interval
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.prune_interval = prune_interval
+        self._pruned = time.monotonic()
+        self._prune_lock = threading.Lock()
+
+    def _path(self, key):
+        return self.directory / key
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            raw = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        header, _, data = raw.partition(b'\n')
+        if header and _expired(float(header)):
+            path.unlink(missing_ok=True)
+            return None
+        # Date d'utilisation, pour supprimer les entrées les moins utilisées en premier
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return data
+
+    def set(self, key, data, ttl=None):
+        path = self._path(key)
+        header = repr(time.time() + ttl).encode() if ttl else b''
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(header + b'\n' + data)
+        os.replace(tmp, path)
+        if time.monotonic() - self._pruned >= self.prune_interval and self._prune_lock.acquire(blocking=False):
+            try:
+                self.prune()
+            finally:
+                self._pruned = time.monotonic()
+                self._prune_lock.release()
+
+    def prune(self):
+        """Deletes the entries unused for ``max_age`` seconds, then the least recently used past ``max_bytes``."""
+        now = time.time()
+        entries = []
+        for path in self.directory.iterdir():
+            if path.suffix == '.lock':
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            # Fichier temporaire d'un processus arrêté pendant l'écriture, ou entrée trop ancienne
+            if now - stat.st_mtime >= (3600 if path.suffix == '.tmp' else self.max_age):
+                path.unlink(missing_ok=True)
+            elif path.suffix != '.tmp':
+                entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    @contextmanager
+    def lock(self, key, timeout):
+        import fcntl
+
+        path = self._path(key + '.lock')
+        deadline = time.monotonic() + timeout
+        acquired = False
+        while not acquired:
+            lock_file = open(path, 'a')
+            while True:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    acquired = True
+                    break
+                except BlockingIOError:
+                    if time.monotonic() >= deadline:
+                        break
+                    time.sleep(self.poll_interval)
+            if not acquired:
+                break
+            # Le détenteur précédent a pu supprimer le fichier entre open et flock : verrou à reprendre
+            try:
+                current = os.stat(path).st_ino == os.fstat(lock_file.fileno()).st_ino
+            except FileNotFoundError:
+                current = False
+            if not current:
+                acquired = False
+                lock_file.close()
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                path.unlink(missing_ok=True)
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+            lock_file.close()
+
+
+class RedisBackend:
+    """
+    Entries in a Redis-compatible server, under ``prefix``. A lock is a key set with
+    ``NX`` that expires after ``lock_ttl`` seconds, so a replica that dies while computing
+    does not block the others.
+    """
+
+    def __init__(self, client, prefix='micah:', lock_ttl=120, poll_interval=0.05):
+        self.client = client
+        self.prefix = prefix
+        self.lock_ttl = lock_ttl
+        self.poll_interval = poll_interval
+
+    def get(self, key):
+        return self.client.get(self.prefix + key)
+
+    def set(self, key, data, ttl=None):
+        if ttl:
+            self.client.set(self.prefix + key, data, px=int(ttl * 1000))
+        else:
+            self.client.set(self.prefix + key, data)
+
+    @contextmanager
+    def lock(self, key, timeout):
+        lock_key = f"{self.prefix}{key}:lock"
+        token = uuid.uuid4().hex.encode()
+        deadline = time.monotonic() + timeout
+        acquired = False
+        while True:
+            if self.client.set(lock_key, token, nx=True, px=int(self.lock_ttl * 1000)):
+                acquired = True
+                break
+            if time.monotonic() >= deadline:
+                break
+            time.sleep(self.poll_interval)
+        try:
+            yield acquired
+        finally:
+            # Ne supprimer le verrou que s'il est encore le nôtre (il a pu expirer entre-temps)
+            if acquired and self.client.get(lock_key) == token:
+                self.client.delete(lock_key)
+# endregion
+
+
+class SharedCache:
+    """
+    Pickled values in a backend, computed once across the processes sharing it.
+    A key is any tuple with a stable ``repr`` (strings, numbers, None).
+    """
+
+    def __init__(self, backend=None, namespace='micah', lock_timeout=60):
+        self.backend = backend or MemoryBackend()
+        self.namespace = namespace
+        self.lock_timeout = lock_timeout
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'computed': 0, 'waited': 0}
+
+    def _key(self, key):
+        return f"{self.namespace}-{hashlib.sha1(repr(key).encode()).hexdigest()}"
+
+    def _count(self, stat):
+        with self._lock:
+            self._stats[stat] += 1
+
+    def _get(self, key, default):
+        data = self.backend.get(self._key(key))
+        return default if data is None else pickle.loads(data)
+
+    def get(self, key, default=None):
+        """Value of ``key``, or ``default`` if it is not cached (or expired)."""
+        value = self._get(key, _MISSING)
+        if value is _MISSING:
+            return default
+        self._count('hits')
+        return value
+
+    def set(self, key, value, ttl=None):
+        self.backend.set(self._key(key), pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), ttl)
+
+    def get_or_compute(self, key, compute, ttl=None):
+        """
+        Value of ``key``, or ``compute()`` stored for ``ttl`` seconds (no expiry if None).
+        One caller computes while the others wait for it; past ``lock_timeout`` they
+        compute it themselves.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        with self.backend.lock(self._key(key), self.lock_timeout):
+            value = self._get(key, _MISSING)
+            if value is not _MISSING:
+                self._count('waited')
+                return value
+            value = compute()
+            self.set(key, value, ttl)
+            self._count('computed')
+            return value
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, backend=type(self.backend).__name__)
+
+
+def shared_cache_from_settings(settings):
+    """
+    ``SharedCache`` configured by the ``[cache]`` section of secrets.toml: ``backend``
+    ("memory", "disk" or "redis"), ``path``, ``max_mb`` and ``max_age`` (seconds) for
+    the disk and ``url`` for Redis.
+    """
+    backend = settings.get("backend", "memory")
+    if backend == "disk":
+        return SharedCache(DiskBackend(settings.get("path", ".cache/micah"), max_bytes=settings.get("max_mb", 256) * 2**20,
+                                       max_age=settings.get("max_age", 24 * 3600)))
+    if backend == "redis":
+        try:
+            import redis
+        except ImportError as error:
+            raise ImportError("Le cache Redis demande la bibliothèque 'redis' : `pip install redis`") from error
+        return SharedCache(RedisBackend(redis.Redis.from_url(settings.get("url", "redis://localhost:6379/0"))))
+    return SharedCache(MemoryBackend())
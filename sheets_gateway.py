@@ -0,0 +1,216 @@
+"""
+Rate-limited gateway to the Google Sheets API.
+
+All the sessions of the app share one quota (60 read and 60 write requests per minute
+for the service account). ``SheetsGateway`` makes every request wait for a token of a
+per-minute token bucket instead of failing, and retries with an exponential backoff the
+requests that failed for a transient reason: quota error (HTTP 429), server error (5xx)
+or network error.
+
+Identical reads running at the same time (several tablets pressing "Commencer" at once)
+share one request: the first caller sends it, the others wait for its result
+(single-flight). Writes are queued and sent by one thread; the rows queued for the same
+worksheet while the previous write is sent go out together in one ``append_rows``.
+A write is retried until it goes through, so a queued row is never dropped because the
+network was down for a while. ``stats`` reports the requests sent, throttled, coalesced
+and rejected; quota and transient errors are also logged with these counters.
+"""
+import logging
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+READS_PER_MINUTE = 60
+WRITES_PER_MINUTE = 60
+
+logger = logging.getLogger(__name__)
+
+
+def is_quota_error(error):
+    """True for the 'Quota exceeded' errors of the API (HTTP 429)."""
+    response = getattr(error, 'response', None)
+    return getattr(response, 'status_code', None) == 429
+
+
+def is_transient_error(error):
+    """
+    True for the errors worth retrying: quota errors, server errors (HTTP 408, 5xx) and
+    network errors (``OSError``, which includes the connection errors of requests).
+    """
+    response = getattr(error, 'response', None)
+    status = getattr(response, 'status_code', None)
+    return status == 408 or status == 429 or (status is not None and 500 <= status < 600) or isinstance(error, OSError)
+
+
+class TokenBucket:
+    """``per_minute`` tokens per minute, at most ``capacity`` saved for bursts."""
+
+    def __init__(self, per_minute, capacity=None):
+        self.rate = per_minute / 60
+        self.capacity = capacity or per_minute
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def available(self):
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        """Takes a token, waiting for it if the bucket is empty. Returns the time waited."""
+        with self._lock:
+            self._refill()
+            # Le jeton est réservé tout de suite : les appelants suivants attendent leur tour
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+        return wait
+
+
+class SheetsGateway:
+    """Shared entry point of the Sheets API requests of the app."""
+
+    def __init__(self, reads_per_minute=READS_PER_MINUTE, writes_per_minute=WRITES_PER_MINUTE, max_retries=5,
+                 max_backoff=32):
+        self.max_retries = max_retries
+        self.max_backoff = max_backoff
+        self._read_bucket = TokenBucket(reads_per_minute)
+        self._write_bucket = TokenBucket(writes_per_minute)
+        self._lock = threading.Lock()
+        self._in_flight = {}  # read key -> Future of its result
+        self._writes = deque()  # (worksheet, values or None, request or None, Future)
+        self._writes_ready = threading.Condition(self._lock)
+        self._writer = None
+        self._stats = {
+            'read_requests': 0, 'coalesced_reads': 0, 'write_requests': 0, 'appended_rows': 0,
+            'throttled_seconds': 0.0, 'quota_errors': 0, 'transient_errors': 0, 'retries': 0, 'failures': 0,
+        }
+
+    def _count(self, name, value=1):
+        with self._lock:
+            self._stats[name] += value
+
+    def _send(self, bucket, request, retry_forever=False):
+        """Runs a request within the budget of ``bucket``, retrying transient errors."""
+        attempt = 0
+        while True:
+            self._count('throttled_seconds', bucket.acquire())
+            try:
+                return request()
+            except Exception as error:
+                if not is_transient_error(error):
+                    self._count('failures')
+                    raise
+                if is_quota_error(error):
+                    self._count('quota_errors')
+                    logger.warning("Sheets API quota exceeded (attempt %d): %s", attempt + 1, self.stats())
+                else:
+                    self._count('transient_errors')
+                    logger.warning("Sheets API request failed (attempt %d): %r %s", attempt + 1, error, self.stats())
+                if attempt >= self.max_retries and not retry_forever:
+                    self._count('failures')
+                    raise
+            attempt += 1
+            self._count('retries')
+            time.sleep(min(self.max_backoff, 2 ** attempt) * random.uniform(0.5, 1))
+
+    # region Reads
+    def read(self, key, request):
+        """
+        Result of ``request()``. Callers passing the same ``key`` while it runs get the
+        result of the same request.
+        """
+        with self._lock:
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self._in_flight[key] = Future()
+            else:
+                self._stats['coalesced_reads'] += 1
+        if not leader:
+            return future.result()
+
+        try:
+            self._count('read_requests')
+            future.set_result(self._send(self._read_bucket, request))
+        except Exception as error:
+            future.set_exception(error)
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+        return future.result()
+    # endregion
+
+    # region Writes
+    def append_row(self, worksheet, values):
+        """Queues a row to append to ``worksheet`` and returns the ``Future`` of the write."""
+        return self._enqueue(worksheet, values, None)
+
+    def write(self, request):
+        """Queues any other write request and returns the ``Future`` of its result."""
+        return self._enqueue(None, None, request)
+
+    def _enqueue(self, worksheet, values, request):
+        future = Future()
+        with self._lock:
+            self._writes.append((worksheet, values, request, future))
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_loop, name="sheets-writer", daemon=True)
+                self._writer.start()
+            self._writes_ready.notify()
+        return future
+
+    def _next_write(self):
+        """
+        (request, futures, appended rows) of the next queued write, with the rows queued for
+        the same worksheet merged into one request.
+        """
+        with self._lock:
+            while not self._writes:
+                self._writes_ready.wait()
+            worksheet, values, request, future = self._writes.popleft()
+            if request is not None:
+                return request, [future], 0
+            rows, futures = [values], [future]
+            # Les lignes suivantes destinées à la même feuille partent dans la même requête
+            while self._writes and self._writes[0][0] is worksheet and self._writes[0][2] is None:
+                _, values, _, future = self._writes.popleft()
+                rows.append(values)
+                futures.append(future)
+        return (lambda: worksheet.append_rows(rows, value_input_option='USER_ENTERED')), futures, len(rows)
+
+    def _write_loop(self):
+        while True:
+            request, futures, appended_rows = self._next_write()
+            self._count('write_requests')
+            try:
+                # Quota dépassé, erreur serveur ou réseau coupé : on réessaie jusqu'à ce que ça passe
+                result = self._send(self._write_bucket, request, retry_forever=True)
+            except Exception as error:
+                for future in futures:
+                    future.set_exception(error)
+                continue
+            self._count('appended_rows', appended_rows)
+            for future in futures:
+                future.set_result(result)
+    # endregion
+
+    def stats(self):
+        """Requests sent, coalesced, throttled and rejected since start, and the current queue."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['queued_writes'] = len(self._writes)
+            stats['reads_in_flight'] = len(self._in_flight)
+        stats['read_tokens'] = round(self._read_bucket.available, 1)
+        stats['write_tokens'] = round(self._write_bucket.available, 1)
+        return stats
@@ -0,0 +1,124 @@
+"""
+Versioned data snapshots and a dependency-tracked cache of derived artifacts.
+
+``SnapshotStore.publish`` is given every frame loaded from a source. Each column is
+fingerprinted; when at least one changed, the snapshot version is incremented and the
+changed columns take the new version, while the others keep theirs (an empty answer in
+a new row does not change its column). A derived artifact (counts, summaries,
+indexes...) declares the columns it depends on and is cached under the versions of those
+columns only, so appending rows invalidates only the artifacts whose inputs actually
+changed. ``ROWS`` stands for the number of rows.
+
+Versions are counted per process; ``Snapshot.content_key`` derives a key from the
+fingerprints instead, which is the same in every process holding the same data (for
+artifacts kept in a cache shared by several replicas).
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import pandas as pd
+
+ROWS = '__rows__'
+
+
+def _fingerprints(df):
+    """Row count and, per column, a hash of its non-empty values and their positions."""
+    fingerprints = {ROWS: len(df)}
+    for col in df.columns:
+        values = df[col]
+        values = values[values.notna() & (values.astype(str) != '')]
+        fingerprints[col] = int(pd.util.hash_pandas_object(values, index=True).sum())
+    return fingerprints
+
+
+@dataclass(frozen=True, eq=False)
+class Snapshot:
+    """One published frame, with the version at which each column last changed and its fingerprints."""
+    version: int
+    data: pd.DataFrame
+    column_versions: dict
+    fingerprints: dict
+
+    def versions_of(self, columns):
+        """Cache key of an artifact depending on ``columns``."""
+        return tuple(self.column_versions.get(col, 0) for col in columns)
+
+    def content_key(self, columns):
+        """Cache key of an artifact depending on ``columns``, identical across processes."""
+        fingerprints = [(col, self.fingerprints.get(col)) for col in columns]
+        return hashlib.sha1(repr(fingerprints).encode()).hexdigest()
+
+
+class SnapshotStore:
+    """Latest snapshot of one data source and the artifacts derived from it."""
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._current = None
+        self._fingerprints = {}
+        self._entries = OrderedDict()  # (name, key) -> (depends_on, value)
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def current(self):
+        return self._current
+
+    def publish(self, df):
+        """Snapshot of ``df``: the current one if no column changed, a new version otherwise."""
+        fingerprints = _fingerprints(df)
+        with self._lock:
+            if self._current is not None and fingerprints == self._fingerprints:
+                return self._current
+
+            version = self._current.version + 1 if self._current is not None else 1
+            column_versions = dict(self._current.column_versions) if self._current is not None else {}
+            for col, fingerprint in fingerprints.items():
+                if self._fingerprints.get(col) != fingerprint:
+                    column_versions[col] = version
+            for col in set(column_versions) - set(fingerprints):
+                del column_versions[col]
+
+            self._current = Snapshot(version, df, column_versions, fingerprints)
+            self._fingerprints = fingerprints
+            self._purge_stale()
+            return self._current
+
+    def _purge_stale(self):
+        for (name, key), (depends_on, _) in list(self._entries.items()):
+            if self._current.versions_of(depends_on) != key:
+                del self._entries[(name, key)]
+
+    def derived(self, snapshot, name, depends_on, compute):
+        """
+        ``compute(snapshot.data)``, cached until one of the ``depends_on`` columns changes.
+        ``name`` identifies the artifact (any hashable, e.g. a tuple with its parameters).
+        """
+        depends_on = tuple(depends_on)
+        cache_key = (name, snapshot.versions_of(depends_on))
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None:
+                self._entries.move_to_end(cache_key)
+                self._hits += 1
+                return entry[1]
+            self._misses += 1
+
+        value = compute(snapshot.data)
+        with self._lock:
+            self._entries[cache_key] = (depends_on, value)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def stats(self):
+        with self._lock:
+            return {
+                'version': self._current.version if self._current is not None else 0,
+                'entries': len(self._entries),
+                'hits': self._hits,
+                'misses': self._misses,
+            }
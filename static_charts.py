@@ -0,0 +1,125 @@
+"""
+Static infographics of the survey pages, prerendered once.
+
+Some charts only show fixed data (the MICAH cohort figures of step 4), yet were drawn
+with matplotlib for every participant. Their builders are registered with
+``@static_chart(name)`` and ``python static_charts.py`` renders them at deploy time to
+PNG files in ``images/build/charts/``, sized to the page width (see assets) so
+``st.image`` sends them unchanged. The pages read ``chart_png(name)``: the prerendered
+file, or the chart rendered (and saved) on first use if the build step was skipped.
+
+Bump a chart's ``version`` when its builder changes, so the stale file is not served.
+"""
+import argparse
+import io
+import os
+import time
+from functools import lru_cache
+from pathlib import Path
+
+from PIL import Image
+
+from assets import DEFAULT_WIDTH, ROOT
+from figures import SAVEFIG_OPTIONS, figure_manager
+
+BUILD_DIR = ROOT / 'build' / 'charts'
+
+# Graphiques statiques : nom -> (fonction qui construit la figure, version)
+CHARTS = {}
+
+
+def static_chart(name, version=1):
+    """Registers a builder returning a matplotlib ``Figure`` (from ``figure_manager``) as static chart ``name``."""
+    def register(builder):
+        CHARTS[name] = (builder, version)
+        return builder
+    return register
+
+
+# region Charts
+@static_chart('micah_activities')
+def micah_activities():
+    """Activities before falling asleep of the MICAH cohort (2024), as horizontal bars."""
+    activities = ['Envoyer des messages aux ami.e.s', 'Vérifier les réseaux sociaux', 'Regarder des vidéos sur Youtube', 'Lire sur un livre/kindle', 'Jouer à des jeux vidéo hors ligne', 'Jouer à des jeux non numériques', 'Publier sur les réseaux sociaux']
+    percentages = [81.03, 77.97, 75.18, 66.73, 42.81, 41.10, 39.57]
+    percentages, activities = zip(*sorted(zip(percentages, activities)))
+
+    fig, ax = figure_manager.subplots(figsize=(8, 4))
+    fig.patch.set_facecolor('#1E1E1E')
+    ax.set_facecolor('#1E1E1E')
+    bars = ax.barh(activities, percentages, color='#4A90E2', height=0.6)
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+    ax.spines['left'].set_visible(False)
+    ax.spines['bottom'].set_color('white')
+    ax.tick_params(axis='x', colors='white')
+    ax.tick_params(axis='y', colors='white', length=0)
+    for bar in bars:
+        width = bar.get_width()
+        ax.text(width + 1, bar.get_y() + bar.get_height()/2, f'{width}%', ha='left', va='center', color='white', fontsize=9)
+    return fig
+# endregion
+
+
+def chart_path(name, root=BUILD_DIR):
+    _, version = CHARTS[name]
+    return Path(root) / f"{name}-v{version}.png"
+
+
+def render(name, width=DEFAULT_WIDTH):
+    """
+    PNG bytes of chart ``name`` at most ``width`` pixels wide: drawn with the options of
+    ``st.pyplot``, then drawn again at the resolution that fits ``width`` (sharper text
+    than resizing the image).
+    """
+    builder, _ = CHARTS[name]
+    png = figure_manager.to_png(builder())
+    actual_width = Image.open(io.BytesIO(png)).width
+    if actual_width > width:
+        fig = builder()
+        buffer = io.BytesIO()
+        try:
+            fig.savefig(buffer, **dict(SAVEFIG_OPTIONS, dpi=SAVEFIG_OPTIONS['dpi'] * width / actual_width))
+        finally:
+            figure_manager.release(fig)
+        png = buffer.getvalue()
+    return png
+
+
+def prerender(name, root=BUILD_DIR):
+    """Renders chart ``name`` to its file and returns the PNG bytes."""
+    png = render(name)
+    path = chart_path(name, root)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + '.tmp')
+    tmp.write_bytes(png)
+    os.replace(tmp, path)
+    return png
+
+
+@lru_cache(maxsize=None)
+def chart_png(name):
+    """PNG bytes of chart ``name``, read once per process from its prerendered file (rendered if missing)."""
+    path = chart_path(name)
+    if path.exists():
+        return path.read_bytes()
+    return prerender(name)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prérendu des graphiques statiques des pages.")
+    parser.add_argument('names', nargs='*', metavar='nom', help=f"graphiques à rendre (défaut : tous, {', '.join(CHARTS)})")
+    parser.add_argument('--root', default=str(BUILD_DIR), help="dossier des images générées")
+    args = parser.parse_args(argv)
+
+    unknown = [name for name in args.names if name not in CHARTS]
+    if unknown:
+        parser.error(f"Graphique inconnu : {', '.join(unknown)}")
+    for name in args.names or CHARTS:
+        start = time.perf_counter()
+        png = prerender(name, args.root)
+        print(f"{name:<20} {chart_path(name, args.root)}  {len(png) / 1024:5.0f} Ko  en {time.perf_counter() - start:.2f} s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""
+Pages of the survey, one module per step.
+
+A page module is imported the first time its step is shown and stays loaded for the
+next runs, so the early steps do not import the results machinery (snapshots, reports,
+charts) of the last page. Each module exposes ``render()``.
+
+The chart pages (``CHART_STEPS``) declare the counts they show in ``COUNTS``; while the
+participant answers the questions before one of them, its counts are prefetched from
+the latest data.
+"""
+import importlib
+
+from steps.common import prefetch_counts
+
+STEP_MODULES = {
+    1: 'step01_pseudo',
+    2: 'step02_sleep_question',
+    3: 'step03_sleep_viz',
+    4: 'step04_sleep_facts',
+    5: 'step05_ai_question',
+    6: 'step06_ai_viz',
+    7: 'step07_wellplay_ad',
+    8: 'step08_ai_benefit',
+    9: 'step09_ai_benefit_scale',
+    10: 'step10_feelings_question',
+    11: 'step11_feelings_viz',
+    12: 'step12_ai_concern_scale',
+    13: 'step13_ai_concern_items',
+    14: 'step14_ai_responsible_people',
+    15: 'step15_ai_features',
+    16: 'step16_ai_prevention',
+    17: 'step17_comments',
+    18: 'step18_submit',
+    19: 'step19_wellplay_final',
+    20: 'step20_results',
+}
+CHART_STEPS = (3, 6, 11)
+
+
+def page(step):
+    """Module of ``step``, imported on first use (``sys.modules`` keeps it afterwards)."""
+    return importlib.import_module(f'{__name__}.{STEP_MODULES[step]}')
+
+
+def next_chart_step(step):
+    return next((chart_step for chart_step in CHART_STEPS if chart_step > step), None)
+
+
+def render(step):
+    # Les données sont chargées au step 1 : on prépare ensuite le prochain graphique
+    chart_step = next_chart_step(step)
+    if step > 1 and step not in CHART_STEPS and chart_step is not None:
+        prefetch_counts(page(chart_step).COUNTS)
+    page(step).render()
@@ -0,0 +1,45 @@
+"""Plotly charts of the survey pages, comparing the participant's answer with their group."""
+import streamlit as st
+
+from plotly_figures import donut_chart, likert_chart
+from steps.common import get_survey_counts
+
+# region Graph functions
+def plot_likert(user_choice, options, data_my_group, data_other_group=None, my_group_name="Mon Groupe", other_group_name="Autre",
+                compare_button=None):
+    """
+    Generates a horizontal Likert-style bar chart, patched from the prebuilt figure of
+    the question (``micah_dark`` template, see plotly_figures) and validated once per
+    answer and counts. The figure is shared between renders: do not modify it.
+    With ``compare_button`` (its label), the other group's bars start hidden and the
+    button shows or hides them in the browser.
+    """
+    return likert_chart(user_choice, tuple(options), tuple(data_my_group),
+                        tuple(data_other_group) if data_other_group else None, my_group_name, other_group_name,
+                        compare_button)
+
+def plot_donut(user_choice, options, data_my_group, data_other_group=None, my_group_name="Mon Groupe"):
+    """
+    Generates a Ring Plot (Donut) for percentages, patched from the prebuilt figure of the
+    question and validated once per answer and counts (shared figure, do not modify it).
+    """
+    return donut_chart(user_choice, tuple(options), tuple(data_my_group))
+
+def group_likert_panel(title, column, options, compare_label):
+    """
+    Likert chart of the user's answer to ``column``. The other group's bars are already
+    in the figure, hidden: the compare button shows them without rerunning the app.
+    """
+    user_role = st.session_state.responses['Category']
+    other_role = "Adulte" if user_role.startswith("Ado") else "Ado (11-17 ans)"
+
+    my_counts = get_survey_counts(user_role, column, options)
+    other_counts = get_survey_counts(other_role, column, options)
+
+    st.markdown(f"<div class='css-card'><h4>{title}</h4>", unsafe_allow_html=True)
+    fig = plot_likert(st.session_state.responses[column], options, my_counts, other_counts, user_role, other_role,
+                      compare_label)
+    st.plotly_chart(fig, use_container_width=True)
+    st.markdown("</div>", unsafe_allow_html=True)
+
+# endregion
@@ -0,0 +1,316 @@
+"""
+Shared state of the survey pages: storage backend, data loading and counts, step
+navigation, page images and image previews.
+"""
+import gspread
+import pandas as pd
+import streamlit as st
+from google.oauth2.service_account import Credentials
+from streamlit_gsheets import GSheetsConnection
+
+from assets import PAGE_IMAGES, AssetPipeline, is_remote
+from prefetcher import Prefetcher
+from response_store import DuplicatePseudoError, SheetsMirror, SheetsStore, SQLiteStore, count_answers
+from shared_cache import shared_cache_from_settings
+from sheets_gateway import SheetsGateway
+from snapshots import SnapshotStore
+from submission_journal import SubmissionJournal
+from text_tokens import add_token_columns
+
+# region Configuration
+# Client gspread créé une seule fois pour toutes les sessions (pas à chaque rerun)
+@st.cache_resource
+def get_gspread_client():
+    # Load service account info from secrets
+    service_account_info = st.secrets["gdrive_service_account"]
+
+    credentials = Credentials.from_service_account_info(
+        service_account_info,
+        scopes=["https://www.googleapis.com/auth/spreadsheets"]
+    )
+
+    return gspread.authorize(credentials)
+
+SHEET_ID = "1ifQbsvd439slcLIXVlsb0pn0GbAsVMhALHp0hluQS28"
+WORKSHEET_NAME = "Reponses"
+# Stockage des réponses : Google Sheets par défaut, ou base SQLite locale (copiée vers la feuille
+# si mirror_to_sheets est activé) avec dans secrets.toml :
+# [storage]
+# backend = "sqlite"
+# path = "micah_responses.db"
+# mirror_to_sheets = true
+# Avec Google Sheets, les réponses envoyées sont d'abord écrites dans un journal local, un fichier
+# par processus dans journal_dir (par défaut micah_submissions/), renvoyé jusqu'à confirmation
+STORAGE_SETTINGS = st.secrets.get("storage", {})
+USE_SQLITE = STORAGE_SETTINGS.get("backend", "sheets") == "sqlite"
+# Cache partagé entre plusieurs instances de l'app (désactivé sans section [cache]) :
+# [cache]
+# backend = "disk"        # "memory", "disk" (instances du même serveur) ou "redis"
+# path = ".cache/micah"   # dossier du cache disque
+# max_mb = 256            # taille du cache disque, les entrées les moins utilisées supprimées au-delà
+# url = "redis://localhost:6379/0"
+# read_ttl = 10           # secondes pendant lesquelles une lecture de la feuille est partagée
+CACHE_SETTINGS = st.secrets.get("cache", {})
+# Colonnes de texte libre, tokenisées une fois au chargement
+TEXT_COLUMNS = ['AI_Wordcloud_Input', 'AI_Feature', 'AI_Comments']
+# Groupes comparés dans les graphiques
+GROUPS = ("Ado (11-17 ans)", "Adulte")
+# endregion
+
+# region Load data
+# Quota de l'API Google Sheets partagé par toutes les sessions (lectures groupées, écritures en file)
+@st.cache_resource
+def get_sheets_gateway():
+    return SheetsGateway()
+
+# Lectures et graphiques partagés entre les instances de l'app (None sans section [cache])
+@st.cache_resource
+def get_shared_cache():
+    return shared_cache_from_settings(CACHE_SETTINGS) if CACHE_SETTINGS else None
+
+# Backend de stockage partagé par les sessions
+@st.cache_resource
+def get_response_store():
+    if not USE_SQLITE:
+        return SheetsStore(get_gspread_client(), SHEET_ID, WORKSHEET_NAME, get_sheets_gateway(),
+                           cache=get_shared_cache(), read_ttl=CACHE_SETTINGS.get("read_ttl", 10))
+    return SQLiteStore(STORAGE_SETTINGS.get("path", "micah_responses.db"))
+
+# Copie en arrière-plan des réponses SQLite vers la feuille (None si désactivée)
+@st.cache_resource
+def get_sheets_mirror():
+    if not (USE_SQLITE and STORAGE_SETTINGS.get("mirror_to_sheets", False)):
+        return None
+    sheets = SheetsStore(get_gspread_client(), SHEET_ID, WORKSHEET_NAME, get_sheets_gateway())
+    return SheetsMirror(get_response_store(), sheets).start()
+
+@st.cache_data(ttl=0)
+#def load_data():
+#def load_data(sheet_id, worksheet_name, _gspread_client):
+def load_data():
+    """Reads the Google Sheet to get data for the graphs."""
+
+    # V1
+    # try:
+    #     conn = st.connection("gsheets", type=GSheetsConnection)
+    #     # ttl=0 ensures we get fresh data every time we reload
+    #     df = conn.read(worksheet="Reponses", ttl=0)
+    #     return df
+    # except Exception as e:
+    #     return pd.DataFrame()
+
+    # V2
+    try:
+        # Google Sheet (get_all_records) or SQLite table, depending on the backend
+        df = get_response_store().load()
+        return add_token_columns(df, TEXT_COLUMNS)
+    except Exception as e:
+        st.error(f"Erreur de chargement des données: {e}")
+        return pd.DataFrame()
+# endregion
+
+# region Utils
+# Journal des réponses envoyées vers la feuille (None avec SQLite, déjà local) ; les réponses
+# sans confirmation (envoi échoué, processus arrêté) sont renvoyées en arrière-plan
+@st.cache_resource
+def get_submission_journal():
+    if USE_SQLITE:
+        return None
+    journal = SubmissionJournal(STORAGE_SETTINGS.get("journal_dir", "micah_submissions"))
+    return journal.start_replay(get_response_store())
+
+def save_data_securely(new_data_dict):
+    """
+    Appends a new row to the response store (Google Sheet or SQLite). With Sheets, the
+    row is saved once it is in the local journal; the write to the sheet continues in the
+    background, confirmed in the journal when done and sent again if it fails.
+    """
+    try:
+        journal = get_submission_journal()
+        if journal is not None:
+            # Sheets: values appended in the order of the keys of the dict
+            journal.submit(get_response_store(), new_data_dict)
+            return True
+
+        get_response_store().append(new_data_dict)
+
+        mirror = get_sheets_mirror()
+        if mirror is not None:
+            mirror.notify()
+        return True
+    except DuplicatePseudoError:
+        st.error("Ce pseudo est déjà pris. Veuillez recommencer avec un autre pseudo.")
+        return False
+    except Exception as e:
+        st.error(f"Erreur de sauvegarde: {e}")
+        return False
+
+#def save_data_securely(new_data_dict):
+    """Reads current data, appends new row, and writes everything back."""
+    # try:
+    #     conn = st.connection("gsheets", type=GSheetsConnection)
+    #
+    #     # 1. Read existing data (No Cache)
+    #     existing_data = conn.read(worksheet="Reponses", ttl=0)
+    #
+    #     # 2. Create new row
+    #     new_row = pd.DataFrame([new_data_dict])
+    #
+    #     # 3. Combine old + new
+    #     # If existing_data is empty, we just start with new_row
+    #     if existing_data.empty:
+    #         updated_df = new_row
+    #     else:
+    #         updated_df = pd.concat([existing_data, new_row], ignore_index=True)
+    #
+    #     # 4. Write back to sheet
+    #     conn.update(worksheet="Reponses", data=updated_df)
+    #     return True
+    # except Exception as e:
+    #     st.error(f"Erreur de sauvegarde: {e}")
+    #     return False
+    
+def get_real_counts(df, category, column, options):
+    """Filters the dataframe by category and counts responses for specific options."""
+    # Zeros if data is empty or column missing, 0 for the options nobody chose
+    return count_answers(df, category, column, options)
+
+# Snapshots versionnés des données du questionnaire, partagés entre les sessions
+@st.cache_resource
+def get_survey_snapshots():
+    return SnapshotStore()
+
+def snapshot_counts(snapshots, snapshot, category, column, options):
+    """get_real_counts on a snapshot, cached until the category or the column changes."""
+    return snapshots.derived(
+        snapshot, ('counts', category[:3].lower(), column, tuple(options)),
+        ['Category', column], lambda data: get_real_counts(data, category, column, options))
+
+def get_survey_counts(category, column, options):
+    """
+    get_real_counts on the session's data (see session_snapshot).
+    With the SQLite backend, the counts are an indexed GROUP BY query on the live table.
+    """
+    if USE_SQLITE:
+        return get_response_store().counts(category, column, options)
+    return snapshot_counts(get_survey_snapshots(), session_snapshot(), category, column, options)
+
+# Rechargements en arrière-plan partagés par les sessions
+@st.cache_resource
+def get_prefetcher():
+    return Prefetcher()
+
+def refresh_counts(store, snapshots, queries):
+    """Prefetch job: reloads the answers and computes the counts of ``queries`` for both groups."""
+    snapshot = snapshots.publish(add_token_columns(store.load(), TEXT_COLUMNS))
+    for column, options in queries:
+        for category in GROUPS:
+            snapshot_counts(snapshots, snapshot, category, column, options)
+    return snapshot
+
+def prefetch_counts(queries):
+    """
+    Starts reloading the data and computing the counts of ``queries`` ((column, options)
+    pairs) in the background, for the next chart page. With SQLite the counts are live.
+    """
+    if USE_SQLITE:
+        return
+    queries = tuple((column, tuple(options)) for column, options in queries)
+    st.session_state.prefetched = get_prefetcher().submit(
+        ('counts', queries), refresh_counts, get_response_store(), get_survey_snapshots(), queries)
+
+def session_snapshot():
+    """
+    Snapshot of the session's data: the one loaded at step 1, replaced by the prefetched
+    one once it is ready (never waiting for it).
+    """
+    prefetched = st.session_state.get('prefetched')
+    if prefetched is not None and prefetched.done():
+        st.session_state.prefetched = None
+        # En cas d'échec du rechargement, on garde les données de la session
+        if prefetched.exception() is None:
+            st.session_state.sheet_snapshot = prefetched.result()
+            st.session_state.sheet_data = st.session_state.sheet_snapshot.data
+    if 'sheet_snapshot' not in st.session_state:
+        st.session_state.sheet_snapshot = get_survey_snapshots().publish(st.session_state.sheet_data)
+    return st.session_state.sheet_snapshot
+
+def next_step():
+    st.session_state.step += 1
+
+# Images des pages redimensionnées et compressées, partagées par les sessions
+@st.cache_resource
+def get_asset_pipeline():
+    return AssetPipeline()
+
+def show_page_image(name):
+    """
+    Shows the page image ``name`` (see assets.PAGE_IMAGES), resized and compressed. A
+    remote image is shown from its URL until it is in the local mirror (or if its copy
+    cannot be read); a missing or unreadable file is skipped.
+    """
+    source = PAGE_IMAGES[name]
+    try:
+        data = get_asset_pipeline().image(source)
+    except Exception:
+        data = None
+    if data is not None:
+        st.image(data, use_container_width=True)
+    elif is_remote(source):
+        st.image(source, use_container_width=True)
+
+# Images affichées en aperçu, remplacées par leur version finale à la fin de la page
+# (liste de la session, vidée au début de chaque exécution du script)
+def pending_full_images():
+    if 'pending_full_images' not in st.session_state:
+        st.session_state.pending_full_images = []
+    return st.session_state.pending_full_images
+
+def rendered_png(future):
+    """PNG bytes of a finished render, or None if it failed or has nothing to draw."""
+    try:
+        return future.result()
+    except Exception:
+        return None
+
+def show_image_with_preview(preview, full):
+    """
+    Shows the full image if it is already rendered, otherwise the preview, which is
+    swapped for the full image at the end of the run (kept if the full render fails).
+    Returns False if there is nothing to show.
+    """
+    if full.done():
+        png = rendered_png(full)
+        if png is not None:
+            st.image(png, use_container_width=True)
+            return True
+
+    png = rendered_png(preview)
+    if png is None:
+        return False
+    placeholder = st.empty()
+    placeholder.image(png, use_container_width=True)
+    if not full.done():
+        pending_full_images().append((placeholder, full))
+    return True
+
+def swap_in_full_images():
+    pending = pending_full_images()
+    while pending:
+        placeholder, full = pending.pop(0)
+        png = rendered_png(full)
+        # Rendu final en échec ou vide : l'aperçu reste affiché
+        if png is not None:
+            placeholder.image(png, use_container_width=True)
+
+def save_to_google_sheets(data):
+    try:
+        conn = st.connection("gsheets", type=GSheetsConnection)
+        new_row = pd.DataFrame([data])
+        conn.update(worksheet="Reponses", data=new_row)
+        return True
+    except Exception as e:
+        st.error(f"Erreur technique: {e}")
+        return False
+
+# endregion
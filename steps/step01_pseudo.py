@@ -0,0 +1,54 @@
+"""Step 1: pseudo and age group of the participant."""
+import streamlit as st
+
+from steps.common import load_data, get_survey_snapshots, next_step, show_page_image
+
+
+def render():
+    show_page_image('accueil')
+    st.title("Partage ton avis sur le sommeil, les écrans et les IA")
+    #st.markdown("<div class='css-card'>", unsafe_allow_html=True)
+    st.markdown("### 1. Identifiez-vous")
+    code = st.text_input("Choisissez un pseudo (ex: PIZZA99)")
+    role = st.radio("Vous êtes :", ["Ado (11-17 ans)", "Adulte"], index=None)
+    st.markdown("</div>", unsafe_allow_html=True)
+
+    if st.button("Commencer"):
+        if code and role:
+            # Load the data to check for existing pseudos
+            st.session_state.sheet_data = load_data()
+            st.session_state.sheet_snapshot = get_survey_snapshots().publish(st.session_state.sheet_data)
+
+            # Check if the pseudo already exists
+            if 'Secret_Code' in st.session_state.sheet_data.columns:
+                existing_codes = st.session_state.sheet_data['Secret_Code'].astype(str).str.upper()
+                if code.upper() in existing_codes.values:
+                    st.error("Ce pseudo est déjà pris. Veuillez en choisir un autre.")
+                else:
+                    # Pseudo is available, proceed
+                    st.session_state.responses['Secret_Code'] = code
+                    st.session_state.responses['Category'] = role
+                    next_step()
+                    st.rerun()
+            else:
+                # If column doesn't exist yet (empty sheet), proceed
+                st.session_state.responses['Secret_Code'] = code
+                st.session_state.responses['Category'] = role
+                next_step()
+                st.rerun()
+        else:
+            st.warning("Veuillez remplir tous les champs.")
+
+    if st.button("Voir les résultats"):
+        st.session_state.step = 20
+        st.rerun()
+    # if st.button("Commencer"):
+    #     if code and role:
+    #         st.session_state.responses['Secret_Code'] = code
+    #         st.session_state.responses['Category'] = role
+    #         #st.session_state.sheet_data = load_data()
+    #         st.session_state.sheet_data = load_data(SHEET_ID, WORKSHEET_NAME, client)
+    #         next_step()
+    #         st.rerun()
+    #     else:
+    #         st.warning("Veuillez remplir tous les champs.")
@@ -0,0 +1,23 @@
+"""Step 2: screens before sleep (question)."""
+import streamlit as st
+
+from steps.common import next_step, show_page_image
+
+
+def render():
+    st.progress(6)
+    st.title("Habitudes de Sommeil")
+    show_page_image('sommeil_ecran')
+
+    #st.markdown("<div class='css-card'>", unsafe_allow_html=True)
+    st.markdown("#### Regardez-vous des écrans avant de dormir ?")
+    screens = st.radio("", ["Jamais", "Parfois", "Souvent", "Tous les soirs"], index=None)
+    st.markdown("</div>", unsafe_allow_html=True)
+
+    if st.button("Continuer ➡️"):
+        if screens:
+            st.session_state.responses['Screen_Habit'] = screens
+            next_step()
+            st.rerun()
+        else:
+            st.warning("Choix requis.")
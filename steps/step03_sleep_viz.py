@@ -0,0 +1,24 @@
+"""Step 3: screens before sleep, answers of the participant's group."""
+import streamlit as st
+
+from steps.charts import group_likert_panel
+from steps.common import next_step
+
+OPTIONS = ["Jamais", "Parfois", "Souvent", "Tous les soirs"]
+# Comptes du graphique, préparés en arrière-plan pendant les questions précédentes
+COUNTS = [('Screen_Habit', OPTIONS)]
+
+
+def render():
+    st.progress(12)
+    st.title("📊 Résultats : Ecran & Sommeil")
+    
+    user_role = st.session_state.responses['Category']
+    
+    # --- NEW REAL DATA LOGIC ---
+    group_likert_panel(f"Votre groupe : {user_role}", 'Screen_Habit', OPTIONS, "🔄 Comparer Groupes")
+    # ---------------------------
+
+    if st.button("Continuer ➡️"):
+        next_step()
+        st.rerun()
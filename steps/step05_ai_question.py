@@ -0,0 +1,33 @@
+"""Step 5: AI use frequency and purposes (question)."""
+import streamlit as st
+
+from steps.common import next_step, show_page_image
+
+
+def render():
+    st.progress(24)
+    st.title("Utilisation des Intelligences Artificielles (IA)")
+    show_page_image('ia')
+
+    st.markdown("#### A quelle fréquence utilisez-vous les IA ?")
+    #ai_freq = st.select_slider("", options=["Jamais", "Rarement", "Hebdomadaire", "Souvent", "Tous les jours"])
+    ai_freq = st.radio("", options=["Jamais", "Rarement", "Hebdomadaire", "Souvent", "Tous les jours"])
+
+    st.markdown("#### Dans quel but ?", unsafe_allow_html=True)
+    st.caption("Plusieurs choix possibles")
+    ai_purpose = st.multiselect("", ["Travail / Devoirs", "Loisirs", "Recherche d'info", "Compagnon virtuel", "Soutien psychologique", "Autre"])
+    
+    ai_other_text = ""
+    if "Autre" in ai_purpose:
+        ai_other_text = st.text_input("Précisez pour 'Autre' :")
+    st.markdown("</div>", unsafe_allow_html=True)
+
+    if st.button("Continuer ➡️"):
+        final_purpose_list = [p for p in ai_purpose if p != "Autre"]
+        if ai_other_text: final_purpose_list.append(ai_other_text) # Just store text for wordcloud later
+        
+        st.session_state.responses['AI_Freq'] = ai_freq
+        st.session_state.responses['AI_Purpose'] = ", ".join(final_purpose_list)
+        st.session_state.responses['AI_Wordcloud_Input'] = f'{" ".join(final_purpose_list)} {ai_other_text}' if ai_other_text else " ".join(final_purpose_list) # Dummy default
+        next_step()
+        st.rerun()
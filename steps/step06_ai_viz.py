@@ -0,0 +1,73 @@
+"""Step 6: AI use frequency of the group and word cloud of the purposes."""
+import streamlit as st
+
+from render_pool import render_pool
+from results_charts import create_group_wordcloud_chart
+from steps.charts import group_likert_panel
+from steps.common import get_shared_cache, next_step, show_image_with_preview
+from text_tokens import join_tokens, tokenize, tokens_of
+
+OPTIONS = ["Jamais", "Rarement", "Hebdomadaire", "Souvent", "Tous les jours"]
+# Comptes du graphique, préparés en arrière-plan pendant les questions précédentes
+COUNTS = [('AI_Freq', OPTIONS)]
+
+
+# Rendus du nuage de mots, partagés par les sessions (et les instances de l'app) qui voient le même texte
+@st.cache_resource(max_entries=32)
+def _group_wordcloud_future(text, tier):
+    return render_pool.submit_shared(get_shared_cache(), ('group_wordcloud', text, tier),
+                                     create_group_wordcloud_chart, text, tier)
+
+
+def render_group_wordcloud(text, tier):
+    """``Future`` of the word cloud of ``text``; a failed render is dropped from the cache and started again."""
+    future = _group_wordcloud_future(text, tier)
+    if future.done() and future.exception() is not None:
+        _group_wordcloud_future.clear(text, tier)
+        future = _group_wordcloud_future(text, tier)
+    return future
+
+
+def render():
+    st.progress(30)
+    st.title("📊 Usage de l'IA")
+    
+    user_role = st.session_state.responses['Category']
+    
+    # --- NEW REAL DATA LOGIC ---
+    group_likert_panel("Fréquence d'utilisation", 'AI_Freq', OPTIONS, "🔄 Comparer")
+    # ---------------------------
+    
+    # Wordcloud logic - Aggregate ALL responses
+    st.markdown("<div class='css-card'><h4>Nuage de mots</h4>", unsafe_allow_html=True)
+    #text = st.session_state.responses.get('AI_Wordcloud_Input', '') * 5
+    #text = st.session_state.responses.get('AI_Wordcloud_Input', '')
+
+    # Get all AI_Wordcloud_Input responses from the sheet
+    if not st.session_state.sheet_data.empty and 'AI_Wordcloud_Input' in st.session_state.sheet_data.columns:
+        # Filter by user's category (optional - remove if you want ALL responses regardless of category)
+        filtered_df = st.session_state.sheet_data[
+            st.session_state.sheet_data['Category'].astype(str).str.contains(user_role[:3], case=False, na=False)
+        ]
+
+        # Combine all tokens from the column
+        all_text = join_tokens(tokens_of(filtered_df, 'AI_Wordcloud_Input'))
+
+        # Add current user's response
+        all_text += ' ' + ' '.join(tokenize(st.session_state.responses.get('AI_Wordcloud_Input', '')))
+    else:
+        # Fallback to just current user's response if sheet is empty
+        all_text = ' '.join(tokenize(st.session_state.responses.get('AI_Wordcloud_Input', 'Travail Loisirs')))
+
+    # Generate wordcloud
+    if all_text.strip():  # Only generate if there's text
+        preview = render_group_wordcloud(all_text, 'preview')
+        show_image_with_preview(preview, render_group_wordcloud(all_text, 'full'))
+    else:
+        st.info("Pas encore assez de données pour générer un nuage de mots.")
+
+    st.markdown("</div>", unsafe_allow_html=True)
+
+    if st.button("Continuer ➡️"):
+        next_step()
+        st.rerun()
@@ -0,0 +1,29 @@
+"""Step 7: Well-Play study ad."""
+import streamlit as st
+
+from steps.common import next_step
+
+
+def render():
+    st.progress(33)
+    st.title("Participe à l'étude Well-Play")
+
+# --- Texte Streamlit ---
+    st.markdown("""
+    📱Joue pour la science et soutiens la planète!
+
+    Rejoins l’étude Well-Play sur les jeux vidéo, le bien-être et l’apprentissage.
+
+    🎁 Jusqu’à 60 CHF en bons Galaxus pour toi et 40 CHF pour une asso écologique de ton choix
+
+    ✅ **Demande à un parent de t'y inscrire: **:**
+
+    🔗 [https://well-play-teen.org](https://well-play-teen.org)
+
+    Pour toute question, contactez : [**wellplay@unige.ch**](mailto:wellplay@unige.ch)
+    """, unsafe_allow_html=True)
+
+    # See results
+    if st.button("Continuer ➡️"):
+        next_step()
+        st.rerun()
@@ -0,0 +1,29 @@
+"""Step 8: benefits of AI (question)."""
+import streamlit as st
+
+from steps.common import next_step, show_page_image
+
+
+def render():
+    st.progress(36)
+    st.title("Bénéfices des Intelligences Artificielles")
+    show_page_image('ia')
+
+    #st.markdown("<div class='css-card'>", unsafe_allow_html=True)
+    st.markdown("#### Quels sont les avantages (bénéfices?) de l'IA pour vous ?")
+    st.caption("Plusieurs choix possibles")
+    ai_benefit = st.multiselect("", ["Pratique / Utile", "Rapide", "Ne me juge pas", "Suscite l'inspiration",
+                                     "Sentiment d'accomplissement", "Pas de bénéfices", "Autre"])
+
+    ai_other_text = ""
+    if "Autre" in ai_benefit:
+        ai_other_text = st.text_input("Précisez pour 'Autre' :")
+    st.markdown("</div>", unsafe_allow_html=True)
+
+    if st.button("Continuer ➡️"):
+        final_purpose_list = [p for p in ai_benefit if p != "Autre"]
+        if ai_other_text: final_purpose_list.append(ai_other_text)  # Just store text for wordcloud later
+
+        st.session_state.responses['AI_Benefit'] = ", ".join(final_purpose_list)
+        next_step()
+        st.rerun()
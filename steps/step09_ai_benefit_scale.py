@@ -0,0 +1,26 @@
+"""Step 9: AI benefit scale (question)."""
+import streamlit as st
+
+from steps.common import next_step, show_page_image
+
+
+def render():
+    st.progress(42)
+    st.title("Avantages des Intelligences Artificielles")
+    show_page_image('ia')
+
+    #st.markdown("<div class='css-card'>", unsafe_allow_html=True)
+    st.markdown("#### Dans quelle mesure pensez-vous que les IA apportent des avantages ?")
+    ai_benefit_scale = st.select_slider("", options=list(range(1, 11)), value=5)
+    # Custom labels below the slider
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        st.write("**Les IA n'apportent aucun avantages**")
+    with col3:
+        st.write("**Les IA apportent toujours des avantages**")
+
+
+    if st.button("Continuer ➡️"):
+        st.session_state.responses['AI_Benefit_Scale'] = ai_benefit_scale
+        next_step()
+        st.rerun()
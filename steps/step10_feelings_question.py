@@ -0,0 +1,19 @@
+"""Step 10: talking about feelings with an AI (question)."""
+import streamlit as st
+
+from steps.common import next_step, show_page_image
+
+
+def render():
+    st.progress(48)
+    st.title("Emotions & Intelligences Artificielles")
+    show_page_image('emotions')
+    #st.markdown("<div class='css-card'>", unsafe_allow_html=True)
+    st.markdown("#### Avez-vous déjà parlé de vos sentiments avec une IA ?")
+    chatgpt_feelings = st.radio("", ["Oui", "Non", "Je ne sais pas"], horizontal=False)
+    st.markdown("</div>", unsafe_allow_html=True)
+
+    if st.button("Continuer ➡️"):
+        st.session_state.responses['ChatGPT_Feelings'] = chatgpt_feelings
+        next_step()
+        st.rerun()
@@ -0,0 +1,28 @@
+"""Step 11: talking about feelings with an AI, answers of the participant's group."""
+import streamlit as st
+
+from steps.charts import plot_donut
+from steps.common import get_survey_counts, next_step
+
+OPTIONS = ["Oui", "Non", "Je ne sais pas"]
+# Comptes du graphique, préparés en arrière-plan pendant les questions précédentes
+COUNTS = [('ChatGPT_Feelings', OPTIONS)]
+
+
+def render():
+    st.progress(60)
+    st.title("Émotions & IA")
+
+    user_role = st.session_state.responses['Category']
+
+    # --- NEW REAL DATA LOGIC ---
+    my_counts = get_survey_counts(user_role, 'ChatGPT_Feelings', OPTIONS)
+    #st.markdown("<div class='css-card'>", unsafe_allow_html=True)
+    fig_donut = plot_donut(st.session_state.responses['ChatGPT_Feelings'], OPTIONS, my_counts)
+    st.plotly_chart(fig_donut, use_container_width=True)
+    st.markdown("</div>", unsafe_allow_html=True)
+
+    if st.button("Continuer ➡️"):
+        next_step()
+        st.rerun()
+    # ---------------------------
@@ -0,0 +1,24 @@
+"""Step 12: AI concern scale (question)."""
+import streamlit as st
+
+from steps.common import next_step, show_page_image
+
+
+def render():
+    st.progress(66)
+    st.title("Préoccupation des Intelligence Artificielles")
+    show_page_image('ia')
+
+    st.markdown("#### Dans quelle mesure êtes-vous inquiété.e.s par les IA ?")
+    ai_concern_scale = st.select_slider("", options=list(range(1, 11)), value=5)
+    # Custom labels below the slider
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        st.write("**Je ne suis pas du tout inquiet.e.s par les IA**")
+    with col3:
+        st.write("**Je suis toujours inquiet.e.s par les IA**")
+
+    if st.button("Continuer ➡️"):
+        st.session_state.responses['AI_Concern_Scale'] = ai_concern_scale
+        next_step()
+        st.rerun()
@@ -0,0 +1,28 @@
+"""Step 13: AI concern items (question)."""
+import streamlit as st
+
+from steps.common import next_step, show_page_image
+
+
+def render():
+    st.progress(72)
+    st.title("Inquiétudes et Intelligences Artificielles")
+    show_page_image('ia')
+
+    st.markdown("#### Quels sont vos inquiétudes par rapport à l'IA ?")
+    st.caption("Plusieurs choix possibles")
+    ai_concern_items = st.multiselect("", ["Perte des capacités de réflexion critique", "Impact sur les générations futures", "Impact sur les industries artistiques et créatives", "Désinformation/mésinformation",
+                                     "Impact sur le marché du travail", "Impact sur l'environnement","Manque de confidentialité et de protection des données", "Je n'ai aucune inquiétude", "Autre"])
+
+    ai_other_text = ""
+    if "Autre" in ai_concern_items:
+        ai_other_text = st.text_input("Précisez pour 'Autre' :")
+    st.markdown("</div>", unsafe_allow_html=True)
+
+    if st.button("Continuer ➡️"):
+        final_purpose_list = [p for p in ai_concern_items if p != "Autre"]
+        if ai_other_text: final_purpose_list.append(ai_other_text)  # Just store text for wordcloud later
+
+        st.session_state.responses['AI_Concern_Items'] = ", ".join(final_purpose_list)
+        next_step()
+        st.rerun()
@@ -0,0 +1,34 @@
+"""Step 14: who should teach AI skills (question)."""
+import streamlit as st
+
+from steps.common import next_step, show_page_image
+
+
+def render():
+    st.progress(78)
+    st.title("Responsabilité & Intelligences Artificielles")
+    show_page_image('ia')
+
+    st.markdown("#### Selon vous, qui est le plus responsable de l'enseignement des compétences dans les IA ?")
+    st.caption("Plusieurs choix possibles")
+    ai_responsible_people = st.multiselect("", ["Moi-même",
+                                           "Mes proches (amis, frères, soeurs)",
+                                           "L'école (enseignants, bibliothécaires)",
+                                           "L'IA elle-même",
+                                           "Les grandes entreprise de la Tech ",
+                                           "Les parents / éducateurs",
+                                           "Des expert.e.s (chercheur.se.s)",
+                                           "Le gouvernement", "Autre"])
+
+    ai_other_text = ""
+    if "Autre" in ai_responsible_people:
+        ai_other_text = st.text_input("Précisez pour 'Autre' :")
+    st.markdown("</div>", unsafe_allow_html=True)
+
+    if st.button("Continuer ➡️"):
+        final_purpose_list = [p for p in ai_responsible_people if p != "Autre"]
+        if ai_other_text: final_purpose_list.append(ai_other_text)  # Just store text for wordcloud later
+
+        st.session_state.responses['AI_Responsible_People'] = ", ".join(final_purpose_list)
+        next_step()
+        st.rerun()
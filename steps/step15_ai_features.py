@@ -0,0 +1,19 @@
+"""Step 15: AI features wished (free text)."""
+import streamlit as st
+
+from steps.common import next_step, show_page_image
+
+
+def render():
+    st.progress(84)
+    st.title("Fonctionnalité & Intelligences Artificielles")
+    show_page_image('ia')
+    st.markdown("#### Quelle fonctionnalité aimeriez-vous implémenter dans l'IA ?")
+    ai_feature = st.text_input("Ecrivez toutes vos idées", key = "ai_feature")
+
+    st.markdown("</div>", unsafe_allow_html=True)
+
+    if st.button("Continuer ➡️"):
+        st.session_state.responses['AI_Feature'] = ai_feature
+        next_step()
+        st.rerun()
@@ -0,0 +1,31 @@
+"""Step 16: prevention campaign preferences (question)."""
+import streamlit as st
+
+from steps.common import next_step, show_page_image
+
+
+def render():
+    st.progress(90)
+    st.title("Prévention & Intelligences Artificielles")
+    show_page_image('ia')
+    st.markdown("#### Les campagnes de prévention sont trop sérieuses, parmi les éléments suivants, lesquels t’aideraient à mieux comprendre les informations sur la bonne utilisation et la sécurité des IA?")
+    st.caption("Plusieurs choix possibles")
+    ai_prevention_campaign = st.multiselect("", ["Des explications plus simples et claires",
+                                                "Des vidéos courtes ou des tutoriels",
+                                                "Des influenceurs/ambassadeurs qui en parlent",
+                                                "Des ateliers ou démonstrations en classe",
+                                                "Des illustrations (publicités nationales radio/tv/réseaux sociaux)",
+                                                "Autre"])
+
+    ai_other_text = ""
+    if "Autre" in ai_prevention_campaign:
+        ai_other_text = st.text_input("Précisez pour 'Autre' :", key="ai_other_text")
+    st.markdown("</div>", unsafe_allow_html=True)
+
+    if st.button("Continuer ➡️"):
+        final_purpose_list = [p for p in ai_prevention_campaign if p != "Autre"]
+        if ai_other_text: final_purpose_list.append(ai_other_text)  # Just store text for wordcloud later
+
+        st.session_state.responses['AI_Prevention_Campaign'] = ", ".join(final_purpose_list)
+        next_step()
+        st.rerun()
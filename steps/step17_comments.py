@@ -0,0 +1,19 @@
+"""Step 17: remarks and comments (free text)."""
+import streamlit as st
+
+from steps.common import next_step, show_page_image
+
+
+def render():
+    st.progress(96)
+    st.title("Exprimez-vous")
+    show_page_image('ia')
+    st.markdown("#### Laissez-nous vos remarques et commentaires :")
+    ai_comments = st.text_input("")
+
+    st.markdown("</div>", unsafe_allow_html=True)
+
+    if st.button("Continuer ➡️"):
+        st.session_state.responses['AI_Comments'] = ai_comments
+        next_step()
+        st.rerun()
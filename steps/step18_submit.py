@@ -0,0 +1,38 @@
+"""Step 18: submission of the answers."""
+from datetime import datetime
+
+import streamlit as st
+
+from steps.common import save_data_securely, next_step, show_page_image
+
+
+def render():
+    show_page_image('merci')
+
+    # Initialize a flag to track if data was already submitted
+    if 'data_submitted' not in st.session_state:
+        st.session_state.data_submitted = False
+
+    if not st.session_state.data_submitted:
+        if st.button("Envoyer mes réponses"):
+            with st.spinner("Envoi en cours..."):
+                #success = save_to_google_sheets(st.session_state.responses)
+
+                # Add timestamp
+                st.session_state.responses['Timestamp'] = datetime.now().isoformat()
+                success = save_data_securely(st.session_state.responses)
+                if success:
+                    st.session_state.data_submitted = True
+                    st.rerun()
+                else:
+                    st.error("Erreur de sauvegarde.")
+    else:
+        # Data has been submitted, show success message
+        st.success("Merci ! Vos réponses ont été enregistrées.")
+        st.balloons()
+        next_step()
+        st.rerun()
+
+        if st.button("Accéder à mes réponses"):
+            next_step()
+            st.rerun()
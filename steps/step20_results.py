@@ -0,0 +1,530 @@
+"""
+Step 20: results of the survey for an event or a period. Once the participant enters
+their pseudo, their own answers are highlighted in the charts.
+"""
+from datetime import date, timedelta
+
+import pandas as pd
+import streamlit as st
+
+from percentiles import build_percentile_service
+from results_engine import ADOLESCENTS, ADULTES, summarize_results
+from results_report import ReportMaterializer
+from snapshots import ROWS, SnapshotStore
+from steps.common import (TEXT_COLUMNS, USE_SQLITE, get_response_store, get_shared_cache, show_image_with_preview,
+                          swap_in_full_images)
+from text_index import TextIndex
+from text_tokens import add_token_columns, token_column
+from time_windows import ALL_RESPONSES, EVENTS, TimeWindow
+
+CUSTOM_PERIOD = "Période personnalisée"
+
+# region Charger les données
+SHEET_URL = "https://docs.google.com/spreadsheets/d/e/2PACX-1vSPTS9isgo2apuzJ0KIZlAaPFeuo4tKQX2ocfvo6iIeBPifyOACKlyzGb4tePNflmNDr8jgtze4wia1/pub?gid=0&single=true&output=csv"
+
+def download_published_results():
+    #SHEET_URL = "https://docs.google.com/spreadsheets/d/e/2PACX-1vRCbQDPet7-hUdVO0-CzfC3KrhHY6JbUO4UlMpUwbJJ_cp2LhqJSnX34jD-xqZcFAmI4FZZcEg9Wsuj/pub?output=csv"
+    # Le filtrage par date se fait ensuite, selon l'événement choisi (TimeWindow)
+    return add_token_columns(pd.read_csv(SHEET_URL), TEXT_COLUMNS)
+
+@st.cache_data(ttl=60)
+def load_local_published_results():
+    return download_published_results()
+
+def load_published_results():
+    """
+    Published answers, downloaded at most once a minute: by this process, or with a
+    shared cache by one instance of the app for all of them (one cache layer only, so
+    the data is never more than a minute old).
+    """
+    shared_cache = get_shared_cache()
+    if shared_cache is None:
+        return load_local_published_results()
+    return shared_cache.get_or_compute(('published_results', SHEET_URL), download_published_results, ttl=60)
+
+@st.cache_data(ttl=60)
+def load_local_results(window):
+    # Base locale : seules les lignes de la période sont lues (index sur Timestamp)
+    return add_token_columns(get_response_store().load(window), TEXT_COLUMNS)
+
+# Réponses de la période choisie
+def load_data_to_see_results(window):
+    if USE_SQLITE:
+        return load_local_results(window)
+    return window.filter(load_published_results())
+
+# Snapshots versionnés des résultats et artefacts qui en dérivent (un jeu par période)
+@st.cache_resource(max_entries=8)
+def get_results_snapshots(window):
+    return SnapshotStore()
+
+# Colonnes dont dépendent les statistiques de la page et les rapports matérialisés
+SUMMARY_COLUMNS = [ROWS, 'Category', 'Screen_Habit', 'AI_Concern_Scale', 'AI_Wordcloud_Input',
+                   token_column('AI_Wordcloud_Input'), 'AI_Prevention_Campaign']
+PERCENTILE_COLUMNS = ['AI_Concern_Scale', 'Category']
+REPORT_COLUMNS = SUMMARY_COLUMNS + ['Secret_Code']
+
+# Rapports et graphiques pré-rendus, partagés entre les sessions
+@st.cache_resource(max_entries=8)
+def get_report_materializer(window):
+    return ReportMaterializer(cache=get_shared_cache())
+
+# Index inversé des réponses libres, complété à chaque nouveau snapshot
+@st.cache_resource(max_entries=8)
+def get_text_index(window):
+    return TextIndex(TEXT_COLUMNS)
+# endregion
+
+
+# Fragment : choisir une question ou un mot ne relance que cette recherche
+@st.fragment
+def free_text_explorer(window, df):
+    st.subheader("🔎 Explorer les réponses libres")
+
+    text_index = get_text_index(window)
+    text_index.update(df)
+
+    text_column_labels = {
+        'AI_Wordcloud_Input': "Utilisations de l'IA",
+        'AI_Feature': "Fonctionnalités souhaitées",
+        'AI_Comments': "Remarques et commentaires",
+    }
+    group_emojis = {ADOLESCENTS: "🧑‍🎓", ADULTES: "👨‍👩‍👧‍👦"}
+
+    search_column = st.radio(
+        "Question :", [None] + [col for col in TEXT_COLUMNS if col in df.columns],
+        format_func=lambda col: "Toutes" if col is None else text_column_labels.get(col, col),
+        horizontal=True,
+    )
+    vocabulary = dict(text_index.vocabulary(search_column, top_n=50))
+
+    if vocabulary:
+        search_word = st.selectbox("Choisis un mot :", list(vocabulary),
+                                   format_func=lambda word: f"{word} ({vocabulary[word]} réponses)")
+
+        # Répartition par groupe des personnes ayant utilisé ce mot
+        word_split = text_index.group_split(search_word, search_column)
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("🧑‍🎓 Adolescents", word_split.get(ADOLESCENTS))
+        with col2:
+            st.metric("👨‍👩‍👧‍👦 Adultes", word_split.get(ADULTES))
+        with col3:
+            st.metric("📝 Total", word_split.total)
+
+        st.write(f"**💬 Réponses contenant « {search_word} » :**")
+        for group, text_col, answer in text_index.answers(search_word, search_column, limit=20):
+            st.write(f"- {group_emojis.get(group, '👤')} {answer} _({text_column_labels.get(text_col, text_col)})_")
+    else:
+        st.info("Pas encore de réponses libres à explorer.")
+
+
+# Fragment : saisir un pseudo ne relance que les résultats ci-dessous, pas le chargement
+# des données, la page ni les identifiants
+@st.fragment
+def personal_results(window, df, summary, materializer):
+    # region Section pour le code secret
+    st.subheader("🔒 Validation du pseudo")
+    secret_code = st.text_input("Entre ton pseudo :")
+
+    # Rapport du participant (pré-calculé en arrière-plan)
+    report = None
+    valid_code = False
+
+    if secret_code:
+        report = materializer.report(secret_code)
+        if report is not None:
+            st.success("Code secret valide! Tu peux voir tes résultats.")
+            valid_code = True
+        else:
+            st.error("Code secret invalide. Vérifie ton code et réessaye.")
+
+    # endregion
+
+    # region Graphique Likert pour les écrans avant de dormir
+    st.subheader("📱 Habitudes d'écrans avant le sommeil")
+
+    screen_habit_column = 'Screen_Habit'
+
+    if summary.screen_habit is not None:
+        # Afficher les statistiques
+        screen_counts = summary.screen_habit
+
+        st.write("**Répartition des réponses :**")
+        for answer, count in screen_counts.items:
+            percentage = (count / summary.n_rows) * 100
+            st.write(f"- **{answer}** : {count} personnes ({percentage:.1f}%)")
+
+        # Si un code valide est entré, afficher la réponse du participant
+        likert_chart = ('likert', None)
+        if valid_code:
+            st.info(f"🎯 **Ta réponse :** {report.screen_habit}")
+            likert_chart = report.likert_chart
+
+        # Afficher le graphique Likert
+        st.image(materializer.chart(likert_chart), use_container_width=True)
+
+        # Ajouter une légende si un participant est mis en évidence
+        if valid_code:
+            st.caption("🔴 **Barre avec bordure rouge** : Votre réponse")
+
+    else:
+        st.error(f"Colonne '{screen_habit_column}' non trouvée dans les données")
+        st.write("Colonnes disponibles :")
+        st.write(df.columns.tolist())
+
+    # endregion
+
+    # region Graphique pour les préoccupations liées à l'IA
+    st.subheader("🤖 Préoccupations concernant l'Intelligence Artificielle")
+
+    ai_concern_column = 'AI_Concern_Scale'
+    age_category_column = 'Category'  # Colonne qui distingue ados/adultes
+
+    if summary.concern is not None:
+
+        # Afficher les statistiques générales
+        concern = summary.concern
+
+        if concern.valid_count > 0:
+            st.write("**📊 Statistiques générales :**")
+            col1, col2 = st.columns(2)
+
+            with col1:
+                st.metric("Moyenne", f"{concern.mean:.1f}/10")
+            with col2:
+                st.metric("Réponses", concern.valid_count)
+
+            # Afficher la réponse du participant
+            scale_chart = ('scale', None)
+            if valid_code:
+                scale_chart = report.scale_chart
+                if report.concern_interpretation is not None:
+                    st.info(f"🎯 **Ta réponse :** {int(report.concern)}/10")
+
+                    # Interpréter la réponse
+                    st.write(f"**Interprétation :** {report.concern_interpretation}")
+
+                    # Position du participant (recherche binaire dans les réponses triées)
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        st.metric("Position", f"{report.concern_percentile:.0f}e percentile")
+                    if report.concern_group_percentile is not None:
+                        with col2:
+                            st.metric("Dans ton groupe", f"{report.concern_group_percentile:.0f}e percentile")
+
+            # Afficher le graphique principal
+            st.image(materializer.chart(scale_chart), use_container_width=True)
+
+            # Ajouter la légende si un participant est mis en évidence
+            if valid_code and report.concern is not None:
+                st.caption("🔴 **Barre avec bordure rouge** : Votre réponse")
+
+            # Comparaison par groupe d'âge
+            if age_category_column in df.columns:
+                st.subheader("📈 Comparaison Adolescents vs Adultes")
+
+                comparison_png = materializer.chart(('comparison',))
+                if comparison_png is not None:
+                    st.image(comparison_png, use_container_width=True)
+
+                    # Analyse comparative détaillée
+                    teen_stats = concern.stats_for(ADOLESCENTS)
+                    adult_stats = concern.stats_for(ADULTES)
+                    comparison_stats = [stats for stats in (teen_stats, adult_stats) if stats is not None]
+
+                    if len(comparison_stats) > 0:
+                        st.write("**🔍 Analyse comparative :**")
+                        for stats in comparison_stats:
+                            st.write(
+                                f"- **{stats.group}** : Moyenne de {stats.mean:.1f}/10 ± {stats.std:.1f} ({stats.count} réponses)")
+
+                        if len(comparison_stats) == 2:
+                            diff = abs(adult_stats.mean - teen_stats.mean)
+                            if diff > 1:
+                                st.write(
+                                    f"📊 **Différence notable** : {diff:.1f} points entre adolescents et adultes")
+                            else:
+                                st.write("📊 **Différence faible** entre adolescents et adultes")
+
+                            # Déterminer qui est plus préoccupé
+                            adult_mean = adult_stats.mean
+                            teen_mean = teen_stats.mean
+
+                            if adult_mean > teen_mean:
+                                st.write(
+                                    f"👨‍👩‍👧‍👦 Les **adultes** sont plus préoccupés que les **adolescents** ({adult_mean:.1f} vs {teen_mean:.1f})")
+                            elif teen_mean > adult_mean:
+                                st.write(
+                                    f"🧑‍🎓 Les **adolescents** sont plus préoccupés que les **adultes** ({teen_mean:.1f} vs {adult_mean:.1f})")
+                            else:
+                                st.write("⚖️ **Niveau de préoccupation similaire** entre les deux groupes")
+
+                else:
+                    st.warning("Données insuffisantes pour la comparaison par groupe d'âge")
+            else:
+                st.warning(f"Colonne de catégorie d'âge '{age_category_column}' non trouvée pour la comparaison")
+                st.write("Colonnes disponibles :")
+                st.write(
+                    [col for col in df.columns if
+                     'tu es' in col.lower() or 'âge' in col.lower() or 'age' in col.lower()])
+
+        else:
+            st.warning("Aucune réponse valide trouvée pour cette question")
+
+    else:
+        st.error(f"Colonne '{ai_concern_column}' non trouvée dans les données")
+        st.write("Colonnes disponibles contenant 'IA' ou similaire :")
+        ai_columns = [col for col in df.columns if
+                      'IA' in col.upper() or 'INTELLIGENCE' in col.upper() or 'PRÉOCCUP' in col.upper()]
+        if ai_columns:
+            st.write(ai_columns)
+        else:
+            st.write("Aucune colonne trouvée. Voici toutes les colonnes :")
+            st.write(df.columns.tolist())
+
+    # endregion
+
+    # region Word Cloud des fonctionnalités IA souhaitées
+    st.subheader("☁️ Fonctionnalités IA souhaitées - Nuages de mots")
+
+    ai_features_column = 'AI_Wordcloud_Input'
+
+    if summary.wordcloud is not None:
+
+        # Vérifier s'il y a des données
+        wordcloud_summary = summary.wordcloud
+
+        if wordcloud_summary.total > 0:
+            # Compter les réponses par groupe
+            adolescents_count = wordcloud_summary.respondents.get(ADOLESCENTS)
+            adultes_count = wordcloud_summary.respondents.get(ADULTES)
+
+            # Afficher les statistiques
+            st.write("**📊 Statistiques des réponses :**")
+            col1, col2, col3 = st.columns(3)
+
+            with col1:
+                st.metric("🧑‍🎓 Adolescents", adolescents_count)
+            with col2:
+                st.metric("👨‍👩‍👧‍👦 Adultes", adultes_count)
+            with col3:
+                st.metric("📝 Total", wordcloud_summary.total)
+
+            # Afficher les word clouds (aperçu tant que la version finale n'est pas prête)
+            wordclouds_shown = show_image_with_preview(materializer.chart_future(('wordclouds', 'preview')),
+                                                       materializer.chart_future(('wordclouds', 'full')))
+            if not wordclouds_shown:
+                st.warning("Aucun word cloud ne peut être généré - données textuelles insuffisantes")
+            else:
+                # Ajouter des explications
+                st.write("**💡 Comment lire ces nuages de mots :**")
+                st.write("- Plus un mot est **grand**, plus il apparaît fréquemment dans les réponses")
+                st.write("- Les couleurs **orange** représentent les réponses des adolescents")
+                st.write("- Les couleurs **bleues** représentent les réponses des adultes")
+
+                # Afficher quelques réponses exemples si le participant a un code valide
+                if valid_code and report.wordcloud_answer is not None:
+                    st.info(f"🎯 **Ta réponse :** {report.wordcloud_answer}")
+
+            # Optionnel: Afficher les réponses les plus fréquentes
+            st.subheader("🔤 Mots les plus fréquents")
+
+            col1, col2 = st.columns(2)
+
+            with col1:
+                if adolescents_count > 0:
+                    st.write("**🧑‍🎓 Top mots - Adolescents :**")
+                    top_words_ados = wordcloud_summary.top_words_for(ADOLESCENTS)
+                    for i, (word, count) in enumerate(top_words_ados, 1):
+                        st.write(f"{i}. **{word}** ({count} fois)")
+
+            with col2:
+                if adultes_count > 0:
+                    st.write("**👨‍👩‍👧‍👦 Top mots - Adultes :**")
+                    top_words_adultes = wordcloud_summary.top_words_for(ADULTES)
+                    for i, (word, count) in enumerate(top_words_adultes, 1):
+                        st.write(f"{i}. **{word}** ({count} fois)")
+
+        else:
+            st.warning("Aucune réponse valide trouvée pour cette question")
+    else:
+        st.error(f"Colonnes requises non trouvées :")
+        if ai_features_column not in df.columns:
+            st.write(f"- '{ai_features_column}' non trouvée")
+        if age_category_column not in df.columns:
+            st.write(f"- '{age_category_column}' non trouvée")
+
+        st.write("Colonnes disponibles :")
+        st.write(
+            [col for col in df.columns if
+             'fonctionnalité' in col.lower() or 'implémenter' in col.lower() or 'IA' in col])
+
+    # endregion
+
+    # region Recherche d'un mot dans les réponses libres
+    free_text_explorer(window, df)
+    # endregion
+
+    # region Graphique en donut des préférences de campagnes de prévention
+    st.subheader("🍩 Préférences pour les campagnes de prévention IA")
+    prevention_column = 'AI_Prevention_Campaign'
+
+    if summary.prevention is not None:
+        # Obtenir les comptes pour chaque groupe
+        adolescents_counts = summary.prevention_for(ADOLESCENTS)
+        adultes_counts = summary.prevention_for(ADULTES)
+
+        if adolescents_counts or adultes_counts:
+            # Afficher les statistiques générales
+            total_adolescents = adolescents_counts.total
+            total_adultes = adultes_counts.total
+
+            st.write("**📊 Statistiques des réponses :**")
+            col1, col2, col3 = st.columns(3)
+
+            with col1:
+                st.metric("🧑‍🎓 Réponses Adolescents", total_adolescents)
+            with col2:
+                st.metric("👨‍👩‍👧‍👦 Réponses Adultes", total_adultes)
+            with col3:
+                st.metric("📝 Total", total_adolescents + total_adultes)
+
+            # Afficher les graphiques
+            donuts_png = materializer.chart(('donuts',))
+            if donuts_png is not None:
+                st.image(donuts_png, use_container_width=True)
+
+                # Ajouter la réponse du participant si disponible
+                if valid_code and report.prevention_answer is not None:
+                    st.info(f"🎯 **Ta réponse :** {report.prevention_answer}")
+
+                # Afficher les détails des réponses les plus populaires
+                st.subheader("🏆 Réponses les plus populaires")
+
+                col1, col2 = st.columns(2)
+
+                with col1:
+                    if adolescents_counts:
+                        st.write("**🧑‍🎓 Top 3- Adolescents :**")
+                        for i, (answer, count) in enumerate(adolescents_counts.most_common(3), 1):
+                            percentage = (count / total_adolescents) * 100
+                            st.write(f"{i}. **{answer}** - {count} fois ({percentage:.1f}%)")
+
+                with col2:
+                    if adultes_counts:
+                        st.write("**👨‍👩‍👧‍👦 Top 3 - Adultes :**")
+                        for i, (answer, count) in enumerate(adultes_counts.most_common(3), 1):
+                            percentage = (count / total_adultes) * 100
+                            st.write(f"{i}. **{answer}** - {count} fois ({percentage:.1f}%)")
+
+                # Analyse comparative
+                if adolescents_counts and adultes_counts:
+                    st.subheader("🔍 Analyse comparative")
+
+                    # Trouver les réponses communes
+                    common_answers = set(adolescents_counts.labels) & set(adultes_counts.labels)
+                    if common_answers:
+                        st.write("**🤝 Réponses communes aux deux groupes :**")
+                        for answer in common_answers:
+                            ado_count = adolescents_counts[answer]
+                            adult_count = adultes_counts[answer]
+                            ado_pct = (ado_count / total_adolescents) * 100
+                            adult_pct = (adult_count / total_adultes) * 100
+
+                            if abs(ado_pct - adult_pct) < 5:
+                                trend = "📊 Similaire"
+                            elif ado_pct > adult_pct:
+                                trend = "🧑‍🎓 Plus populaire chez les ados"
+                            else:
+                                trend = "👨‍👩‍👧‍👦 Plus populaire chez les adultes"
+
+                            st.write(f"- **{answer}** - {trend}")
+                            st.write(
+                                f"  - Ados: {ado_count} ({ado_pct:.1f}%) | Adultes: {adult_count} ({adult_pct:.1f}%)")
+
+                    # Réponses uniques à chaque groupe
+                    ado_only = set(adolescents_counts.labels) - set(adultes_counts.labels)
+                    adult_only = set(adultes_counts.labels) - set(adolescents_counts.labels)
+
+                    if ado_only:
+                        st.write("**🧑‍🎓 Réponses spécifiques aux adolescents :**")
+                        for answer in ado_only:
+                            count = adolescents_counts[answer]
+                            pct = (count / total_adolescents) * 100
+                            st.write(f"- **{answer}** ({count} - {pct:.1f}%)")
+
+                    if adult_only:
+                        st.write("**👨‍👩‍👧‍👦 Réponses spécifiques aux adultes :**")
+                        for answer in adult_only:
+                            count = adultes_counts[answer]
+                            pct = (count / total_adultes) * 100
+                            st.write(f"- **{answer}** ({count} - {pct:.1f}%)")
+
+            else:
+                st.warning("Impossible de créer les graphiques - données insuffisantes")
+
+        else:
+            st.warning("Aucune réponse valide trouvée pour cette question")
+
+    else:
+        st.error("Colonnes requises non trouvées :")
+        if prevention_column not in df.columns:
+            st.write(f"- Question sur les campagnes de prévention non trouvée")
+            # Chercher des colonnes similaires
+            similar_cols = [col for col in df.columns if
+                            'campagne' in col.lower() or 'prévention' in col.lower() or 'austère' in col.lower()]
+            if similar_cols:
+                st.write("Colonnes similaires trouvées :")
+                st.write(similar_cols)
+
+        if age_category_column not in df.columns:
+            st.write(f"- Colonne de catégorie d'âge '{age_category_column}' non trouvée")
+
+    # endregion
+
+    # Les aperçus affichés dans le fragment sont remplacés à la fin de son exécution
+    swap_in_full_images()
+
+
+def render():
+    st.title("Résumé de vos réponses")
+    st.markdown("### Voici un aperçu de ce que vous avez répondu :")
+    st.markdown("Cette page est en cours de construction.")
+
+    # region Choix de l'événement (ou d'une période)
+    period = st.selectbox("Événement", [ALL_RESPONSES.label, *EVENTS, CUSTOM_PERIOD])
+    if period == CUSTOM_PERIOD:
+        today = date.today()
+        days = st.date_input("Période", value=(today - timedelta(days=7), today), format="DD.MM.YYYY")
+        # Tant qu'une seule date est choisie, la période se limite à ce jour
+        window = TimeWindow.between_days(days[0], days[-1]) if days else ALL_RESPONSES
+    else:
+        window = EVENTS.get(period, ALL_RESPONSES)
+    # endregion
+
+    # region Charger les données et afficher les noms des colonnes
+    results_snapshots = get_results_snapshots(window)
+    snapshot = results_snapshots.publish(load_data_to_see_results(window))
+    df = snapshot.data
+    # Période sans réponse : seuls les résultats sont sautés, le bouton « Terminer » reste affiché
+    if df.empty:
+        st.info(f"Aucune réponse pour cette période ({window.label}).")
+    else:
+        # Toutes les statistiques de la page, recalculées seulement si leurs colonnes changent
+        summary = results_snapshots.derived(snapshot, 'results_summary', SUMMARY_COLUMNS, summarize_results)
+        # Index des percentiles (trié une fois par version des colonnes)
+        percentiles = results_snapshots.derived(
+            snapshot, 'concern_percentiles', PERCENTILE_COLUMNS,
+            lambda data: build_percentile_service(data, ['AI_Concern_Scale'], 'Category'))
+
+        materializer = get_report_materializer(window)
+        materializer.refresh(snapshot.content_key(REPORT_COLUMNS), df, summary, percentiles)
+
+        personal_results(window, df, summary, materializer)
+    # endregion
+
+    if st.button("Terminer"):
+        st.session_state.step = 1
+        st.session_state.responses = {}
+        st.rerun()
@@ -0,0 +1,299 @@
+"""
+Local journal of the submitted answers, resent to the response store until it has them.
+
+With the Google Sheets backend, a submission is a network request that may still be
+queued in the ``SheetsGateway`` (quota, slow network), or fail, after the participant
+was thanked: the answers were lost. ``SubmissionJournal.submit`` first appends the row
+to a JSON Lines file and returns once it is on disk, then queues the write; the row is
+confirmed in the journal once the store has it.
+
+Records are written by one thread, which syncs the file once for all the records queued
+while the previous sync ran (group commit): a burst of submissions costs one ``fsync``,
+not one per participant. Confirmations are not synced: a lost mark only means the row
+is checked again. Every ``compact_after`` confirmations, the same thread rewrites the
+file with the unconfirmed rows only.
+
+Each process writes its own file in the journal directory and holds an exclusive
+``flock`` on it while it runs, so the workers of one host never write to, or resend the
+rows of, each other's journals. A file nobody holds is the journal of a process that
+died: the next worker to see it adopts its unconfirmed rows and deletes it.
+``start_replay`` resends in a background thread, every ``interval`` seconds, the
+unconfirmed rows whose write is not under way (adopted, or whose write failed) and whose
+pseudo is not in the store yet, checked against one read of the store per pass. A row
+rejected for a reason that retrying will not fix is parked: it stays in the journal, to
+be looked at, and is only tried again by the next process.
+"""
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from pathlib import Path
+
+from response_store import WritePendingError
+from sheets_gateway import is_transient_error
+
+logger = logging.getLogger(__name__)
+
+
+def _try_lock(file):
+    """Takes an exclusive ``flock`` on ``file`` without waiting; False if another process holds it."""
+    import fcntl
+
+    try:
+        fcntl.flock(file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return False
+    return True
+
+
+class SubmissionJournal:
+    """Append-only journal of the submissions of this process, in ``directory``."""
+
+    def __init__(self, directory, compact_after=200):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.path = self.directory / f"{os.getpid()}-{uuid.uuid4().hex[:8]}.jsonl"
+        self.compact_after = compact_after
+        self.last_error = None
+        self._lock = threading.Lock()
+        self._queued = threading.Condition(self._lock)
+        self._queue = []  # (entry, Future or None if it does not need to be synced)
+        self._pending = {}  # id -> row recorded and not confirmed
+        self._sending = set()  # ids of the rows whose write is under way
+        self._parked = {}  # id -> error of the rows the store rejected
+        self._stats = {'recorded': 0, 'confirmed': 0, 'syncs': 0, 'adopted': 0, 'replayed': 0, 'compactions': 0}
+        # État du fichier, tenu par le thread d'écriture : lignes sans confirmation et confirmations écrites
+        self._in_file = {}
+        self._done_lines = 0
+        self._file = self._create({})
+        self._writer = threading.Thread(target=self._write_loop, name="submission-journal", daemon=True)
+        self._writer.start()
+        self.adopt_orphans()
+
+    # region Journal files
+    @staticmethod
+    def _read(file):
+        """Rows recorded and not confirmed, in order. A torn last line (crash while writing) is skipped."""
+        pending = {}
+        for line in file:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if 'done' in entry:
+                pending.pop(entry['done'], None)
+            else:
+                pending[entry['id']] = entry['row']
+        return pending
+
+    def _create(self, rows):
+        """
+        Writes ``rows`` to a new file, synced and locked, then gives it the journal's name
+        and returns it: the other workers never see the journal without its lock.
+        """
+        new = self.path.with_suffix('.new')
+        file = open(new, 'wb')
+        _try_lock(file)
+        file.write(b''.join(self._line({'id': entry_id, 'row': row}) for entry_id, row in rows.items()))
+        file.flush()
+        os.fsync(file.fileno())
+        os.replace(new, self.path)
+        return file
+
+    def _compact(self):
+        """Rewrites the journal with the unconfirmed rows only (writer thread)."""
+        try:
+            file = self._create(self._in_file)
+        except OSError as error:
+            logger.warning("Submission journal %s not compacted: %r", self.path, error)
+            return
+        self._file.close()
+        self._file = file
+        self._done_lines = 0
+        with self._lock:
+            self._stats['compactions'] += 1
+
+    def _adopt(self, path):
+        """Moves the unconfirmed rows of the journal ``path`` into this one, if no process holds it."""
+        try:
+            orphan = open(path, 'rb')
+        except FileNotFoundError:
+            return 0
+        with orphan:
+            # Tenu par un worker vivant, ou déjà adopté (et supprimé) par un autre pendant qu'on l'ouvrait
+            if not _try_lock(orphan) or not path.exists() or os.stat(path).st_ino != os.fstat(orphan.fileno()).st_ino:
+                return 0
+            rows = self._read(orphan)
+            for entry_id, row in rows.items():
+                self._enqueue({'id': entry_id, 'row': row}, synced=True).result()
+            with self._lock:
+                self._pending.update(rows)
+                self._stats['adopted'] += len(rows)
+            os.unlink(path)
+        return len(rows)
+
+    def adopt_orphans(self):
+        """Adopts the journals left by the processes that died. Returns the number of rows adopted."""
+        return sum(self._adopt(path) for path in sorted(self.directory.glob('*.jsonl')) if path != self.path)
+
+    @staticmethod
+    def _line(entry):
+        return (json.dumps(entry, ensure_ascii=False, default=str) + '\n').encode()
+
+    def _enqueue(self, entry, synced):
+        future = Future() if synced else None
+        with self._lock:
+            self._queue.append((entry, future))
+            self._queued.notify()
+        return future
+
+    def _write_loop(self):
+        while True:
+            with self._lock:
+                while not self._queue:
+                    self._queued.wait()
+                batch, self._queue = self._queue, []
+            futures = [future for _, future in batch if future is not None]
+            try:
+                self._file.write(b''.join(self._line(entry) for entry, _ in batch))
+                self._file.flush()
+                if futures:
+                    os.fsync(self._file.fileno())
+            except OSError as error:
+                self.last_error = error
+                for future in futures:
+                    future.set_exception(error)
+                continue
+            for entry, _ in batch:
+                if 'done' in entry:
+                    self._in_file.pop(entry['done'], None)
+                    self._done_lines += 1
+                else:
+                    self._in_file[entry['id']] = entry['row']
+            if self._done_lines >= self.compact_after:
+                self._compact()
+            with self._lock:
+                self._stats['syncs'] += bool(futures)
+            for future in futures:
+                future.set_result(None)
+    # endregion
+
+    def record(self, row, sending=False):
+        """
+        Appends ``row`` to the journal and returns its id once it is synced to disk. With
+        ``sending``, its write is under way and ``replay`` leaves it alone.
+        """
+        entry_id = uuid.uuid4().hex
+        self._enqueue({'id': entry_id, 'row': row}, synced=True).result()
+        with self._lock:
+            self._pending[entry_id] = row
+            if sending:
+                self._sending.add(entry_id)
+            self._stats['recorded'] += 1
+        return entry_id
+
+    def confirm(self, entry_id):
+        """Marks a row as saved in the store (or never to be saved, e.g. a pseudo already taken)."""
+        self._enqueue({'done': entry_id}, synced=False)
+        with self._lock:
+            self._pending.pop(entry_id, None)
+            self._sending.discard(entry_id)
+            self._stats['confirmed'] += 1
+
+    def _failed(self, entry_id, error):
+        """Leaves a row whose write failed to ``replay``, or parks it if retrying cannot help."""
+        self.last_error = error
+        with self._lock:
+            self._sending.discard(entry_id)
+            if not is_transient_error(error):
+                self._parked[entry_id] = error
+        if is_transient_error(error):
+            logger.warning("Submission %s not saved, it will be sent again: %r", entry_id, error)
+        else:
+            logger.error("Submission %s rejected by the store, kept in %s: %r", entry_id, self.path, error)
+
+    def submit(self, store, row):
+        """
+        Records ``row``, then queues its write to ``store`` (a ``SheetsStore``) without
+        waiting for it. Returns the id of the row once it is on disk.
+        """
+        entry_id = self.record(row, sending=True)
+        try:
+            written = store.append_async(row)
+        except Exception as error:
+            self._failed(entry_id, error)
+            return entry_id
+        written.add_done_callback(
+            lambda done: self.confirm(entry_id) if done.exception() is None else self._failed(entry_id, done.exception()))
+        return entry_id
+
+    def pending(self):
+        """(id, row) of the rows recorded and not confirmed yet."""
+        with self._lock:
+            return list(self._pending.items())
+
+    @staticmethod
+    def _append(store, row):
+        try:
+            store.append(row)
+        except WritePendingError as pending:
+            # Toujours en file d'attente : on attend son envoi plutôt que de la renvoyer
+            pending.future.result()
+
+    def replay(self, store):
+        """
+        Appends to ``store`` the unconfirmed rows whose write is not under way, unless
+        parked or their pseudo is in the store already, and confirms them. Returns the
+        number of rows appended. A transient error stops the pass, to be retried.
+        """
+        with self._lock:
+            waiting = [(entry_id, row) for entry_id, row in self._pending.items()
+                       if entry_id not in self._sending and entry_id not in self._parked]
+        if not waiting:
+            return 0
+        # Une seule lecture de la feuille par passage, quel que soit le nombre de lignes
+        taken = store.pseudos()
+        appended = 0
+        for entry_id, row in waiting:
+            pseudo = str(row.get('Secret_Code') or '').upper()
+            if not (pseudo and pseudo in taken):
+                try:
+                    self._append(store, row)
+                except Exception as error:
+                    if is_transient_error(error):
+                        raise
+                    self._failed(entry_id, error)
+                    continue
+                taken.add(pseudo)
+                appended += 1
+            self.confirm(entry_id)
+        with self._lock:
+            self._stats['replayed'] += appended
+        return appended
+
+    def start_replay(self, store, interval=60):
+        """
+        Adopts the orphaned journals and resends their rows and the failed writes of this
+        process in a background thread, every ``interval`` seconds while the app runs.
+        """
+        def run():
+            while True:
+                try:
+                    self.adopt_orphans()
+                    self.replay(store)
+                    self.last_error = None
+                except Exception as error:
+                    self.last_error = error
+                    logger.warning("Submission replay failed, retrying in %d s: %r", interval, error)
+                time.sleep(interval)
+
+        threading.Thread(target=run, name="submission-replay", daemon=True).start()
+        return self
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, pending=len(self._pending), sending=len(self._sending),
+                        parked=len(self._parked))
@@ -0,0 +1,384 @@
+"""
+Bulk import and export of survey snapshots.
+
+Copies the answers between the Google Sheet, CSV files (or the published CSV), Parquet
+files and the local SQLite store of ``response_store``, in batches, without going
+through the app::
+
+    python survey_transfer.py export.csv reponses.db
+    python survey_transfer.py "sheets://<sheet_id>/Reponses" historique.parquet
+    python survey_transfer.py ancien_formulaire.csv reponses.db --form-headers
+
+``--form-headers`` renames the questions of the old Google Form export (used by
+``cite_des_metiers_app.py``) to the columns of the app (``Secret_Code``, ``Category``...).
+Timestamps are written in ISO format, like the ones saved by the app. Rows imported into
+the SQLite store are marked as already mirrored, unless ``--queue-mirror`` is given.
+
+``--event`` or ``--since`` / ``--until`` only copy the answers of a time window (read
+from the timestamp index of a SQLite store, or from the matching partitions of a Parquet
+dataset). ``--partition-by-day`` writes a Parquet dataset with one ``day=YYYY-MM-DD``
+partition per day::
+
+    python survey_transfer.py reponses.db historique/ --partition-by-day
+    python survey_transfer.py historique/ cite_2025.csv --event "Cité des métiers 2025"
+
+Parquet files and datasets need ``pyarrow`` (``pip install pyarrow``), which the app does not.
+"""
+import argparse
+import importlib.util
+import json
+import os
+import sys
+import time
+import tomllib
+
+import pandas as pd
+
+from response_store import SheetsStore, SQLiteStore
+from time_windows import ALL_RESPONSES, DAY_PARTITION, EVENTS, day_partitions, parse_timestamps, window_from_args
+
+DEFAULT_BATCH_SIZE = 1000
+SHEETS_SCHEME = 'sheets://'
+SQLITE_SUFFIXES = ('.db', '.sqlite', '.sqlite3')
+NUMERIC_COLUMNS = ['AI_Benefit_Scale', 'AI_Concern_Scale']
+
+# Questions de l'ancien formulaire Google -> colonnes de l'app
+FORM_HEADERS = {
+    "Choisis ton code secret": 'Secret_Code',
+    "Tu es :": 'Category',
+    "As-tu l’habitude de regarder des écrans avant de dormir?": 'Screen_Habit',
+    "Dans quelle mesure êtes-vous préoccupé par les IA ?": 'AI_Concern_Scale',
+    "Quelle fonctionnalité aimeriez-vous implémenter dans l'IA ?": 'AI_Feature',
+    "Les campagnes de prévention sont souvent austères, parmi les éléments suivants, lesquels t’aideraient à "
+    "mieux comprendre les informations sur la bonne utilisation et la sécurité des IA? ": 'AI_Prevention_Campaign',
+    "Horodateur": 'Timestamp',
+}
+
+
+def _header_key(header):
+    """Headers are matched without case, surrounding spaces nor typographic apostrophes."""
+    return str(header).replace('’', "'").strip().casefold()
+
+
+def header_mapping(columns, extra_mapping=None, form_headers=False):
+    """Renaming of ``columns``: the old form questions (if ``form_headers``), then ``extra_mapping``."""
+    known = {}
+    if form_headers:
+        known.update({_header_key(old): new for old, new in FORM_HEADERS.items()})
+    known.update({_header_key(old): new for old, new in (extra_mapping or {}).items()})
+    return {col: known[_header_key(col)] for col in columns if _header_key(col) in known}
+
+
+def iso_timestamps(values):
+    """Timestamps of the form export ('11/19/2025 14:03:00') or ISO ones, as ISO strings."""
+    parsed = parse_timestamps(values)
+    # Valeurs illisibles conservées telles quelles
+    return parsed.map(lambda value: value.isoformat() if pd.notna(value) else None).where(parsed.notna(), values)
+
+
+def normalize_batch(batch, mapping):
+    """Renames the columns of a batch and normalizes its timestamps and numeric answers."""
+    batch = batch.rename(columns=mapping)
+    if 'Timestamp' in batch.columns:
+        batch['Timestamp'] = iso_timestamps(batch['Timestamp'])
+    for col in NUMERIC_COLUMNS:
+        if col in batch.columns:
+            batch[col] = pd.to_numeric(batch[col], errors='coerce').astype('Int64')
+    return batch
+
+
+def _records(batch):
+    """Rows of a batch as dicts of plain Python values (None for missing answers)."""
+    return batch.astype(object).where(batch.notna(), None).to_dict('records')
+
+
+# region Sources
+def _service_account_info(credentials_path):
+    if credentials_path.endswith('.json'):
+        with open(credentials_path, encoding='utf-8') as file:
+            return json.load(file)
+    with open(credentials_path, 'rb') as file:
+        return tomllib.load(file)['gdrive_service_account']
+
+
+def _sheets_store(uri, credentials_path):
+    import gspread
+    from google.oauth2.service_account import Credentials
+
+    sheet_id, _, worksheet_name = uri[len(SHEETS_SCHEME):].partition('/')
+    credentials = Credentials.from_service_account_info(
+        _service_account_info(credentials_path),
+        scopes=["https://www.googleapis.com/auth/spreadsheets"]
+    )
+    return SheetsStore(gspread.authorize(credentials), sheet_id, worksheet_name or 'Reponses')
+
+
+def _is_sqlite(location):
+    return location.lower().endswith(SQLITE_SUFFIXES)
+
+
+def _is_parquet(location):
+    return location.lower().endswith('.parquet')
+
+
+def _is_dataset(location):
+    return os.path.isdir(location)
+
+
+def _require_pyarrow():
+    """Parquet files need pyarrow, which the app itself does not use."""
+    if importlib.util.find_spec('pyarrow') is None:
+        raise ImportError("Les fichiers Parquet demandent la bibliothèque 'pyarrow' : `pip install pyarrow`")
+
+
+def iter_sheet_batches(store, batch_size):
+    """Rows of a worksheet, read ``batch_size`` rows per request."""
+    worksheet = store.worksheet()
+    header = store.header()
+    start = 2
+    while True:
+        rows_range = f"{start}:{start + batch_size - 1}"
+        values = store.gateway.read(
+            store.request_key(rows_range),
+            lambda: worksheet.get_values(rows_range, value_render_option='UNFORMATTED_VALUE'))
+        if not values:
+            return
+        rows = [row + [''] * (len(header) - len(row)) for row in values]
+        yield pd.DataFrame([row[:len(header)] for row in rows], columns=header).replace('', None)
+        if len(values) < batch_size:
+            return
+        start += batch_size
+
+
+def iter_dataset_batches(root, batch_size, window):
+    """Rows of a day-partitioned Parquet dataset, reading only the partitions of ``window``."""
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+
+    partitioning = ds.partitioning(pa.schema([(DAY_PARTITION, pa.string())]), flavor='hive')
+    dataset = ds.dataset(root, format='parquet', partitioning=partitioning)
+    conditions = window.partition_filter()
+    expression = pq.filters_to_expression(conditions) if conditions else None
+    for record_batch in dataset.to_batches(filter=expression, batch_size=batch_size):
+        yield record_batch.to_pandas().drop(columns=DAY_PARTITION)
+
+
+def iter_batches(location, batch_size, credentials_path=None, window=ALL_RESPONSES):
+    """
+    Dataframes of at most ``batch_size`` rows read from ``location``. Only SQLite stores and
+    Parquet datasets skip the rows outside ``window``; the caller still filters the batches.
+    """
+    if location.startswith(SHEETS_SCHEME):
+        yield from iter_sheet_batches(_sheets_store(location, credentials_path), batch_size)
+    elif _is_sqlite(location):
+        yield from SQLiteStore(location).iter_batches(batch_size, window)
+    elif _is_dataset(location):
+        _require_pyarrow()
+        yield from iter_dataset_batches(location, batch_size, window)
+    elif _is_parquet(location):
+        _require_pyarrow()
+        import pyarrow.parquet as pq
+        for record_batch in pq.ParquetFile(location).iter_batches(batch_size=batch_size):
+            yield record_batch.to_pandas()
+    else:
+        # Fichier CSV ou CSV publié (URL)
+        yield from pd.read_csv(location, chunksize=batch_size)
+# endregion
+
+
+# region Destinations
+class _CsvWriter:
+    def __init__(self, path):
+        self.path = path
+        self.columns = None
+
+    def write(self, batch):
+        if self.columns is None:
+            self.columns = list(batch.columns)
+            batch.to_csv(self.path, index=False)
+        else:
+            batch.reindex(columns=self.columns).to_csv(self.path, mode='a', header=False, index=False)
+        return len(batch)
+
+    def close(self):
+        pass
+
+
+def _parquet_table(batch, schema=None):
+    import pyarrow as pa
+
+    if schema is not None:
+        batch = batch.reindex(columns=schema.names)
+    # Texte partout sauf les échelles, pour un schéma stable d'un lot à l'autre
+    batch = batch.astype({col: 'string' for col in batch.columns if col not in NUMERIC_COLUMNS})
+    return pa.Table.from_pandas(batch, schema=schema, preserve_index=False)
+
+
+class _ParquetWriter:
+    def __init__(self, path):
+        self.path = path
+        self._writer = None
+
+    def write(self, batch):
+        import pyarrow.parquet as pq
+
+        table = _parquet_table(batch, self._writer.schema if self._writer is not None else None)
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self.path, table.schema)
+        self._writer.write_table(table)
+        return len(batch)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+class _PartitionedParquetWriter:
+    """Parquet dataset with one ``day=YYYY-MM-DD`` directory per day of answers."""
+
+    def __init__(self, root):
+        self.root = root
+        self._schema = None
+        self._batches = 0
+
+    def write(self, batch):
+        import pyarrow.parquet as pq
+
+        batch = batch.assign(**{DAY_PARTITION: day_partitions(batch['Timestamp'])})
+        table = _parquet_table(batch, self._schema)
+        self._schema = table.schema
+        pq.write_to_dataset(table, self.root, partition_cols=[DAY_PARTITION],
+                            basename_template=f"part-{self._batches}-{{i}}.parquet")
+        self._batches += 1
+        return len(batch)
+
+    def close(self):
+        pass
+
+
+class _SQLiteWriter:
+    def __init__(self, path, mirrored):
+        self.store = SQLiteStore(path)
+        self.mirrored = mirrored
+
+    def write(self, batch):
+        return self.store.append_many(_records(batch), mirrored=self.mirrored)
+
+    def close(self):
+        pass
+
+
+class _SheetsWriter:
+    def __init__(self, store):
+        self.store = store
+        self.columns = None
+
+    def write(self, batch):
+        if self.columns is None:
+            self.columns = self.store.header()
+            if not self.columns:
+                self.columns = list(batch.columns)
+                worksheet = self.store.worksheet()
+                self.store.gateway.write(lambda: worksheet.append_row(self.columns)).result()
+            ignored = [col for col in batch.columns if col not in self.columns]
+            if ignored:
+                print(f"Colonnes absentes de la feuille, ignorées : {ignored}", file=sys.stderr)
+        return self.store.append_many(_records(batch), self.columns)
+
+    def close(self):
+        pass
+
+
+def open_writer(location, credentials_path=None, mirrored=True, partition_by_day=False):
+    """Writer of batches to ``location``; ``write`` returns the number of rows written."""
+    if partition_by_day:
+        _require_pyarrow()
+        return _PartitionedParquetWriter(location)
+    if location.startswith(SHEETS_SCHEME):
+        return _SheetsWriter(_sheets_store(location, credentials_path))
+    if _is_sqlite(location):
+        return _SQLiteWriter(location, mirrored)
+    if _is_parquet(location):
+        _require_pyarrow()
+        return _ParquetWriter(location)
+    return _CsvWriter(location)
+# endregion
+
+
+def transfer(source, destination, batch_size=DEFAULT_BATCH_SIZE, form_headers=False, extra_mapping=None,
+             credentials_path=None, mirrored=True, window=ALL_RESPONSES, partition_by_day=False):
+    """
+    Copies the rows of ``source`` inside ``window`` to ``destination`` and returns
+    (rows read, rows written).
+    """
+    read = written = 0
+    mapping = None
+    writer = open_writer(destination, credentials_path, mirrored, partition_by_day)
+    try:
+        for batch in iter_batches(source, batch_size, credentials_path, window):
+            if mapping is None:
+                mapping = header_mapping(batch.columns, extra_mapping, form_headers)
+            batch = window.filter(normalize_batch(batch, mapping))
+            if batch.empty:
+                continue
+            read += len(batch)
+            written += writer.write(batch)
+    finally:
+        writer.close()
+    return read, written
+
+
+def _parse_mapping(pairs):
+    mapping = {}
+    for pair in pairs:
+        old, separator, new = pair.rpartition('=')
+        if not separator or not old:
+            raise argparse.ArgumentTypeError(f"Correspondance invalide : {pair!r} (attendu : 'Ancien titre=Colonne')")
+        mapping[old] = new
+    return mapping
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import / export en masse des réponses au questionnaire.")
+    parser.add_argument('source', help="sheets://<sheet_id>/<onglet>, fichier .csv (ou URL), .parquet, .db "
+                                       "ou dossier d'un export partitionné par jour")
+    parser.add_argument('destination', help="sheets://<sheet_id>/<onglet>, fichier .csv, .parquet ou .db")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help="lignes par lot")
+    parser.add_argument('--form-headers', action='store_true',
+                        help="renommer les questions de l'ancien formulaire Google en colonnes de l'app")
+    parser.add_argument('--map', action='append', default=[], metavar="ANCIEN=NOUVEAU",
+                        help="renommer une colonne (option répétable)")
+    parser.add_argument('--credentials', default='.streamlit/secrets.toml',
+                        help="clé du compte de service (.json) ou secrets.toml, pour sheets://")
+    parser.add_argument('--queue-mirror', action='store_true',
+                        help="copier aussi vers la feuille les lignes importées dans la base SQLite")
+    parser.add_argument('--event', choices=list(EVENTS), help="ne copier que les réponses d'un événement")
+    parser.add_argument('--since', metavar="AAAA-MM-JJ", help="ne copier que les réponses depuis ce jour (inclus)")
+    parser.add_argument('--until', metavar="AAAA-MM-JJ", help="ne copier que les réponses jusqu'à ce jour (inclus)")
+    parser.add_argument('--partition-by-day', action='store_true',
+                        help="écrire un dossier Parquet partitionné par jour (day=AAAA-MM-JJ)")
+    args = parser.parse_args(argv)
+
+    if args.event and (args.since or args.until):
+        parser.error("--event ne peut pas être combiné avec --since / --until")
+    try:
+        window = window_from_args(args.event, args.since, args.until)
+    except ValueError as error:
+        parser.error(f"Date invalide : {error}")
+
+    try:
+        extra_mapping = _parse_mapping(args.map)
+    except argparse.ArgumentTypeError as error:
+        parser.error(str(error))
+
+    start = time.perf_counter()
+    read, written = transfer(args.source, args.destination, args.batch_size, args.form_headers, extra_mapping,
+                             args.credentials, mirrored=not args.queue_mirror, window=window,
+                             partition_by_day=args.partition_by_day)
+    print(f"{read} lignes lues, {written} écrites dans {args.destination} en {time.perf_counter() - start:.1f} s"
+          + (f" ({read - written} pseudos déjà présents ignorés)" if written < read else ""))
+
+
+if __name__ == '__main__':
+    main()
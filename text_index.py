@@ -0,0 +1,143 @@
+"""
+Inverted index over the free-text answers.
+
+For every text column, ``TextIndex`` maps each token (accent-folded, so "ecole" finds
+"école") to the posting list of the respondents whose answer contains it. Respondents are
+identified by their row position in the snapshot: since rows are only ever appended, a
+new snapshot only indexes its new rows. Queries ("which answers contain this word, and
+how are they split between teenagers and adults") are then dictionary lookups.
+"""
+import threading
+from collections import Counter, defaultdict
+
+import pandas as pd
+
+from results_engine import CountTable, group_keys
+from text_tokens import fold_accents, tokens_of
+
+
+class TextIndex:
+    """Token -> respondent posting lists for several text columns."""
+
+    def __init__(self, text_cols, group_col='Category'):
+        self.text_cols = tuple(text_cols)
+        self.group_col = group_col
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._postings = {col: defaultdict(list) for col in self.text_cols}
+        self._surface_forms = defaultdict(Counter)  # folded token -> spellings seen
+        self._answers = {col: {} for col in self.text_cols}  # row id -> raw answer
+        self._groups = []  # group of every indexed row
+        self._last_row = None  # answers of the last indexed row, to detect edited sheets
+
+    def __len__(self):
+        return len(self._groups)
+
+    # region Indexing
+    def add_row(self, group, texts, tokens):
+        """
+        Indexes one new respondent. ``texts`` and ``tokens`` map text columns to the raw
+        answer and its tokens. Returns the id of the respondent.
+        """
+        with self._lock:
+            return self._add_row(group, texts, tokens)
+
+    def _add_row(self, group, texts, tokens):
+        row_id = len(self._groups)
+        self._groups.append(group)
+        for col in self.text_cols:
+            row_tokens = tokens.get(col) or ()
+            if not row_tokens:
+                continue
+            self._answers[col][row_id] = texts.get(col)
+            for token in set(row_tokens):
+                folded = fold_accents(token)
+                self._postings[col][folded].append(row_id)
+                self._surface_forms[folded][token] += 1
+        return row_id
+
+    def update(self, df):
+        """
+        Indexes the rows of ``df`` that are not indexed yet and returns their number. The
+        index is rebuilt when ``df`` is not an extension of the indexed rows (rows deleted
+        or edited in the sheet).
+        """
+        text_cols = [col for col in self.text_cols if col in df.columns]
+
+        with self._lock:
+            # Lignes supprimées, ou dernière ligne indexée modifiée : index reconstruit
+            if len(df) < len(self) or (len(self) and self._row_answers(df, len(self) - 1, text_cols) != self._last_row):
+                self._reset()
+            start = len(self)
+            if start == len(df):
+                return 0
+
+            new_rows = df.iloc[start:]
+            groups = (group_keys(new_rows[self.group_col]) if self.group_col in df.columns
+                      else pd.Series(None, index=new_rows.index, dtype=object))
+            texts = {col: new_rows[col].tolist() for col in text_cols}
+            tokens = {col: tokens_of(new_rows, col).tolist() for col in text_cols}
+
+            for position, group in enumerate(groups.tolist()):
+                self._add_row(
+                    group if pd.notna(group) else None,
+                    {col: texts[col][position] for col in text_cols},
+                    {col: tokens[col][position] for col in text_cols},
+                )
+            self._last_row = self._row_answers(df, len(self) - 1, text_cols)
+            return len(df) - start
+
+    @staticmethod
+    def _row_answers(df, position, text_cols):
+        return [str(value) for value in df[text_cols].iloc[position].tolist()]
+    # endregion
+
+    # region Queries
+    def _cols(self, col):
+        return self.text_cols if col is None else (col,)
+
+    def _respondents(self, word, col):
+        folded = fold_accents(word.lower())
+        ids = set()
+        for text_col in self._cols(col):
+            ids.update(self._postings[text_col].get(folded, ()))
+        return sorted(ids)
+
+    def respondents(self, word, col=None):
+        """Sorted ids of the respondents who used ``word`` (in one column or in any)."""
+        with self._lock:
+            return self._respondents(word, col)
+
+    def group_split(self, word, col=None):
+        """Number of respondents who used ``word``, per group."""
+        with self._lock:
+            counts = Counter(self._groups[row_id] for row_id in self._respondents(word, col))
+        return CountTable(tuple(counts.most_common()))
+
+    def answers(self, word, col=None, limit=None):
+        """(group, column, answer) of the answers containing ``word``, oldest first."""
+        folded = fold_accents(word.lower())
+        matches = []
+        with self._lock:
+            for text_col in self._cols(col):
+                for row_id in self._postings[text_col].get(folded, ()):
+                    matches.append((row_id, self._groups[row_id], text_col, self._answers[text_col][row_id]))
+        matches.sort(key=lambda match: match[0])
+        return [(group, text_col, answer) for _, group, text_col, answer in matches[:limit]]
+
+    def vocabulary(self, col=None, top_n=None, min_length=3):
+        """Most used words as (word, number of answers), under their most common spelling."""
+        document_counts = Counter()
+        with self._lock:
+            for text_col in self._cols(col):
+                for folded, row_ids in self._postings[text_col].items():
+                    document_counts[folded] += len(row_ids)
+            words = [
+                (self._surface_forms[folded].most_common(1)[0][0], count)
+                for folded, count in document_counts.most_common()
+                if len(folded) >= min_length
+            ]
+        return words[:top_n]
+    # endregion
@@ -0,0 +1,93 @@
+"""
+French tokenizer shared by the word clouds, the top-word lists and the text search.
+
+Answers are tokenized once per row when the data is loaded (``add_token_columns``): the
+text is lowercased, elisions ("l'", "d'", "qu'"...) are removed, words are extracted with
+precompiled regexes, and French stop words are dropped. Stop words are matched on
+accent-folded words, so "a" and "à", or "tres" and "très", are caught the same way; the
+tokens themselves keep their accents. The tokens of column ``col`` are stored as tuples in
+``col + TOKENS_SUFFIX``.
+"""
+import re
+import unicodedata
+from functools import lru_cache
+
+import pandas as pd
+
+TOKENS_SUFFIX = '_tokens'
+
+# Élisions : l'école, d'accord, qu'il, jusqu'à... (apostrophe droite ou typographique)
+ELISION_RE = re.compile(r"\b(?:[cdjlmnst]|qu|jusqu|lorsqu|puisqu|quoiqu)['’]", re.IGNORECASE)
+# Mots : lettres et chiffres, sans le soulignement
+WORD_RE = re.compile(r"[^\W_]+")
+
+FRENCH_STOP_WORDS = {
+    'le', 'la', 'les', 'un', 'une', 'des', 'et', 'ou', 'de', 'du', 'dans', 'avec', 'pour', 'sur',
+    'par', 'que', 'qui', 'ce', 'cette', 'ces', 'je', 'tu', 'il', 'elle', 'nous', 'vous', 'ils',
+    'elles', 'mon', 'ma', 'mes', 'ton', 'ta', 'tes', 'son', 'sa', 'ses', 'à', 'au', 'aux',
+    'en', 'y', 'on', 'ne', 'pas', 'plus', 'mais', 'donc', 'car', 'ni', 'si', 'se', 'me', 'te',
+    'lui', 'leur', 'leurs', 'notre', 'nos', 'votre', 'vos', 'est', 'sont', 'être', 'été', 'ai',
+    'as', 'a', 'avons', 'avez', 'ont', 'avoir', 'fait', 'faire', 'comme', 'quand', 'quoi',
+    'dont', 'où', 'tout', 'tous', 'toute', 'toutes', 'très', 'trop', 'aussi', 'bien', 'peu',
+    'cela', 'ça', 'ceci', 'celui', 'celle', 'moi', 'toi', 'eux', 'même', 'autre', 'autres',
+    'c', 'd', 'j', 'l', 'm', 'n', 's', 't', 'qu',
+}
+
+
+@lru_cache(maxsize=65536)
+def fold_accents(word):
+    """'préoccupé' -> 'preoccupe'."""
+    decomposed = unicodedata.normalize('NFKD', word)
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+
+FOLDED_STOP_WORDS = frozenset(fold_accents(word) for word in FRENCH_STOP_WORDS)
+
+
+def is_stop_word(word):
+    return fold_accents(word) in FOLDED_STOP_WORDS
+
+
+def _content_tokens(words):
+    return tuple(word for word in words if not is_stop_word(word))
+
+
+def tokenize(text):
+    """Content words of one answer, lowercased, without elisions nor stop words."""
+    if not isinstance(text, str):
+        if pd.isna(text):
+            return ()
+        text = str(text)
+    return _content_tokens(WORD_RE.findall(ELISION_RE.sub(' ', text.lower())))
+
+
+def tokenize_series(series):
+    """Tokens of every answer of a text column (empty tuple for missing answers)."""
+    texts = series.astype(object).where(series.notna(), '').astype(str)
+    words = texts.str.lower().str.replace(ELISION_RE, ' ', regex=True).str.findall(WORD_RE)
+    return words.map(_content_tokens)
+
+
+def token_column(text_col):
+    return text_col + TOKENS_SUFFIX
+
+
+def add_token_columns(df, text_cols):
+    """Adds the token column of every text column present in ``df`` (in place) and returns ``df``."""
+    for text_col in text_cols:
+        if text_col in df.columns:
+            df[token_column(text_col)] = tokenize_series(df[text_col])
+    return df
+
+
+def tokens_of(df, text_col):
+    """Token column of ``text_col``, tokenized on the fly if it was not added at load time."""
+    column = token_column(text_col)
+    if column in df.columns:
+        return df[column]
+    return tokenize_series(df[text_col])
+
+
+def join_tokens(token_lists):
+    """One space-separated text of all the tokens (input of the word clouds)."""
+    return ' '.join(token for tokens in token_lists for token in tokens)
@@ -0,0 +1,107 @@
+"""
+Time windows over the survey answers.
+
+One deployment collects the answers of several events. A ``TimeWindow`` selects the
+answers of one of them (``EVENTS``) or of any date range, from the ``Timestamp`` column:
+the app writes ISO timestamps, the old Google Form export used the US format. Bounds are
+ISO strings, so the SQLite store can push the window down to its ``Timestamp`` index and
+day-partitioned Parquet exports only read the matching ``day=`` partitions.
+"""
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+import pandas as pd
+
+FORM_TIMESTAMP_FORMAT = '%m/%d/%Y %H:%M:%S'
+DAY_PARTITION = 'day'
+
+
+def parse_timestamps(values):
+    """Timestamps of the form export ('11/19/2025 14:03:00') or ISO ones, NaT when unreadable."""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    parsed = pd.to_datetime(values, format=FORM_TIMESTAMP_FORMAT, errors='coerce')
+    missing = parsed.isna() & values.notna()
+    if missing.any():
+        parsed[missing] = pd.to_datetime(values[missing], format='ISO8601', errors='coerce')
+    return parsed
+
+
+@dataclass(frozen=True)
+class TimeWindow:
+    """Answers from ``start`` (included) to ``end`` (excluded); None for an open bound."""
+    start: str = None
+    end: str = None
+    label: str = "Toutes les réponses"
+
+    @classmethod
+    def between_days(cls, first_day, last_day, label=None):
+        """Window covering the days ``first_day`` to ``last_day`` (both included)."""
+        end = last_day + timedelta(days=1)
+        return cls(first_day.isoformat() + 'T00:00:00', end.isoformat() + 'T00:00:00',
+                   label or f"Du {first_day:%d.%m.%Y} au {last_day:%d.%m.%Y}")
+
+    @property
+    def is_unbounded(self):
+        return self.start is None and self.end is None
+
+    def mask(self, timestamps):
+        """Boolean mask of the timestamps inside the window (unreadable ones are outside)."""
+        parsed = parse_timestamps(timestamps)
+        inside = parsed.notna()
+        if self.start is not None:
+            inside &= parsed >= pd.Timestamp(self.start)
+        if self.end is not None:
+            inside &= parsed < pd.Timestamp(self.end)
+        return inside
+
+    def filter(self, df, timestamp_col='Timestamp'):
+        """Rows of ``df`` inside the window (all of them for an unbounded window)."""
+        if self.is_unbounded or timestamp_col not in df.columns:
+            return df
+        return df[self.mask(df[timestamp_col]).to_numpy()]
+
+    def sql(self, timestamp_col='Timestamp'):
+        """(WHERE clause, parameters) selecting the window on ISO timestamps."""
+        conditions, params = [], []
+        if self.start is not None:
+            conditions.append(f'"{timestamp_col}" >= ?')
+            params.append(self.start)
+        if self.end is not None:
+            conditions.append(f'"{timestamp_col}" < ?')
+            params.append(self.end)
+        return ' AND '.join(conditions) or '1', params
+
+    def partition_filter(self):
+        """pyarrow filter on the ``day=`` partitions that may hold answers of the window."""
+        conditions = []
+        if self.start is not None:
+            conditions.append((DAY_PARTITION, '>=', self.start[:10]))
+        if self.end is not None:
+            conditions.append((DAY_PARTITION, '<=', self.end[:10]))
+        return conditions or None
+
+
+ALL_RESPONSES = TimeWindow()
+
+# Événements connus (la fin d'un événement en cours reste ouverte)
+EVENTS = {
+    "Cité des métiers 2025": TimeWindow('2025-11-18T00:00:00', None, "Cité des métiers 2025"),
+}
+
+
+def day_partitions(timestamps):
+    """'YYYY-MM-DD' partition of each timestamp ('inconnu' when unreadable)."""
+    parsed = parse_timestamps(timestamps)
+    return parsed.dt.strftime('%Y-%m-%d').fillna('inconnu')
+
+
+def window_from_args(event=None, since=None, until=None):
+    """Window of an event name, or of optional first / last days ('YYYY-MM-DD')."""
+    if event is not None:
+        return EVENTS[event]
+    if since is None and until is None:
+        return ALL_RESPONSES
+    start = date.fromisoformat(since).isoformat() + 'T00:00:00' if since else None
+    end = (date.fromisoformat(until) + timedelta(days=1)).isoformat() + 'T00:00:00' if until else None
+    return TimeWindow(start, end, f"{since or '…'} → {until or '…'}")